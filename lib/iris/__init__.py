@@ -110,6 +110,7 @@ import iris.config
 import iris.cube
 import iris._constraints
 from iris._deprecation import IrisDeprecation, warn_deprecated
+import iris._load_cache
 import iris.fileformats
 import iris.io
 
@@ -308,8 +309,18 @@ def _generate_cubes(uris, callback, constraints):
 
 
 def _load_collection(uris, constraints=None, callback=None):
+    cache_key = None
+    if iris.config.load.cache_dir is not None:
+        cache_key = iris._load_cache.key(uris, constraints, callback)
     try:
-        cubes = _generate_cubes(uris, callback, constraints)
+        cubes = None
+        if cache_key is not None:
+            cubes = iris._load_cache.read(cache_key)
+            if cubes is None:
+                cubes = list(_generate_cubes(uris, callback, constraints))
+                iris._load_cache.write(cache_key, cubes)
+        if cubes is None:
+            cubes = _generate_cubes(uris, callback, constraints)
         result = iris.cube._CubeFilterCollection.from_cubes(cubes, constraints)
     except EOFError as e:
         raise iris.exceptions.TranslationError(
@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2013 - 2017, Met Office
+# (C) British Crown Copyright 2013 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -23,12 +23,14 @@ from __future__ import (absolute_import, division, print_function)
 from six.moves import (filter, input, map, range, zip)  # noqa
 import six
 
+import bisect
 from collections import defaultdict, namedtuple
 from copy import deepcopy
 
 import dask.array as da
 import numpy as np
 
+from iris._merge import _digest_value
 import iris.coords
 import iris.cube
 from iris.util import guess_coord_axis, array_equal
@@ -254,8 +256,32 @@ def concatenate(cubes, error_on_mismatch=False, check_aux_coords=True):
         A :class:`iris.cube.CubeList` of concatenated :class:`iris.cube.Cube`
         instances.
 
+    """
+    concatenated_cubes = _concatenate(cubes, error_on_mismatch,
+                                      check_aux_coords)
+
+    # Perform concatenation until we've reached an equilibrium, which only
+    # takes more than one pass when cubes are joined along several axes.
+    count = len(cubes)
+    while len(concatenated_cubes) not in (1, count):
+        count = len(concatenated_cubes)
+        concatenated_cubes = _concatenate(concatenated_cubes)
+
+    return concatenated_cubes
+
+
+def _concatenate(cubes, error_on_mismatch=False, check_aux_coords=True):
+    """
+    Perform a single pass of concatenating the provided cubes.
+
+    Each cube is only tried against the proto-cubes with the same signature
+    digest, unless `error_on_mismatch` is set, in which case it is tried
+    against all the proto-cubes with the same name so that any mismatch is
+    reported in full.
+
     """
     proto_cubes_by_name = defaultdict(list)
+    proto_cubes_by_digest = defaultdict(list)
     # Initialise the nominated axis (dimension) of concatenation
     # which requires to be negotiated.
     axis = None
@@ -264,19 +290,28 @@ def concatenate(cubes, error_on_mismatch=False, check_aux_coords=True):
     for cube in cubes:
         name = cube.standard_name or cube.long_name
         proto_cubes = proto_cubes_by_name[name]
+        cube_signature = _CubeSignature(cube)
+        digest = cube_signature.digest()
+        if error_on_mismatch:
+            candidates = proto_cubes
+        else:
+            candidates = proto_cubes_by_digest[digest]
         registered = False
 
         # Register cube with an existing proto-cube.
-        for proto_cube in proto_cubes:
+        for proto_cube in candidates:
             registered = proto_cube.register(cube, axis, error_on_mismatch,
-                                             check_aux_coords)
+                                             check_aux_coords,
+                                             cube_signature=cube_signature)
             if registered:
                 axis = proto_cube.axis
                 break
 
         # Create a new proto-cube for an unregistered cube.
         if not registered:
-            proto_cubes.append(_ProtoCube(cube))
+            proto_cube = _ProtoCube(cube, cube_signature=cube_signature)
+            proto_cubes.append(proto_cube)
+            proto_cubes_by_digest[digest].append(proto_cube)
 
     # Construct a concatenated cube from each of the proto-cubes.
     concatenated_cubes = iris.cube.CubeList()
@@ -290,11 +325,6 @@ def concatenate(cubes, error_on_mismatch=False, check_aux_coords=True):
             # Construct the concatenated cube.
             concatenated_cubes.append(proto_cube.concatenate())
 
-    # Perform concatenation until we've reached an equilibrium.
-    count = len(concatenated_cubes)
-    if count != 1 and count != len(cubes):
-        concatenated_cubes = concatenate(concatenated_cubes)
-
     return concatenated_cubes
 
 
@@ -362,6 +392,27 @@ class _CubeSignature(object):
             else:
                 self.scalar_coords.append(coord)
 
+    def digest(self):
+        """
+        Return a hashable digest of this _CubeSignature.
+
+        The digests of any two signatures that match are equal, so the
+        digest can be used to find the signatures that may match without
+        comparing against all of them.
+
+        """
+        defn = self.defn
+        attributes = frozenset((key, _digest_value(value))
+                               for key, value in defn.attributes.items())
+        dims = tuple((metadata.name(), tuple(metadata.dims))
+                     for metadata in self.dim_metadata)
+        aux = tuple((metadata.name(), tuple(metadata.dims))
+                    for metadata in self.aux_metadata)
+        scalars = tuple((coord.name(), tuple(coord.points.tolist()))
+                        for coord in self.scalar_coords)
+        return (defn.standard_name, defn.long_name, defn.var_name,
+                attributes, self.ndim, self.data_type, dims, aux, scalars)
+
     def _coordinate_differences(self, other, attr):
         """
         Determine the names of the coordinates that differ between `self` and
@@ -602,7 +653,7 @@ class _ProtoCube(object):
     common dimension.
 
     """
-    def __init__(self, cube):
+    def __init__(self, cube, cube_signature=None):
         """
         Create a new _ProtoCube from the given cube and record the cube
         as a source-cube.
@@ -612,13 +663,24 @@ class _ProtoCube(object):
         * cube:
             Source :class:`iris.cube.Cube` of the :class:`_ProtoCube`.
 
+        Kwargs:
+
+        * cube_signature:
+            The :class:`_CubeSignature` of the cube, if already known.
+
         """
         # Cache the source-cube of this proto-cube.
         self._cube = cube
 
         # The cube signature is a combination of cube and coordinate
         # metadata that defines this proto-cube.
-        self._cube_signature = _CubeSignature(cube)
+        if cube_signature is None:
+            cube_signature = _CubeSignature(cube)
+        self._cube_signature = cube_signature
+
+        # The extents of the source-cubes over one dimension, in sorted
+        # order, as a (dimension index, extents) pair.
+        self._sorted_extents = None
 
         # The coordinate signature allows suitable non-overlapping
         # source-cubes to be identified.
@@ -683,7 +745,7 @@ class _ProtoCube(object):
         return cube
 
     def register(self, cube, axis=None, error_on_mismatch=False,
-                 check_aux_coords=False):
+                 check_aux_coords=False, cube_signature=None):
         """
         Determine whether the given source-cube is suitable for concatenation
         with this :class:`_ProtoCube`.
@@ -703,6 +765,9 @@ class _ProtoCube(object):
         * error_on_mismatch:
             If True, raise an informative error if registration fails.
 
+        * cube_signature:
+            The :class:`_CubeSignature` of the cube, if already known.
+
         Returns:
             Boolean.
 
@@ -714,7 +779,8 @@ class _ProtoCube(object):
             raise ValueError(msg)
 
         # Check for compatible cube signatures.
-        cube_signature = _CubeSignature(cube)
+        if cube_signature is None:
+            cube_signature = _CubeSignature(cube)
         match = self._cube_signature.match(cube_signature, error_on_mismatch)
 
         # Check for compatible coordinate signatures.
@@ -781,6 +847,22 @@ class _ProtoCube(object):
         """
         skeleton = _SkeletonCube(coord_signature, data)
         self._skeletons.append(skeleton)
+        if self._sorted_extents is not None:
+            dim_ind, dim_extents = self._sorted_extents
+            bisect.insort(dim_extents, coord_signature.dim_extents[dim_ind])
+
+    def _dim_extents(self, dim_ind):
+        """
+        Return the extents of the registered source-cubes over the given
+        dimension coordinate, in ascending order.
+
+        """
+        if self._sorted_extents is None or \
+                self._sorted_extents[0] != dim_ind:
+            dim_extents = sorted(skeleton.signature.dim_extents[dim_ind]
+                                 for skeleton in self._skeletons)
+            self._sorted_extents = (dim_ind, dim_extents)
+        return self._sorted_extents[1]
 
     def _build_aux_coordinates(self):
         """
@@ -920,15 +1002,18 @@ class _ProtoCube(object):
         """
         result = True
 
-        # Add the new extent to the current extents collection.
+        # The extents already registered are non-overlapping, so only the
+        # neighbours of the new extent in sorted order need to be checked.
         dim_ind = self._coord_signature.dim_mapping.index(axis)
-        dim_extents = [skeleton.signature.dim_extents[dim_ind]
-                       for skeleton in self._skeletons]
-        dim_extents.append(extent)
+        sorted_extents = self._dim_extents(dim_ind)
+        i = bisect.bisect(sorted_extents, extent)
+        dim_extents = sorted_extents[max(i - 1, 0):i] + [extent] + \
+            sorted_extents[i:i + 1]
 
         # Sort into the appropriate dimension order.
         order = self._coord_signature.dim_order[dim_ind]
-        dim_extents.sort(reverse=(order == _DECREASING))
+        if order == _DECREASING:
+            dim_extents.reverse()
 
         # Ensure that the extents don't overlap.
         if len(dim_extents) > 1:
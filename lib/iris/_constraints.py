@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2010 - 2017, Met Office
+# (C) British Crown Copyright 2010 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -30,6 +30,7 @@ import numpy as np
 
 import iris.coords
 import iris.exceptions
+import iris.time
 
 
 class Constraint(object):
@@ -258,6 +259,7 @@ class _CoordConstraint(object):
         try_quick = False
         if callable(self._coord_thing):
             call_func = self._coord_thing
+            vectorised_func = call_func
         elif (isinstance(self._coord_thing, collections.Iterable) and
                 not isinstance(self._coord_thing,
                                (six.string_types, iris.coords.Cell))):
@@ -269,9 +271,13 @@ class _CoordConstraint(object):
             else:
                 def call_func(cell):
                     return cell.point in desired_values
+
+            def vectorised_func(cells):
+                return cells.isin(desired_values)
         else:
             def call_func(c):
                 return c == self._coord_thing
+            vectorised_func = call_func
 
             try_quick = (isinstance(coord, iris.coords.DimCoord) and
                          not isinstance(self._coord_thing, iris.coords.Cell))
@@ -287,7 +293,11 @@ class _CoordConstraint(object):
             if coord.cell(i) == self._coord_thing:
                 r[i] = True
         else:
-            r = np.array([call_func(cell) for cell in coord.cells()])
+            try:
+                # Evaluate the constraint over all cells at once.
+                r = _vectorised_cell_call(vectorised_func, coord)
+            except _NotVectorisable:
+                r = np.array([call_func(cell) for cell in coord.cells()])
         if dims:
             cube_cim[dims[0]] = r
         elif not all(r):
@@ -295,6 +305,274 @@ class _CoordConstraint(object):
         return cube_cim
 
 
+class _NotVectorisable(BaseException):
+    """
+    Raised when a constraint cannot be evaluated over all cells at once.
+
+    This derives from :class:`BaseException` so that it passes through any
+    "except Exception" clause in the constraint function itself.
+
+    """
+    pass
+
+
+#: The maximum number of times a constraint function is called when
+#: evaluating it over all cells at once. This is enough for a chained
+#: comparison, or a choice between two comparisons, whilst limiting the
+#: repeated calls of a function with side effects.
+_MAX_VECTORISED_CALLS = 4
+
+
+def _vectorised_cell_call(func, coord):
+    """
+    Evaluate a cell constraint function for all the cells of a coordinate
+    at once.
+
+    The function is called with a :class:`_VectorisedCells`, whose
+    comparisons produce arrays of results for all the cells. Wherever the
+    function requires the truth of such an array (as in a chained
+    comparison such as "a <= cell < b"), each outcome is explored by
+    calling the function again, for only the cells that take it.
+
+    Only a result derived from comparisons of the cells is accepted, as
+    any other value (e.g. from an "isinstance" check) is not known to apply
+    to every cell.
+
+    Raises :class:`_NotVectorisable` if the function does anything that
+    cannot be evaluated for all cells at once, in which case it must be
+    called for each cell in turn.
+
+    Returns:
+        A boolean array of the function result for each cell.
+
+    """
+    cells = _VectorisedCells(coord)
+    result = np.zeros(coord.shape[0], dtype=bool)
+    pending = [[]]
+    calls = 0
+    while pending:
+        calls += 1
+        if calls > _MAX_VECTORISED_CALLS:
+            raise _NotVectorisable('Too many branches.')
+        cells._branch = _Branch(coord.shape[0], pending.pop())
+        try:
+            value = func(cells)
+        except _NotVectorisable:
+            raise
+        except Exception as err:
+            raise _NotVectorisable(err)
+        if not isinstance(value, _CellsResult):
+            raise _NotVectorisable('Unexpected result {!r}.'.format(value))
+        selected = cells._branch.selected
+        result[selected] = value.array[selected]
+        pending.extend(cells._branch.alternatives)
+    return result
+
+
+class _Branch(object):
+    """
+    Records the outcome of each truth test made by a single call of a
+    constraint function on a :class:`_VectorisedCells`.
+
+    """
+    def __init__(self, size, decisions):
+        #: The outcomes of the truth tests to replay, followed by those made.
+        self.decisions = list(decisions)
+        #: Other outcomes that some cells take, as lists of decisions.
+        self.alternatives = []
+        #: Which cells follow this branch.
+        self.selected = np.ones(size, dtype=bool)
+        self._index = 0
+
+    def decide(self, array):
+        if self._index < len(self.decisions):
+            decision = self.decisions[self._index]
+        else:
+            true_cells = np.any(self.selected & array)
+            false_cells = np.any(self.selected & ~array)
+            decision = bool(true_cells or not false_cells)
+            if decision and false_cells:
+                self.alternatives.append(self.decisions + [False])
+            self.decisions.append(decision)
+        self._index += 1
+        self.selected &= array if decision else ~array
+        return decision
+
+
+class _CellsResult(object):
+    """The boolean result of a comparison of :class:`_VectorisedCells`."""
+    __array_priority__ = 100
+    __array_ufunc__ = None
+
+    def __init__(self, array, branch):
+        self.array = array
+        self._branch = branch
+
+    def _combine(self, other, operator_method):
+        if not isinstance(other, _CellsResult):
+            return NotImplemented
+        return _CellsResult(operator_method(self.array, other.array),
+                            self._branch)
+
+    def __and__(self, other):
+        return self._combine(other, operator.__and__)
+
+    __rand__ = __and__
+
+    def __or__(self, other):
+        return self._combine(other, operator.__or__)
+
+    __ror__ = __or__
+
+    def __xor__(self, other):
+        return self._combine(other, operator.__xor__)
+
+    __rxor__ = __xor__
+
+    def __invert__(self):
+        return _CellsResult(~self.array, self._branch)
+
+    def __bool__(self):
+        return self._branch.decide(self.array)
+
+    __nonzero__ = __bool__
+
+
+class _VectorisedCells(object):
+    """
+    A stand-in for all of the :class:`iris.coords.Cell` instances of a 1d
+    coordinate, whose comparisons with a number, string or
+    :class:`iris.time.PartialDateTime` follow the same rules as a single
+    cell but give an array of results.
+
+    """
+    __array_priority__ = 100
+    __array_ufunc__ = None
+
+    def __init__(self, coord):
+        self._points = coord.points
+        self._lower = self._upper = None
+        if coord.has_bounds():
+            self._lower = np.min(coord.bounds, axis=-1)
+            self._upper = np.max(coord.bounds, axis=-1)
+        self._is_time = (iris.FUTURE.cell_datetime_objects and
+                         coord.units.is_time_reference())
+        self._units = coord.units
+        self._date_fields = {}
+        self._branch = None
+
+    def __getattr__(self, name):
+        # Any other use of the cells, such as the attributes of a Cell,
+        # can only be made of each cell in turn.
+        if name.startswith('__'):
+            raise AttributeError(name)
+        raise _NotVectorisable('Unsupported attribute {!r}.'.format(name))
+
+    def _date_field(self, name):
+        # Decode the points to datetime-like objects just once.
+        if not self._date_fields:
+            dates = self._units.num2date(self._points)
+            for field in iris.time.PartialDateTime.__slots__:
+                try:
+                    self._date_fields[field] = np.array(
+                        [getattr(date, field) for date in dates])
+                except AttributeError:
+                    self._date_fields[field] = None
+        return self._date_fields[name]
+
+    def _partial_datetime_gt_eq(self, pdt):
+        # The results of "pdt > cell.point" and "pdt == cell.point".
+        gt = np.zeros(self._points.shape, dtype=bool)
+        eq = np.ones(self._points.shape, dtype=bool)
+        for name in iris.time.PartialDateTime.__slots__[:-1]:
+            value = getattr(pdt, name)
+            if value is not None:
+                field = self._date_field(name)
+                differ = eq & (field != value)
+                gt[differ] = value > field[differ]
+                eq &= ~differ
+        # As for PartialDateTime, 'microsecond' is optional.
+        field = self._date_field('microsecond')
+        if pdt.microsecond is not None and field is not None:
+            differ = field != pdt.microsecond
+            gt = np.where(gt & differ, pdt.microsecond > field, gt)
+            eq &= ~differ
+        return gt, eq
+
+    def _compare(self, other, operator_method):
+        if isinstance(other, iris.time.PartialDateTime):
+            if not self._is_time or self._lower is not None:
+                raise _NotVectorisable('Unsupported datetime comparison.')
+            gt, eq = self._partial_datetime_gt_eq(other)
+            # Cells defer to the PartialDateTime comparison, reflected.
+            result = {operator.eq: eq,
+                      operator.ne: ~eq,
+                      operator.lt: gt,
+                      operator.le: gt | eq,
+                      operator.gt: ~gt & ~eq,
+                      operator.ge: ~gt}[operator_method]
+        elif (isinstance(other, (int, float, np.number)) and
+                not self._is_time and self._points.dtype.kind in 'biuf'):
+            if self._lower is None:
+                result = operator_method(self._points, other)
+            elif operator_method is operator.eq:
+                result = (self._lower <= other) & (other <= self._upper)
+            elif operator_method is operator.ne:
+                result = (self._lower > other) | (other > self._upper)
+            elif operator_method in (operator.gt, operator.le):
+                result = operator_method(self._lower, other)
+            else:
+                result = operator_method(self._upper, other)
+        elif (isinstance(other, six.string_types) and self._lower is None and
+                self._points.dtype.kind == 'U' and
+                operator_method in (operator.eq, operator.ne)):
+            result = operator_method(self._points, other)
+        else:
+            raise _NotVectorisable('Unsupported comparison with '
+                                   '{!r}.'.format(other))
+        return _CellsResult(np.asarray(result, dtype=bool), self._branch)
+
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._compare(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+    __hash__ = None
+
+    def isin(self, values):
+        """
+        Return which of the cells are equal to any of the given values.
+
+        """
+        # Values of the same kind as unbounded points can be simply matched.
+        types = ()
+        if self._lower is None and not self._is_time:
+            if self._points.dtype.kind in 'biuf':
+                types = (int, float, np.number)
+            elif self._points.dtype.kind == 'U':
+                types = six.string_types
+        if types and all(isinstance(value, types) for value in values):
+            result = np.isin(self._points, values)
+        else:
+            result = np.zeros(self._points.shape, dtype=bool)
+            for value in values:
+                result |= (self == value).array
+        return _CellsResult(result, self._branch)
+
+
 class _ColumnIndexManager(object):
     """
     A class to represent column aligned slices which can be operated on
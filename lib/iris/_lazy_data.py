@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2017 - 2018, Met Office
+# (C) British Crown Copyright 2017 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -268,3 +268,51 @@ def lazy_elementwise(lazy_array, elementwise_op):
     dtype = elementwise_op(np.zeros(1, lazy_array.dtype)).dtype
 
     return da.map_blocks(elementwise_op, lazy_array, dtype=dtype)
+
+
+def map_complete_blocks(src, func, dims, out_sizes, dtype=None):
+    """
+    Apply a function to complete blocks of the data of a cube.
+
+    Complete means that the data is not chunked along the chosen dimensions,
+    so that the function sees them whole while the blocks of the other
+    dimensions are processed independently, and in parallel.
+
+    Args:
+
+    * src (:class:`~iris.cube.Cube`):
+        Source cube that function is applied to.
+    * func:
+        Function to apply to each block, which returns an array with the
+        same dimensions as the block.
+    * dims (tuple of int):
+        Dimensions that cannot be chunked.
+    * out_sizes (tuple of int):
+        Output size of dimensions that cannot be chunked.
+
+    Kwargs:
+
+    * dtype:
+        The dtype of the result. Defaults to the dtype of the cube.
+
+    Returns:
+        The lazy result of the function if the cube has lazy data,
+        otherwise the real result of the function applied to the data.
+
+    """
+    if not src.has_lazy_data():
+        return func(src.data)
+
+    data = src.lazy_data()
+
+    # Ensure the dims are not chunked.
+    data = data.rechunk({dim: src.shape[dim] for dim in dims})
+
+    # Determine the output chunks.
+    out_chunks = list(data.chunks)
+    for dim, size in zip(dims, out_sizes):
+        out_chunks[dim] = size
+
+    if dtype is None:
+        dtype = src.dtype
+    return data.map_blocks(func, chunks=tuple(out_chunks), dtype=dtype)
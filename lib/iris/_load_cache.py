@@ -0,0 +1,332 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""
+An on-disk cache of the cubes loaded from unchanged files.
+
+When :data:`iris.config.load` sets a cache directory, the cubes loaded from
+a set of files are pickled there, still lazy, so that a later load of the
+same files with the same constraints and callback need not translate them
+again.  Only the data access of the cached cubes reads the files.
+
+As reading a pickle can run arbitrary code, the cache directory is created
+accessible only by its owner, and the cache is only read from, or written
+to, a directory and files owned by the current user.
+
+"""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+import six
+
+import collections
+import datetime
+import hashlib
+import os
+import tempfile
+import types
+import warnings
+
+import numpy as np
+from six.moves import cPickle as pickle
+
+import iris
+import iris._constraints
+import iris.config
+import iris.io
+import iris.time
+
+
+#: The suffix of the cache files.
+_SUFFIX = '.iris-load'
+
+# The types of the values that are identified by their representation.
+_REPR_TYPES = ((type(None), type(Ellipsis), bool, float, complex, bytes,
+                datetime.timedelta) + six.integer_types + six.string_types)
+
+# The types of the values that are identified by the values of their
+# attributes.
+_ATTRIBUTE_TYPES = (iris._constraints.Constraint,
+                    iris._constraints.ConstraintCombination,
+                    iris._constraints.AttributeConstraint,
+                    iris._constraints._CoordConstraint,
+                    iris.time.PartialDateTime)
+
+
+def _type_name(value):
+    value_type = type(value)
+    return '{}.{}'.format(value_type.__module__, value_type.__name__)
+
+
+def _array_key(value):
+    # Identify an array or numpy scalar by its type, dtype, shape and content,
+    # or return None if its content is not just its bytes.
+    array = np.asanyarray(value)
+    if array.dtype.hasobject:
+        return None
+    content = hashlib.sha1(np.ascontiguousarray(array).tobytes())
+    mask = np.ma.getmask(array)
+    if mask is not np.ma.nomask:
+        content.update(np.ascontiguousarray(mask).tobytes())
+    return (_type_name(value), array.dtype.str, array.shape,
+            content.hexdigest())
+
+
+def _value_key(value, seen):
+    # Identify a value, such as a constraint or a value which a callback
+    # refers to, by its content, or return None if it cannot be identified
+    # between processes.
+    if type(value) in _REPR_TYPES or (type(value) is datetime.datetime and
+                                      value.tzinfo is None):
+        return (_type_name(value), repr(value))
+    if isinstance(value, (np.ndarray, np.generic)):
+        return _array_key(value)
+    if isinstance(value, types.ModuleType):
+        return ('module', value.__name__)
+    if isinstance(value, type):
+        return ('type', value.__module__, value.__name__)
+    if isinstance(value, types.FunctionType):
+        if id(value) in seen:
+            # A recursive reference, which is identified by the outer key.
+            return ('function', value.__module__, value.__name__)
+        return _callback_key(value, seen)
+    if isinstance(value, types.BuiltinFunctionType):
+        if not isinstance(value.__self__, (type(None), types.ModuleType)):
+            return None
+        return ('builtin', value.__module__, value.__name__)
+    if (type(value) in (tuple, list, set, frozenset) or
+            (isinstance(value, tuple) and hasattr(value, '_fields'))):
+        named_items = [(None, item) for item in value]
+    elif type(value) in (dict, collections.OrderedDict):
+        named_items = list(value.items())
+    elif type(value) in _ATTRIBUTE_TYPES:
+        names = getattr(value, '__slots__', None) or sorted(vars(value))
+        named_items = [(name, getattr(value, name)) for name in names]
+    else:
+        return None
+    item_keys = []
+    for name, item in named_items:
+        item_key = _value_key(item, seen)
+        if item_key is None:
+            return None
+        if name is not None:
+            name_key = _value_key(name, seen)
+            if name_key is None:
+                return None
+            item_key = (name_key, item_key)
+        item_keys.append(item_key)
+    if type(value) in (set, frozenset, dict):
+        # The order of these is not part of their content.
+        item_keys.sort(key=repr)
+    return (_type_name(value), item_keys)
+
+
+def _code_key(code):
+    # Identify some code, including any nested code, by its content.
+    consts = []
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            consts.append(_code_key(const))
+        else:
+            consts.append(_value_key(const, set()))
+    return (code.co_code, code.co_names, code.co_varnames, code.co_freevars,
+            consts)
+
+
+def _code_names(code):
+    # The global names used by some code, including that of any nested
+    # functions.
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _callback_key(callback, seen=None):
+    # Identify a callback function by its name and code, and by the values of
+    # its defaults, its closure and the globals it uses, or return None if it
+    # cannot be identified between processes.
+    if callback is None:
+        return ''
+    if not isinstance(callback, types.FunctionType):
+        # E.g. a bound method, whose instance is not part of its code.
+        return None
+    code = callback.__code__
+    seen = set() if seen is None else seen
+    seen.add(id(callback))
+    named_values = [('default', value)
+                    for value in callback.__defaults__ or ()]
+    kwdefaults = getattr(callback, '__kwdefaults__', None) or {}
+    named_values.extend(sorted(kwdefaults.items()))
+    for cell in callback.__closure__ or ():
+        try:
+            named_values.append(('closure', cell.cell_contents))
+        except ValueError:
+            # An empty cell, which the callback has yet to set.
+            named_values.append(('closure', None))
+    for name in sorted(_code_names(code) & set(callback.__globals__)):
+        named_values.append((name, callback.__globals__[name]))
+    value_keys = []
+    for name, value in named_values:
+        value_key = _value_key(value, seen)
+        if value_key is None:
+            return None
+        value_keys.append((name, value_key))
+    name = getattr(callback, '__qualname__', callback.__name__)
+    return (callback.__module__, name, _code_key(code), value_keys)
+
+
+def key(uris, constraints, callback):
+    """
+    Return the cache key of a load, or None if the load cannot be cached.
+
+    The key depends on the path, size and modification time of each of the
+    files loaded, the constraints, the callback, and the options which change
+    the cubes loaded: the state of structured UM loading, and the
+    :data:`iris.config.netcdf` and :data:`iris.config.pp` options.  Loads
+    with constraints or callbacks which cannot be identified between
+    processes, such as constraints on lambda functions, are not cached.
+
+    """
+    if isinstance(uris, six.string_types):
+        uris = [uris]
+    try:
+        uri_tuples = [iris.io.decode_uri(uri) for uri in uris]
+        if any(scheme != 'file' for scheme, _ in uri_tuples):
+            return None
+        filenames = iris.io.expand_filespecs([part for _, part in uri_tuples])
+        files = []
+        # The order of the files is kept, as it is the order of the cubes.
+        for filename in filenames:
+            stat = os.stat(filename)
+            files.append((os.path.abspath(filename), stat.st_size,
+                          stat.st_mtime))
+    except (IOError, OSError):
+        return None
+    constraints_key = _value_key(constraints, set())
+    callback_key = _callback_key(callback)
+    if constraints_key is None or callback_key is None:
+        return None
+    # Imported here, as the UM loader imports much of Iris.
+    from iris.fileformats.um._fast_load import STRUCTURED_LOAD_CONTROLS
+    structured = (STRUCTURED_LOAD_CONTROLS.loads_use_structured,
+                  STRUCTURED_LOAD_CONTROLS.structured_load_is_raw)
+    options = (iris.config.netcdf.chunk_bytes, iris.config.netcdf.load_rules,
+               sorted(iris.config.pp.__dict__.items()))
+    state = (iris.__version__, files, constraints_key, callback_key,
+             structured, options)
+    return hashlib.sha1(repr(state).encode('utf-8')).hexdigest()
+
+
+def _path(cache_key):
+    return os.path.join(iris.config.load.cache_dir, cache_key + _SUFFIX)
+
+
+def _owned(stat):
+    # Whether the stat of a file shows it is owned by the current user, which
+    # cannot be known on platforms without user ids.
+    getuid = getattr(os, 'getuid', None)
+    return getuid is not None and stat.st_uid == getuid()
+
+
+def _check_owned(path, stat):
+    # Whether the cache may use a file or directory, warning if not.
+    owned = _owned(stat)
+    if not owned:
+        msg = ('Ignoring the load cache at {!r}, as it is not owned by the '
+               'current user.')
+        warnings.warn(msg.format(path))
+    return owned
+
+
+def read(cache_key):
+    """
+    Return the cubes cached with the given key, or None if there are none.
+
+    Nothing is read unless both the cache directory and the cache file are
+    owned by the current user.
+
+    """
+    cache_dir = iris.config.load.cache_dir
+    path = _path(cache_key)
+    try:
+        if not _check_owned(cache_dir, os.stat(cache_dir)):
+            return None
+        with open(path, 'rb') as cache_file:
+            if not _check_owned(path, os.fstat(cache_file.fileno())):
+                return None
+            cubes = pickle.load(cache_file)
+        # Mark the entry as recently used.
+        os.utime(path, None)
+    except Exception:
+        # A missing, partial or incompatible entry is simply a cache miss.
+        cubes = None
+    return cubes
+
+
+def write(cache_key, cubes):
+    """
+    Cache the given cubes with the given key, then evict the least recently
+    used entries beyond the size limit of the cache.
+
+    Failure to write the cache is not an error, as the cache is only an
+    optimisation. The cache directory is created accessible only by the
+    current user, and nothing is written to a directory owned by another.
+
+    """
+    cache_dir = iris.config.load.cache_dir
+    temp_path = None
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir, 0o700)
+        if not _check_owned(cache_dir, os.stat(cache_dir)):
+            return
+        # Write to a temporary file, which then replaces any existing entry,
+        # so that no other process can see a partial entry.
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix='.tmp',
+                                         delete=False) as temp_file:
+            temp_path = temp_file.name
+            pickle.dump(list(cubes), temp_file, pickle.HIGHEST_PROTOCOL)
+        os.rename(temp_path, _path(cache_key))
+    except (EnvironmentError, pickle.PicklingError, TypeError,
+            AttributeError):
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return
+    _evict(cache_dir, iris.config.load.cache_size)
+
+
+def _evict(cache_dir, size):
+    # Remove the least recently used entries until the cache fits its size.
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(_SUFFIX):
+            path = os.path.join(cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(entry_size for _, entry_size, _ in entries)
+    for _, entry_size, path in sorted(entries):
+        if total <= size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= entry_size
@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2010 - 2017, Met Office
+# (C) British Crown Copyright 2010 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -1069,6 +1069,54 @@ def derive_space(groups, relation_matrix, positions, function_matrix=None):
     return space
 
 
+def _unhashable_attribute_keys(cubes):
+    """
+    Return the names of the attributes that have an unhashable value, such
+    as a numpy array, on any of the given cubes.
+
+    An array can compare equal to values of other types, e.g. ``1`` and
+    ``np.array([1])``, so the values of these attributes cannot be reduced
+    to a digest and must be compared in full.
+
+    """
+    keys = set()
+    for cube in cubes:
+        for key, value in cube.attributes.items():
+            if key not in keys:
+                try:
+                    hash(value)
+                except TypeError:
+                    keys.add(key)
+    return keys
+
+
+def _signature_digest(cube, unhashable_keys=()):
+    """
+    Return a hashable digest of the aspects of a cube that must be the same
+    for it to merge with another cube.
+
+    Any two cubes that can be registered with the same :class:`ProtoCube`
+    have equal digests, so the digest can be used to find the candidate
+    ProtoCubes of a cube without matching it against all of them.
+
+    Only the presence, and not the value, of the attributes named in
+    'unhashable_keys' is included in the digest. These must include every
+    attribute with an unhashable value on any of the cubes being compared,
+    as given by :func:`_unhashable_attribute_keys`.
+
+    """
+    attributes = frozenset((key, None if key in unhashable_keys else value)
+                           for key, value in cube.attributes.items())
+    coords = [(coord.name(), (dim,))
+              for coord, dim in cube._dim_coords_and_dims]
+    coords.extend((coord.name(), tuple(dims))
+                  for coord, dims in cube._aux_coords_and_dims)
+    factories = sorted(type(factory).__name__
+                       for factory in cube.aux_factories)
+    return (cube.standard_name, cube.long_name, cube.var_name, attributes,
+            cube.shape, cube.dtype, tuple(sorted(coords)), tuple(factories))
+
+
 class ProtoCube(object):
     """
     Framework for merging source-cubes into one or more higher
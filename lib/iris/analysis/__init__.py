@@ -66,6 +66,7 @@ from iris.analysis._regrid import RectilinearRegridder
 import iris.coords
 from iris.exceptions import LazyAggregatorError
 import iris._lazy_data
+import iris.util
 
 __all__ = ('COUNT', 'GMEAN', 'HMEAN', 'MAX', 'MEAN', 'MEDIAN', 'MIN',
            'PEAK', 'PERCENTILE', 'PROPORTION', 'RMS', 'STD_DEV', 'SUM',
@@ -1980,6 +1981,23 @@ class _Groupby(object):
 
         return
 
+    def group_index(self):
+        """
+        Calculate the group membership of each point over the group-by
+        coordinates.
+
+        Returns:
+            An integer array, with the length of the group-by axis, that
+            gives the index of the group to which each point belongs.
+
+        """
+        index = np.empty(self._stop, dtype=np.intp)
+        for i, groupby_slice in enumerate(self.group()):
+            if isinstance(groupby_slice, tuple):
+                groupby_slice = list(groupby_slice)
+            index[groupby_slice] = i
+        return index
+
     def _slice_merge(self):
         """
         Merge multiple slices into one tuple and collapse items from
@@ -2142,6 +2160,320 @@ class _Groupby(object):
                             shared_string)
 
 
+#: The aggregators that support a vectorised reduction over many groups at
+#: once, and the reduction each performs.
+_GROUPED_REDUCTIONS = {COUNT: 'count', MAX: 'max', MEAN: 'mean', MIN: 'min',
+                       SUM: 'sum'}
+
+
+def _mean_dtype(dtype, masked):
+    """
+    Return the dtype of the result of :func:`numpy.ma.average` of data of the
+    given dtype, which either has a mask or has no mask (i.e. "nomask").
+
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind not in 'fc' or masked:
+        dtype = np.result_type(dtype, np.float64)
+    return dtype
+
+
+def _grouped_reduction(kind, data, offsets, axis, mdtol=None, function=None,
+                       mean_dtype=None):
+    """
+    Reduce consecutive runs of data in a single vectorised pass.
+
+    Args:
+
+    * kind (string):
+        The reduction to perform, one of the values of
+        :data:`_GROUPED_REDUCTIONS`.
+    * data (array):
+        The data to reduce, which may be masked.
+    * offsets (array of int):
+        The start index of each run along the axis, in increasing order.
+    * axis (int):
+        The axis to reduce along.
+
+    Kwargs:
+
+    * mdtol (float):
+        Tolerance of missing data, as for
+        :meth:`iris.analysis.Aggregator.aggregate`.
+    * function (callable):
+        The selection function required by the "count" reduction.
+    * mean_dtype (dtype):
+        The dtype of the result of the "mean" reduction. Defaults to that of
+        :func:`numpy.ma.average` of the data.
+
+    Returns:
+        The reduced data, with one element per run along the axis.
+
+    """
+    is_masked = ma.isMaskedArray(data)
+    if kind == 'count':
+        if not callable(function):
+            emsg = 'function must be a callable. Got {}.'
+            raise TypeError(emsg.format(type(function)))
+        values = function(data)
+        values = values.filled(False) if is_masked else values
+    else:
+        values = ma.getdata(data)
+    # The number of points in each run, shaped to broadcast against the
+    # result.
+    shape = [1] * data.ndim
+    shape[axis] = len(offsets)
+    sizes = np.diff(np.append(offsets, data.shape[axis])).reshape(shape)
+    if is_masked:
+        mask = ma.getmaskarray(data)
+        counts = np.add.reduceat(~mask, offsets, axis=axis, dtype=np.intp)
+    else:
+        mask = None
+        counts = sizes
+
+    if kind in ('count', 'mean', 'sum'):
+        # Accumulate at the same (or better) precision as numpy.sum.
+        dtype = np.add.reduce(np.zeros(1, dtype=values.dtype)).dtype
+        if dtype.kind == 'f':
+            accumulate_dtype = np.float64
+        else:
+            accumulate_dtype = dtype
+        if mask is not None and kind != 'count':
+            values = np.where(mask, 0, values)
+        result = np.add.reduceat(values, offsets, axis=axis,
+                                 dtype=accumulate_dtype)
+        if kind == 'mean':
+            if mean_dtype is None:
+                mean_dtype = _mean_dtype(data.dtype,
+                                         ma.getmask(data) is not ma.nomask)
+            dtype = mean_dtype
+            result = result / np.maximum(counts, 1)
+        result = result.astype(dtype, copy=False)
+    else:
+        if kind == 'min':
+            ufunc, fill_value = np.minimum, ma.minimum_fill_value(values)
+        else:
+            ufunc, fill_value = np.maximum, ma.maximum_fill_value(values)
+        if mask is not None:
+            values = np.where(mask, fill_value, values)
+        result = ufunc.reduceat(values, offsets, axis=axis)
+
+    if is_masked:
+        result_mask = counts == 0
+        if mdtol is not None:
+            result_mask |= 1 - mdtol > counts / sizes
+        result = ma.masked_array(result, mask=result_mask)
+    return result
+
+
+def _aggregate_by_groups(aggregator, data, groupby, axis, **kwargs):
+    """
+    Aggregate data over each of the groups of a :class:`_Groupby`.
+
+    The :data:`SUM`, :data:`MEAN`, :data:`MIN`, :data:`MAX` and
+    :data:`COUNT` aggregators reduce all of the groups in a single vectorised
+    pass. Lazy data remains lazy, provided the aggregator supports lazy
+    operation.
+
+    Args:
+
+    * aggregator (:class:`iris.analysis.Aggregator`):
+        Aggregator to be applied to each group.
+    * data (array):
+        The real or lazy data to aggregate.
+    * groupby (:class:`_Groupby`):
+        The groups over the aggregation axis.
+    * axis (int):
+        The axis to aggregate over.
+
+    Kwargs:
+
+    * kwargs:
+        Aggregator and aggregation function keyword arguments.
+
+    Returns:
+        The aggregated data, with one element per group along the axis.
+
+    """
+    # Bring the members of each group together, in group order.
+    group_index = groupby.group_index()
+    order = np.argsort(group_index, kind='mergesort')
+    sizes = np.bincount(group_index)
+    offsets = np.cumsum(sizes) - sizes
+    if np.any(order != np.arange(order.size)):
+        if iris._lazy_data.is_lazy_data(data):
+            data = da.take(data, order, axis=axis)
+        else:
+            data = data.take(order, axis=axis)
+
+    kind = _GROUPED_REDUCTIONS.get(aggregator)
+    if kind is not None:
+        kwargs = dict(list(aggregator._kwargs.items()) + list(kwargs.items()))
+        supported = {'mdtol', 'function'} if kind == 'count' else {'mdtol'}
+        if set(kwargs) <= supported:
+            reduce_kwargs = dict(kind=kind, axis=axis, **kwargs)
+            if iris._lazy_data.is_lazy_data(data):
+                result = _lazy_grouped_reduction(data, offsets, reduce_kwargs)
+            else:
+                result = _grouped_reduction(data=data, offsets=offsets,
+                                            **reduce_kwargs)
+            return result
+
+    def group_data(i):
+        key = [slice(None)] * data.ndim
+        key[axis] = slice(offsets[i], offsets[i] + sizes[i])
+        return data[tuple(key)]
+
+    if iris._lazy_data.is_lazy_data(data):
+        if aggregator.lazy_func is not None:
+            results = [aggregator.lazy_aggregate(group_data(i), axis=axis,
+                                                 **kwargs)
+                       for i in range(len(sizes))]
+            return da.stack(results, axis=axis)
+        data = iris._lazy_data.as_concrete_data(data)
+
+    result_shape = list(data.shape + aggregator.aggregate_shape(**kwargs))
+    result_shape[axis] = len(sizes)
+    key = [slice(None)] * len(result_shape)
+    for i in range(len(sizes)):
+        group_result = aggregator.aggregate(group_data(i), axis=axis,
+                                            **kwargs)
+        # Determine the result data type on the first pass.
+        if i == 0:
+            if ma.isMaskedArray(data):
+                result = ma.zeros(result_shape, dtype=group_result.dtype)
+            else:
+                result = np.zeros(result_shape, dtype=group_result.dtype)
+        key[axis] = i
+        result[tuple(key)] = group_result
+    return result
+
+
+def _lazy_grouped_reduction(data, offsets, reduce_kwargs):
+    """
+    Lazily perform a :func:`_grouped_reduction`, in a single pass over the
+    chunks of the data.
+
+    The data is rechunked so that each chunk holds only whole groups, after
+    which every chunk is reduced independently.
+
+    """
+    axis = reduce_kwargs['axis']
+    # Gather whole groups into chunks no longer than the existing chunks,
+    # (unless a single group is longer).
+    target = max(data.chunks[axis])
+    bounds = list(offsets) + [data.shape[axis]]
+    chunk_starts = [0]
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if stop - chunk_starts[-1] > target and start > chunk_starts[-1]:
+            chunk_starts.append(start)
+    chunk_bounds = np.array(chunk_starts + [data.shape[axis]])
+    chunks = list(data.chunks)
+    chunks[axis] = tuple(int(size) for size in np.diff(chunk_bounds))
+    data = data.rechunk(tuple(chunks))
+
+    # The group offsets within each chunk along the axis.
+    block_offsets = [np.array(offsets[(offsets >= start) & (offsets < stop)]) -
+                     start
+                     for start, stop in zip(chunk_bounds[:-1],
+                                            chunk_bounds[1:])]
+    result_chunks = list(data.chunks)
+    result_chunks[axis] = tuple(len(block) for block in block_offsets)
+
+    def reduce_block(block, block_info=None):
+        index = block_info[0]['chunk-location'][axis]
+        return _grouped_reduction(data=block, offsets=block_offsets[index],
+                                  **reduce_kwargs)
+
+    if reduce_kwargs['kind'] == 'mean':
+        # Whether the chunks have masks is unknown, so give them all the
+        # dtype of the mean of data with no mask, as does dask.array.mean.
+        reduce_kwargs = dict(reduce_kwargs,
+                             mean_dtype=_mean_dtype(data.dtype, False))
+
+    meta = _grouped_reduction(data=np.zeros((1,) * data.ndim,
+                                            dtype=data.dtype),
+                              offsets=np.zeros(1, dtype=np.intp),
+                              **reduce_kwargs)
+    return da.map_blocks(reduce_block, data, chunks=tuple(result_chunks),
+                         dtype=meta.dtype)
+
+
+def _rolling_window_aggregate(data, aggregator, window, axis, **kwargs):
+    """
+    Aggregate real data over each rolling window along an axis.
+
+    Args:
+
+    * data (array):
+        The data to aggregate.
+    * aggregator (:class:`iris.analysis.Aggregator`):
+        Aggregator to be applied to each window.
+    * window (int):
+        Size of the rolling window.
+    * axis (int):
+        The axis to roll the window along.
+
+    Kwargs:
+
+    * kwargs:
+        Aggregator and aggregation function keyword arguments. Any "weights"
+        must be a 1d array with the same length as the window.
+
+    Returns:
+        The aggregated data, with one element per window along the axis.
+
+    """
+    # Take a view of the data with an extra dimension, at axis + 1, that
+    # represents the rolled window.
+    rolling_window_data = iris.util.rolling_window(data, window=window,
+                                                   axis=axis)
+    if kwargs.get('weights') is not None:
+        kwargs = dict(kwargs)
+        kwargs['weights'] = iris.util.broadcast_to_shape(
+            kwargs['weights'], rolling_window_data.shape, (axis + 1,))
+    return aggregator.aggregate(rolling_window_data, axis=axis + 1, **kwargs)
+
+
+def _lazy_rolling_window_aggregate(data, aggregator, window, axis, **kwargs):
+    """
+    Lazily perform a :func:`_rolling_window_aggregate`.
+
+    Each chunk along the axis is extended with only the following
+    "window - 1" points that its windows overlap, and is then aggregated
+    independently of all other chunks.
+
+    The aggregator must not return weights, or add dimensions to the result.
+
+    """
+    def aggregate_block(block):
+        result = _rolling_window_aggregate(block, aggregator, window, axis,
+                                           **kwargs)
+        return result.astype(dtype, copy=False)
+
+    shape = [1] * data.ndim
+    shape[axis] = window
+    dtype = _rolling_window_aggregate(np.zeros(shape, dtype=data.dtype),
+                                      aggregator, window, axis,
+                                      **kwargs).dtype
+
+    size = data.shape[axis] - window + 1
+    bounds = np.cumsum((0,) + data.chunks[axis])
+    results = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if start >= size:
+            break
+        stop = min(stop, size)
+        key = [slice(None)] * data.ndim
+        key[axis] = slice(start, stop + window - 1)
+        block = data[tuple(key)].rechunk({axis: -1})
+        chunks = list(block.chunks)
+        chunks[axis] = (stop - start,)
+        results.append(da.map_blocks(aggregate_block, block,
+                                     chunks=tuple(chunks), dtype=dtype))
+    return da.concatenate(results, axis=axis)
+
+
 def clear_phenomenon_identity(cube):
     """
     Helper function to clear the standard_name, attributes, and
@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2014 - 2016, Met Office
+# (C) British Crown Copyright 2014 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -75,6 +75,11 @@ class AreaWeightedRegridder(object):
         # current usage of the experimental regrid function.
         self._target_grid_cube_cache = None
 
+        # Calculate the area weights just once, for every cube regridded.
+        self._regrid_info = \
+            eregrid._regrid_area_weighted_rectilinear_src_and_grid__prepare(
+                src_grid_cube, self._target_grid_cube)
+
     @property
     def _target_grid_cube(self):
         if self._target_grid_cube_cache is None:
@@ -109,5 +114,5 @@ class AreaWeightedRegridder(object):
         if get_xy_dim_coords(cube) != self._src_grid:
             raise ValueError('The given cube is not defined on the same '
                              'source grid as this regridder.')
-        return eregrid.regrid_area_weighted_rectilinear_src_and_grid(
-            cube, self._target_grid_cube, mdtol=self._mdtol)
+        return eregrid._regrid_area_weighted_rectilinear_src_and_grid__perform(
+            cube, self._regrid_info, self._mdtol)
@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2014 - 2018, Met Office
+# (C) British Crown Copyright 2014 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -27,9 +27,11 @@ import numpy as np
 import numpy.ma as ma
 
 from iris.analysis._interpolation import (EXTRAPOLATION_MODES,
+                                          extend_circular_coord,
                                           extend_circular_coord_and_data,
                                           get_xy_dim_coords, snapshot_grid)
 from iris.analysis._scipy_interpolate import _RegularGridInterpolator
+from iris._lazy_data import map_complete_blocks
 import iris.cube
 from iris.util import _meshgrid
 
@@ -92,6 +94,9 @@ class RectilinearRegridder(object):
             msg = 'Invalid extrapolation mode {!r}'
             raise ValueError(msg.format(extrapolation_mode))
         self._extrapolation_mode = extrapolation_mode
+        # The sample grid and interpolation weights, which are calculated
+        # from the source and target grids on first use.
+        self._regrid_info = None
 
     @property
     def method(self):
@@ -138,11 +143,86 @@ class RectilinearRegridder(object):
             sample_grid_y = sample_xyz[..., 1]
         return sample_grid_x, sample_grid_y
 
+    @staticmethod
+    def _regrid_weights(src_x_coord, src_y_coord,
+                        sample_grid_x, sample_grid_y,
+                        method='linear', extrapolation_mode='nanmask'):
+        """
+        Calculate the interpolation weights of the sample grid points, for
+        the regridding of any data on the src grid by :meth:`_regrid`.
+
+        Args:
+
+        * src_x_coord:
+            The X :class:`iris.coords.DimCoord`.
+        * src_y_coord:
+            The Y :class:`iris.coords.DimCoord`.
+        * sample_grid_x:
+            A 2-dimensional array of sample X values.
+        * sample_grid_y:
+            A 2-dimensional array of sample Y values.
+
+        Kwargs:
+
+        * method:
+            Either 'linear' or 'nearest'. The default method is 'linear'.
+        * extrapolation_mode:
+            One of the modes of :meth:`_regrid`. The default mode of
+            extrapolation is 'nanmask'.
+
+        Returns:
+            The weights, which are only for passing to :meth:`_regrid`.
+
+        """
+        # The interpolation class requires monotonically increasing
+        # coordinates, so flip the coordinate(s) if they aren't.
+        if src_x_coord.points.size > 1 and \
+                src_x_coord.points[0] > src_x_coord.points[1]:
+            src_x_coord = src_x_coord[::-1]
+        if src_y_coord.points[0] > src_y_coord.points[1]:
+            src_y_coord = src_y_coord[::-1]
+
+        if src_x_coord.circular:
+            x_points = extend_circular_coord(src_x_coord, src_x_coord.points)
+        else:
+            x_points = src_x_coord.points
+        y_points = src_y_coord.points
+
+        # Construct an interpolator for the shape of the data. The weights
+        # do not depend upon its values.
+        interpolator = _RegularGridInterpolator(
+            [x_points, y_points], np.empty((x_points.size, y_points.size)),
+            method=method, bounds_error=False, fill_value=None)
+        try:
+            mode = EXTRAPOLATION_MODES[extrapolation_mode]
+        except KeyError:
+            raise ValueError('Invalid extrapolation mode.')
+        interpolator.bounds_error = mode.bounds_error
+
+        # Construct the target coordinate points array.
+        interp_coords = [sample_grid_x.astype(np.float64)[..., np.newaxis],
+                         sample_grid_y.astype(np.float64)[..., np.newaxis]]
+
+        # Map all the requested values into the range of the source
+        # data (centred over the centre of the source data to allow
+        # extrapolation where required).
+        min_x, max_x = x_points.min(), x_points.max()
+        if src_x_coord.units.modulus:
+            modulus = src_x_coord.units.modulus
+            offset = (max_x + min_x - modulus) * 0.5
+            interp_coords[0] -= offset
+            interp_coords[0] = (interp_coords[0] % modulus) + offset
+
+        interp_coords = np.dstack(interp_coords)
+
+        return interpolator.compute_interp_weights(interp_coords)
+
     @staticmethod
     def _regrid(src_data, x_dim, y_dim,
                 src_x_coord, src_y_coord,
                 sample_grid_x, sample_grid_y,
-                method='linear', extrapolation_mode='nanmask'):
+                method='linear', extrapolation_mode='nanmask',
+                weights=None):
         """
         Regrid the given data from the src grid to the sample grid.
 
@@ -194,6 +274,11 @@ class RectilinearRegridder(object):
 
             The default mode of extrapolation is 'nanmask'.
 
+        * weights:
+            The interpolation weights of the sample grid from
+            :meth:`_regrid_weights`, for the same coordinates, method and
+            extrapolation mode. By default, they are calculated here.
+
         Returns:
             The regridded data as an N-dimensional NumPy array. The lengths
             of the X and Y dimensions will now match those of the sample
@@ -230,6 +315,11 @@ class RectilinearRegridder(object):
         else:
             data = np.empty(shape, dtype=dtype)
 
+        if weights is None:
+            weights = RectilinearRegridder._regrid_weights(
+                src_x_coord, src_y_coord, sample_grid_x, sample_grid_y,
+                method, extrapolation_mode)
+
         # The interpolation class requires monotonically increasing
         # coordinates, so flip the coordinate(s) and data if they aren't.
         reverse_x = (src_x_coord.points[0] > src_x_coord.points[1] if
@@ -275,26 +365,6 @@ class RectilinearRegridder(object):
         interpolator.bounds_error = mode.bounds_error
         interpolator.fill_value = mode.fill_value
 
-        # Construct the target coordinate points array, suitable for passing to
-        # the interpolator multiple times.
-        interp_coords = [sample_grid_x.astype(np.float64)[..., np.newaxis],
-                         sample_grid_y.astype(np.float64)[..., np.newaxis]]
-
-        # Map all the requested values into the range of the source
-        # data (centred over the centre of the source data to allow
-        # extrapolation where required).
-        min_x, max_x = x_points.min(), x_points.max()
-        min_y, max_y = src_y_coord.points.min(), src_y_coord.points.max()
-        if src_x_coord.units.modulus:
-            modulus = src_x_coord.units.modulus
-            offset = (max_x + min_x - modulus) * 0.5
-            interp_coords[0] -= offset
-            interp_coords[0] = (interp_coords[0] % modulus) + offset
-
-        interp_coords = np.dstack(interp_coords)
-
-        weights = interpolator.compute_interp_weights(interp_coords)
-
         def interpolate(data):
             # Update the interpolator for this data slice.
             data = data.astype(interpolator.values.dtype)
@@ -523,22 +593,44 @@ class RectilinearRegridder(object):
         for coord in (src_x_coord, src_y_coord):
             self._check_units(coord)
 
-        # Convert the grid to a 2D sample grid in the src CRS.
-        sample_grid = self._sample_grid(src_cs, grid_x_coord, grid_y_coord)
-        sample_grid_x, sample_grid_y = sample_grid
-
-        # Compute the interpolated data values.
+        if self._regrid_info is None:
+            # Convert the grid to a 2D sample grid in the src CRS, and
+            # calculate its interpolation weights, once for all the cubes
+            # on the source grid.
+            sample_grid = self._sample_grid(src_cs, grid_x_coord,
+                                            grid_y_coord)
+            weights = self._regrid_weights(src_x_coord, src_y_coord,
+                                           sample_grid[0], sample_grid[1],
+                                           self._method,
+                                           self._extrapolation_mode)
+            self._regrid_info = (sample_grid, weights)
+        (sample_grid_x, sample_grid_y), weights = self._regrid_info
+
+        # Compute the interpolated data values, lazily if the source data is
+        # lazy, regridding the chunks of its other dimensions separately.
         x_dim = src.coord_dims(src_x_coord)[0]
         y_dim = src.coord_dims(src_y_coord)[0]
-        data = self._regrid(src.data, x_dim, y_dim,
-                            src_x_coord, src_y_coord,
-                            sample_grid_x, sample_grid_y,
-                            self._method, self._extrapolation_mode)
-
-        # Wrap up the data as a Cube.
+        regrid = functools.partial(self._regrid, x_dim=x_dim, y_dim=y_dim,
+                                   src_x_coord=src_x_coord,
+                                   src_y_coord=src_y_coord,
+                                   sample_grid_x=sample_grid_x,
+                                   sample_grid_y=sample_grid_y,
+                                   method=self._method,
+                                   extrapolation_mode=self._extrapolation_mode,
+                                   weights=weights)
+        dtype = src.dtype
+        if self._method == 'linear' and dtype.kind == 'i':
+            # The same dtype as the result of self._regrid.
+            dtype = np.promote_types(dtype, np.float16)
+        data = map_complete_blocks(src, regrid, (y_dim, x_dim),
+                                   sample_grid_x.shape, dtype=dtype)
+
+        # Wrap up the data as a Cube. Only the bounds check of the weights
+        # depends upon the extrapolation mode, so they hold for 'nan' too.
         regrid_callback = functools.partial(self._regrid,
                                             method=self._method,
-                                            extrapolation_mode='nan')
+                                            extrapolation_mode='nan',
+                                            weights=weights)
         result = self._create_cube(data, src, x_dim, y_dim,
                                    src_x_coord, src_y_coord,
                                    grid_x_coord, grid_y_coord,
@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2010 - 2018, Met Office
+# (C) British Crown Copyright 2010 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -24,18 +24,24 @@ from __future__ import (absolute_import, division, print_function)
 from six.moves import (filter, input, map, range, zip)  # noqa
 import six
 
+import collections
+import hashlib
 import math
+import threading
 
+import dask.array as da
 import numpy as np
 from scipy.spatial import cKDTree
 
 import iris.analysis
+import iris.config
 import iris.coord_systems
 import iris.coords
 
+from iris._lazy_data import is_lazy_data
 from iris.analysis import Linear
 from iris.analysis._interpolation import snapshot_grid
-from iris.util import _meshgrid
+from iris.util import _meshgrid, broadcast_to_shape
 
 
 class _Segment(object):
@@ -219,6 +225,14 @@ def interpolate(cube, sample_points, method=None):
         Only nearest neighbour is available when specifying multi-dimensional
         coordinates.
 
+    The result of "nearest" neighbour interpolation keeps the dtype and mask
+    of the source data, and is lazy if the source data is lazy, in which case
+    only the source data chunks containing sample points are read.
+
+    For "nearest" neighbour interpolation, a KD-tree of all the points of the
+    sample coordinates is built, and kept for re-use by later calls on the
+    same grid. The number of trees kept is set by
+    :data:`iris.config.trajectory`, which can also disable the cache.
 
     For example::
 
@@ -335,17 +349,12 @@ def interpolate(cube, sample_points, method=None):
                         column_coord.points[0]
 
     elif method == "nearest":
-        # Use a cache with _nearest_neighbour_indices_ndcoords()
-        cache = {}
-        column_indexes = _nearest_neighbour_indices_ndcoords(
-            cube, sample_points, cache=cache)
-
-        # Construct "fancy" indexes, so we can create the result data array in
-        # a single numpy indexing operation.
-        # ALSO: capture the index range in each dimension, so that we can fetch
-        # only a required (square) sub-region of the source data.
-        fancy_source_indices = []
-        region_slices = []
+        column_indexes = _nearest_neighbour_indices_ndcoords(cube,
+                                                             sample_points)
+
+        # Find which dimensions are addressed by the points, and the indices
+        # of the points along each of them.
+        point_indices = []
         n_index_length = len(column_indexes[0])
         dims_reduced = [False] * n_index_length
         for i_ind in range(n_index_length):
@@ -353,38 +362,17 @@ def interpolate(cube, sample_points, method=None):
                         for column_index in column_indexes]
             each_used = [content != slice(None) for content in contents]
             if np.all(each_used):
-                # This dimension is addressed : use a list of indices.
+                # This dimension is addressed : record the point indices.
                 dims_reduced[i_ind] = True
-                # Select the region by min+max indices.
-                start_ind = np.min(contents)
-                stop_ind = 1 + np.max(contents)
-                region_slice = slice(start_ind, stop_ind)
-                # Record point indices with start subtracted from all of them.
-                fancy_index = list(np.array(contents) - start_ind)
-            elif not np.any(each_used):
-                # This dimension is not addressed by the operation.
-                # Use a ":" as the index.
-                fancy_index = slice(None)
-                # No sub-region selection for this dimension.
-                region_slice = slice(None)
-            else:
+                point_indices.append(np.array(contents))
+            elif np.any(each_used):
                 # Should really never happen, if _ndcoords is right.
                 msg = ('Internal error in trajectory interpolation : point '
                        'selection indices should all have the same form.')
                 raise ValueError(msg)
 
-            fancy_source_indices.append(fancy_index)
-            region_slices.append(region_slice)
-
-        # Fetch the required (square-section) region of the source data.
-        # NOTE: This is not quite as good as only fetching the individual
-        # points used, but it avoids creating a sub-cube for each point,
-        # which is very slow, especially when points are re-used a lot ...
-        source_area_indices = tuple(region_slices)
-        source_data = cube[source_area_indices].data
-
         # Transpose source data before indexing it to get the final result.
-        # Because.. the fancy indexing will replace the indexed (horizontal)
+        # Because.. the point indexing will replace the indexed (horizontal)
         # dimensions with a new single dimension over trajectory points.
         # Move those dimensions to the end *first* : this ensures that the new
         # dimension also appears at the end, which is where we want it.
@@ -393,27 +381,11 @@ def interpolate(cube, sample_points, method=None):
         dims_order = np.arange(n_index_length)
         dims_order = np.concatenate((dims_order[~dims_reduced],
                                      dims_order[dims_reduced]))
-        # Rearrange the data dimensions and the fancy indices into that order.
-        source_data = source_data.transpose(dims_order)
-        fancy_source_indices = [fancy_source_indices[i_dim]
-                                for i_dim in dims_order]
-
-        # Apply the fancy indexing to get all the result data points.
-        source_data = source_data[tuple(fancy_source_indices)]
-
-        # "Fix" problems with missing datapoints producing odd values
-        # when copied from a masked into an unmasked array.
-        # TODO: proper masked data handling.
-        if np.ma.isMaskedArray(source_data):
-            # This is **not** proper mask handling, because we cannot produce a
-            # masked result, but it ensures we use a "filled" version of the
-            # input in this case.
-            source_data = source_data.filled()
-        new_cube.data[:] = source_data
-        # NOTE: we assign to "new_cube.data[:]" and *not* just "new_cube.data",
-        # because the existing code produces a default dtype from 'np.empty'
-        # instead of preserving the input dtype.
-        # TODO: maybe this should be fixed -- i.e. to preserve input dtype ??
+        source_data = cube.core_data().transpose(dims_order)
+
+        # Gather all the result data points, without fetching any more of the
+        # source data than those points need.
+        new_cube.data = _gather_points(source_data, point_indices)
 
         # Fill in the empty squashed (non derived) coords.
         column_coords = [coord
@@ -448,6 +420,68 @@ def interpolate(cube, sample_points, method=None):
     return new_cube
 
 
+def _gather_points(data, point_indices):
+    """
+    Return the values of an array at the given points, over all of its
+    leading dimensions.
+
+    Args:
+
+    * data:
+        A real or lazy array, whose trailing dimensions are those indexed by
+        the points.
+
+    * point_indices:
+        A list of the integer index arrays of the points, one for each of the
+        trailing dimensions of 'data'.
+
+    Returns:
+        An array with the leading dimensions of 'data' followed by a single
+        dimension of the points.  This is lazy if 'data' is lazy, in which
+        case only the chunks of 'data' which contain points are read.
+
+    """
+    point_indices = tuple(np.asarray(indices) for indices in point_indices)
+    if not is_lazy_data(data):
+        return data[(Ellipsis,) + point_indices]
+
+    n_lead_dims = data.ndim - len(point_indices)
+    point_chunks = data.chunks[n_lead_dims:]
+
+    # Find the chunk containing each point, along each point dimension.
+    chunk_starts = [np.cumsum((0,) + chunks[:-1]) for chunks in point_chunks]
+    chunk_indices = [np.searchsorted(starts, indices, side='right') - 1
+                     for starts, indices in zip(chunk_starts, point_indices)]
+
+    # Group the points by chunk, then gather each group from its chunk.
+    chunk_ids = np.ravel_multi_index(chunk_indices,
+                                     [len(chunks) for chunks in point_chunks])
+    order = np.argsort(chunk_ids, kind='mergesort')
+    group_starts = np.flatnonzero(np.diff(chunk_ids[order])) + 1
+    groups = []
+    for group in np.split(order, group_starts):
+        keys = []
+        local_indices = []
+        for starts, chunks, indices, chunk_index in zip(
+                chunk_starts, point_chunks, point_indices, chunk_indices):
+            i_chunk = chunk_index[group[0]]
+            start = starts[i_chunk]
+            keys.append(slice(start, start + chunks[i_chunk]))
+            local_indices.append(indices[group] - start)
+        chunk = data[(Ellipsis,) + tuple(keys)]
+        # Flatten the point dimensions of the chunk, to index the points of
+        # the group with a single index array.
+        point_shape = chunk.shape[n_lead_dims:]
+        chunk = chunk.reshape(chunk.shape[:n_lead_dims] +
+                              (int(np.prod(point_shape)),))
+        groups.append(chunk[..., np.ravel_multi_index(local_indices,
+                                                      point_shape)])
+
+    # Restore the original order of the points.
+    result = da.concatenate(groups, axis=-1)
+    return result[..., np.argsort(order)]
+
+
 def _ll_to_cart(lon, lat):
     # Based on cartopy.img_transform.ll_to_cart().
     x = np.sin(np.deg2rad(90 - lat)) * np.cos(np.deg2rad(lon))
@@ -472,7 +506,7 @@ def _cartesian_sample_points(sample_points, sample_point_coord_names):
         list of n coord names
 
     Returns:
-        list of [x,y,z,t,etc] positions, formatted for kdtree.
+        array of [x,y,z,t,etc] positions, formatted for kdtree.
 
     """
     # Find lat and lon coord indices
@@ -489,22 +523,82 @@ def _cartesian_sample_points(sample_points, sample_point_coord_names):
     if i_lat is None or i_lon is None:
         return sample_points.transpose()
 
-    num_points = len(sample_points[0])
-    cartesian_points = [None] * num_points
+    # Get the point coordinates without the latlon, then add cartesian xyz
+    # coordinates from latlon.
+    cartesian_points = [sample_points[c] for c in i_non_latlon]
+    cartesian_points.extend(_ll_to_cart(sample_points[i_lon],
+                                        sample_points[i_lat]))
 
-    # Get the point coordinates without the latlon
-    for p in range(num_points):
-        cartesian_points[p] = [sample_points[c][p] for c in i_non_latlon]
+    return np.array(cartesian_points).transpose()
 
-    # Add cartesian xyz coordinates from latlon
-    x, y, z = _ll_to_cart(sample_points[i_lon], sample_points[i_lat])
-    for p in range(num_points):
-        cartesian_point = cartesian_points[p]
-        cartesian_point.append(x[p])
-        cartesian_point.append(y[p])
-        cartesian_point.append(z[p])
 
-    return cartesian_points
+class _KDTreeCache(object):
+    """
+    A bounded, thread-safe, least-recently-used cache of sample space
+    :class:`scipy.spatial.cKDTree` instances, keyed by the content of the
+    coordinates they were built from (see :func:`_kdtree_key`).
+
+    The cache holds at most the given number of trees or, by default, the
+    number set by :data:`iris.config.trajectory`.
+
+    """
+    def __init__(self, size=None):
+        self._fixed_size = size
+        self._lock = threading.Lock()
+        self._trees = collections.OrderedDict()
+
+    @property
+    def _size(self):
+        size = self._fixed_size
+        if size is None:
+            size = iris.config.trajectory.kdtree_cache_size
+        return size
+
+    def _trim(self):
+        while len(self._trees) > self._size:
+            self._trees.popitem(last=False)
+
+    def get(self, key, default=None):
+        with self._lock:
+            kdtree = self._trees.pop(key, default)
+            if kdtree is not default:
+                # Mark the tree as recently used.
+                self._trees[key] = kdtree
+            self._trim()
+        return kdtree
+
+    def __setitem__(self, key, kdtree):
+        with self._lock:
+            self._trees.pop(key, None)
+            self._trees[key] = kdtree
+            self._trim()
+
+    def clear(self):
+        with self._lock:
+            self._trees.clear()
+
+
+#: The default cache of sample space KD-trees.
+_KDTREES = _KDTreeCache()
+
+
+def _kdtree_key(shape, coords_and_dims):
+    """
+    Return a key identifying the sample space KD-tree of coordinates on a
+    sample space of the given shape, by the content of the coordinates, so
+    that equal coordinates from any cube share a tree.
+
+    """
+    hasher = hashlib.sha1()
+    hasher.update(repr(tuple(shape)).encode('utf-8'))
+    for coord, dims in coords_and_dims:
+        points = np.ascontiguousarray(coord.points)
+        # The names matter, as latitudes and longitudes are converted to
+        # cartesian positions.
+        state = (coord.name(), tuple(dims), points.dtype.str, points.shape)
+        hasher.update(repr(state).encode('utf-8'))
+        hasher.update(points.tobytes())
+    return hasher.hexdigest()
 
 
 def _nearest_neighbour_indices_ndcoords(cube, sample_points, cache=None):
@@ -518,8 +612,12 @@ def _nearest_neighbour_indices_ndcoords(cube, sample_points, cache=None):
     This function is adapted for points sampling a multi-dimensional coord,
     and can currently only do nearest neighbour interpolation.
 
-    Because this function can be slow for multidimensional coordinates,
-    a 'cache' dictionary can be provided by the calling code.
+    Because building the KD-tree of the sample space can be slow for
+    multidimensional coordinates, the trees are cached, keyed by the content
+    of the sample space coordinates, so that repeated calls for cubes on the
+    same grid reuse them. By default, a module cache is used, whose size is
+    set by :data:`iris.config.trajectory`, but a 'cache' dictionary can be
+    provided by the calling code instead.
 
     .. Note::
 
@@ -597,25 +695,26 @@ def _nearest_neighbour_indices_ndcoords(cube, sample_points, cache=None):
         [(coord, sample_space_cube.coord_dims(coord))
          for coord in sample_space_coords]
 
-    if cache is not None and cube in cache:
-        kdtree = cache[cube]
-    else:
+    if cache is None:
+        cache = _KDTREES
+    sample_space_shape = sample_space_cube.shape
+    cache_key = _kdtree_key(sample_space_shape, sample_space_coords_and_dims)
+    kdtree = cache.get(cache_key)
+    if kdtree is None:
         # Create a "sample space position" for each
-        # `datum.sample_space_data_positions[coord_index][datum_index]`.
+        # `datum.sample_space_data_positions[coord_index][datum_index]`,
+        # by broadcasting the points of each coordinate over the sample space.
         sample_space_data_positions = \
             np.empty((len(sample_space_coords_and_dims),
-                      sample_space_cube.data.size),
+                      int(np.prod(sample_space_shape))),
                      dtype=float)
-        for d, ndi in enumerate(np.ndindex(sample_space_cube.data.shape)):
-            for c, (coord, coord_dims) in \
-                    enumerate(sample_space_coords_and_dims):
-                # Index of this datum along this coordinate (could be nD).
-                if coord_dims:
-                    keys = tuple(ndi[ind] for ind in coord_dims)
-                else:
-                    keys = slice(None, None)
-                # Position of this datum along this coordinate.
-                sample_space_data_positions[c][d] = coord.points[keys]
+        for c, (coord, coord_dims) in enumerate(sample_space_coords_and_dims):
+            if coord_dims:
+                points = broadcast_to_shape(coord.points, sample_space_shape,
+                                            coord_dims)
+                sample_space_data_positions[c] = points.reshape(-1)
+            else:
+                sample_space_data_positions[c] = coord.points
 
         # Convert to cartesian coordinates. Flatten for kdtree compatibility.
         cartesian_space_data_coords = \
@@ -627,9 +726,8 @@ def _nearest_neighbour_indices_ndcoords(cube, sample_points, cache=None):
         # This can find the nearest datum point to any given target point,
         # which is the goal of this function.
 
-    # Update cache.
-    if cache is not None:
-        cache[cube] = kdtree
+        # Update cache.
+        cache[cache_key] = kdtree
 
     # Convert the sample points to cartesian (3d) coords.
     # If there is no latlon within the coordinate there will be no change.
@@ -642,7 +740,7 @@ def _nearest_neighbour_indices_ndcoords(cube, sample_points, cache=None):
 
     # Convert flat indices back into multidimensional sample-space indices.
     sample_space_dimension_indices = np.unravel_index(
-        datum_index_lists, sample_space_cube.data.shape)
+        datum_index_lists, sample_space_shape)
     # Convert this from "pointwise list of index arrays for each dimension",
     # to "list of cube indices for each point".
     sample_space_ndis = np.array(sample_space_dimension_indices).transpose()
@@ -680,8 +778,9 @@ class UnstructuredNearestNeigbourRegridder(object):
     regridding scheme.
 
     """
-    # TODO: cache the necessary bits of the operation so re-use can actually
-    # be more efficient.
+    # TODO: cache the remaining bits of the operation so re-use can actually
+    # be more efficient.  (The KD-tree of the source grid is already cached
+    # by _nearest_neighbour_indices_ndcoords.)
     def __init__(self, src_cube, target_grid_cube):
         """
         A nearest-neighbour regridder to perform regridding from the source
@@ -725,6 +824,11 @@ class UnstructuredNearestNeigbourRegridder(object):
             must be.  Otherwise, the corresponding X and Y coordinates must
             have the same units in the source and grid cubes.
 
+            A KD-tree of all the source X and Y points is built, and kept for
+            re-use by later regridders of the same source grid. The number of
+            trees kept is set by :data:`iris.config.trajectory`, which can
+            also disable the cache.
+
         """
         # Make a copy of the source cube, so we can convert coordinate units.
         src_cube = src_cube.copy()
@@ -827,7 +931,8 @@ class UnstructuredNearestNeigbourRegridder(object):
         # The shape is that of the basic result, minus the trajectory (last)
         # dimension, plus the target grid dimensions.
         target_shape = result_trajectory_cube.shape[:-1] + self.tgt_grid_shape
-        data_2d_x_and_y = result_trajectory_cube.data.reshape(target_shape)
+        data_2d_x_and_y = result_trajectory_cube.core_data().reshape(
+            target_shape)
 
         # Make a new result cube with the reshaped data.
         result_cube = iris.cube.Cube(data_2d_x_and_y)
@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2010 - 2018, Met Office
+# (C) British Crown Copyright 2010 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -123,49 +123,15 @@ PALETTE_PATH = get_dir_option(_RESOURCE_SECTION, 'palette_path',
 # Runtime options
 
 
-class NetCDF(object):
-    """Control Iris NetCDF options."""
-
-    def __init__(self, conventions_override=None):
-        """
-        Set up NetCDF processing options for Iris.
-
-        Currently accepted kwargs:
-
-        * conventions_override (bool):
-            Define whether the CF Conventions version (e.g. `CF-1.6`) set when
-            saving a cube to a NetCDF file should be defined by
-            Iris (the default) or the cube being saved.
-
-            If `False` (the default), specifies that Iris should set the
-            CF Conventions version when saving cubes as NetCDF files.
-            If `True`, specifies that the cubes being saved to NetCDF should
-            set the CF Conventions version for the saved NetCDF files.
-
-        Example usages:
-
-        * Specify, for the lifetime of the session, that we want all cubes
-          written to NetCDF to define their own CF Conventions versions::
-
-            iris.config.netcdf.conventions_override = True
-            iris.save('my_cube', 'my_dataset.nc')
-            iris.save('my_second_cube', 'my_second_dataset.nc')
-
-        * Specify, with a context manager, that we want a cube written to
-          NetCDF to define its own CF Conventions version::
-
-            with iris.config.netcdf.context(conventions_override=True):
-                iris.save('my_cube', 'my_dataset.nc')
-
-        """
-        # Define allowed `__dict__` keys first.
-        self.__dict__['conventions_override'] = None
+class _Options(object):
+    """
+    Common behaviour of a set of options, which are defined by the
+    `_defaults_dict` of each subclass.
 
-        # Now set specific values.
-        setattr(self, 'conventions_override', conventions_override)
+    """
 
     def __repr__(self):
-        msg = 'NetCDF options: {}.'
+        msg = '{} options: {{}}.'.format(self.__class__.__name__)
         # Automatically populate with all currently accepted kwargs.
         options = ['{}={}'.format(k, v)
                    for k, v in six.iteritems(self.__dict__)]
@@ -192,13 +158,6 @@ class NetCDF(object):
                 value = good_value
         self.__dict__[name] = value
 
-    @property
-    def _defaults_dict(self):
-        # Set this as a property so that it isn't added to `self.__dict__`.
-        return {'conventions_override': {'default': False,
-                                         'options': [True, False]},
-                }
-
     @contextlib.contextmanager
     def context(self, **kwargs):
         """
@@ -220,4 +179,286 @@ class NetCDF(object):
             self.__dict__.update(starting_state)
 
 
+class NetCDF(_Options):
+    """Control Iris NetCDF options."""
+
+    def __init__(self, conventions_override=None, dataset_pool_size=None,
+                 load_rules=None, write_queue_size=None, chunk_bytes=None):
+        """
+        Set up NetCDF processing options for Iris.
+
+        Currently accepted kwargs:
+
+        * conventions_override (bool):
+            Define whether the CF Conventions version (e.g. `CF-1.6`) set when
+            saving a cube to a NetCDF file should be defined by
+            Iris (the default) or the cube being saved.
+
+            If `False` (the default), specifies that Iris should set the
+            CF Conventions version when saving cubes as NetCDF files.
+            If `True`, specifies that the cubes being saved to NetCDF should
+            set the CF Conventions version for the saved NetCDF files.
+
+        * dataset_pool_size (int):
+            The maximum number of NetCDF files that are held open, for
+            re-use, when reading the data payload of lazy cubes. Defaults
+            to 16. When more files are in use, the least recently used file
+            is closed. A value of 0 disables the pool, so that every read
+            opens and closes its file.
+
+        * load_rules (string):
+            How the CF-netCDF variables of a file are translated into
+            cubes. Either 'dispatch' (the default), which applies the CF
+            load rules directly from fixed tables, or 'pyke', which infers
+            them with the pyke rules engine. Both give the same cubes.
+
+        * write_queue_size (int):
+            The number of computed chunks of lazy data that may wait to be
+            written when saving cubes to a NetCDF file. The chunks are
+            computed in parallel while a single thread writes them to the
+            file. Defaults to 8. A value of 0 computes and writes each
+            chunk in turn.
+
+        * chunk_bytes (int):
+            The target size, in bytes, of the chunks of the lazy data loaded
+            from a chunked NetCDF variable. Each chunk is made of whole
+            storage chunks of the variable, grouped along its leading
+            dimensions first. Defaults to 2**27 (128 MiB). A value of 0
+            makes each storage chunk a chunk of its own.
+
+        Example usages:
+
+        * Specify, for the lifetime of the session, that we want all cubes
+          written to NetCDF to define their own CF Conventions versions::
+
+            iris.config.netcdf.conventions_override = True
+            iris.save('my_cube', 'my_dataset.nc')
+            iris.save('my_second_cube', 'my_second_dataset.nc')
+
+        * Specify, with a context manager, that we want a cube written to
+          NetCDF to define its own CF Conventions version::
+
+            with iris.config.netcdf.context(conventions_override=True):
+                iris.save('my_cube', 'my_dataset.nc')
+
+        * Specify, with a context manager, smaller chunks for the lazy data
+          of one load::
+
+            with iris.config.netcdf.context(chunk_bytes=2**20):
+                cubes = iris.load('my_dataset.nc')
+
+        """
+        # Define allowed `__dict__` keys first.
+        self.__dict__['conventions_override'] = None
+        self.__dict__['dataset_pool_size'] = None
+        self.__dict__['load_rules'] = None
+        self.__dict__['write_queue_size'] = None
+        self.__dict__['chunk_bytes'] = None
+
+        # Now set specific values.
+        setattr(self, 'conventions_override', conventions_override)
+        setattr(self, 'dataset_pool_size', dataset_pool_size)
+        setattr(self, 'load_rules', load_rules)
+        setattr(self, 'write_queue_size', write_queue_size)
+        setattr(self, 'chunk_bytes', chunk_bytes)
+
+    @property
+    def _defaults_dict(self):
+        # Set this as a property so that it isn't added to `self.__dict__`.
+        return {'conventions_override': {'default': False,
+                                         'options': [True, False]},
+                'dataset_pool_size': {'default': 16, 'options': None},
+                'load_rules': {'default': 'dispatch',
+                               'options': ['dispatch', 'pyke']},
+                'write_queue_size': {'default': 8, 'options': None},
+                'chunk_bytes': {'default': 2 ** 27, 'options': None},
+                }
+
+
 netcdf = NetCDF()
+
+
+class PP(_Options):
+    """Control Iris PP options."""
+
+    def __init__(self, index_files=None, index_dir=None, mmap=None,
+                 decode_workers=None):
+        """
+        Set up PP processing options for Iris.
+
+        Currently accepted kwargs:
+
+        * index_files (bool):
+            Define whether the field headers found when scanning a PP file
+            for deferred loading are recorded in an index file. When a valid
+            index exists, later loads of the same file make their fields
+            from the index, without reading the file itself. An index is
+            only used while the size and modification time of its PP file
+            are unchanged. Defaults to `False`.
+
+        * index_dir (string):
+            The directory in which index files are written. By default
+            (`None`), the index of a PP file is a hidden file alongside it.
+
+        * mmap (bool):
+            Define whether the deferred data of unpacked PP fields is read by
+            memory-mapping the file. The data of native-endian fields is then
+            a copy-on-write view of the file rather than a copy of it, and
+            other unpacked data is copied only once, to swap its byte order.
+            Defaults to `False`.
+
+        * decode_workers (int):
+            The number of threads used to decode packed (WGDOS or RLE) PP
+            and FieldsFile fields when the data of many fields is read at
+            once. A value of 1 decodes the fields one at a time. Defaults to
+            0, meaning one thread per CPU.
+
+        Example usage:
+
+        * Specify, with a context manager, that loading a set of PP files
+          should write or use their index files::
+
+            with iris.config.pp.context(index_files=True):
+                cubes = iris.load('archive/*.pp')
+
+        """
+        # Define allowed `__dict__` keys first.
+        self.__dict__['index_files'] = None
+        self.__dict__['index_dir'] = None
+        self.__dict__['mmap'] = None
+        self.__dict__['decode_workers'] = None
+
+        # Now set specific values.
+        setattr(self, 'index_files', index_files)
+        setattr(self, 'index_dir', index_dir)
+        setattr(self, 'mmap', mmap)
+        setattr(self, 'decode_workers', decode_workers)
+
+    @property
+    def _defaults_dict(self):
+        # Set this as a property so that it isn't added to `self.__dict__`.
+        return {'index_files': {'default': False, 'options': [True, False]},
+                'index_dir': {'default': None, 'options': None},
+                'mmap': {'default': False, 'options': [True, False]},
+                'decode_workers': {'default': 0, 'options': None},
+                }
+
+
+pp = PP()
+
+
+class Load(_Options):
+    """Control Iris loading options."""
+
+    def __init__(self, workers=None, cache_dir=None, cache_size=None):
+        """
+        Set up loading options for Iris.
+
+        Currently accepted kwargs:
+
+        * workers (int):
+            The number of files that :func:`iris.load` and the related
+            functions work on at once. With more than one worker, the
+            formats of the files are identified, and the fields of PP and
+            FieldsFile files are read, by a pool of threads. The cubes
+            loaded are the same, and in the same order, as for a serial
+            load. Defaults to 1.
+
+        * cache_dir (string or None):
+            The directory of an on-disk cache of the cubes loaded by
+            :func:`iris.load` and the related functions. A later load of
+            the same unchanged files, with the same constraints and
+            callback, reads the cubes from the cache, still lazy, rather
+            than translating the files again. A file counts as unchanged
+            while its path, size and modification time are the same.
+            Defaults to None, which disables the cache.
+
+            .. warning::
+
+                The cache holds pickles, and reading a pickle can run
+                arbitrary code, so the directory must be private to you.
+                Never use a shared or world-writable directory, such as
+                one directly under /tmp. The directory is created
+                accessible only by you, and the cache is ignored, with a
+                warning, if the directory or a cache file is owned by
+                another user. The cache is not used on platforms without
+                user ids, where ownership cannot be checked.
+
+        * cache_size (int):
+            The size, in bytes, beyond which the least recently used
+            entries of the load cache are removed. Defaults to 2**30.
+
+        Example usage:
+
+        * Specify, with a context manager, that a set of PP files is read
+          by eight threads::
+
+            with iris.config.load.context(workers=8):
+                cubes = iris.load('archive/*.pp')
+
+        """
+        # Define allowed `__dict__` keys first.
+        self.__dict__['workers'] = None
+        self.__dict__['cache_dir'] = None
+        self.__dict__['cache_size'] = None
+
+        # Now set specific values.
+        setattr(self, 'workers', workers)
+        setattr(self, 'cache_dir', cache_dir)
+        setattr(self, 'cache_size', cache_size)
+
+    @property
+    def _defaults_dict(self):
+        # Set this as a property so that it isn't added to `self.__dict__`.
+        return {'workers': {'default': 1, 'options': None},
+                'cache_dir': {'default': None, 'options': None},
+                'cache_size': {'default': 2**30, 'options': None},
+                }
+
+
+load = Load()
+
+
+class Trajectory(_Options):
+    """Control Iris trajectory options."""
+
+    def __init__(self, kdtree_cache_size=None):
+        """
+        Set up trajectory options for Iris.
+
+        Currently accepted kwargs:
+
+        * kdtree_cache_size (int):
+            The number of sample space KD-trees that are kept, for re-use,
+            by the nearest-neighbour interpolation and regridding of
+            :mod:`iris.analysis.trajectory`. A tree is re-used by any later
+            operation that samples the same coordinates, and is built from
+            every point of those coordinates, so it can take a lot of
+            memory. Defaults to 4. When more trees are in use, the least
+            recently used tree is discarded. A value of 0 disables the
+            cache, and discards the trees held at the next use of the
+            cache.
+
+        Example usage:
+
+        * Specify, with a context manager, that no KD-trees are kept for
+          the interpolation of a very large grid::
+
+            with iris.config.trajectory.context(kdtree_cache_size=0):
+                result = interpolate(cube, sample_points, method='nearest')
+
+        """
+        # Define allowed `__dict__` keys first.
+        self.__dict__['kdtree_cache_size'] = None
+
+        # Now set specific values.
+        setattr(self, 'kdtree_cache_size', kdtree_cache_size)
+
+    @property
+    def _defaults_dict(self):
+        # Set this as a property so that it isn't added to `self.__dict__`.
+        return {'kdtree_cache_size': {'default': 4, 'options': None},
+                }
+
+
+trajectory = Trajectory()
@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2010 - 2018, Met Office
+# (C) British Crown Copyright 2010 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -33,11 +33,16 @@ import six
 
 import calendar
 import collections
+import weakref
 
+import cf_units
 import numpy as np
 
 import iris.coords
 
+# Use a common type for string arrays (N.B. limited to 64 chars)
+_STRING_CATEGORY_DTYPE = '|S64' if six.PY2 else '|U64'
+
 
 def add_categorised_coord(cube, name, from_coord, category_function,
                           units='1'):
@@ -64,13 +69,7 @@ def add_categorised_coord(cube, name, from_coord, category_function,
     * units:
         units of the category value, typically 'no_unit' or '1'.
     """
-    # Interpret coord, if given as a name
-    if isinstance(from_coord, six.string_types):
-        from_coord = cube.coord(from_coord)
-
-    if len(cube.coords(name)) > 0:
-        msg = 'A coordinate "%s" already exists in the cube.' % name
-        raise ValueError(msg)
+    from_coord = _categorisation_source(cube, name, from_coord)
 
     # Construct new coordinate by mapping values, using numpy.vectorize to
     # support multi-dimensional coords.
@@ -79,16 +78,40 @@ def add_categorised_coord(cube, name, from_coord, category_function,
     result = category_function(from_coord, from_coord.points.ravel()[0])
     if isinstance(result, six.string_types):
         str_vectorised_fn = np.vectorize(category_function, otypes=[object])
-        # Use a common type for string arrays (N.B. limited to 64 chars)
-        all_cases_string_type = '|S64' if six.PY2 else '|U64'
 
         def vectorised_fn(*args):
-            return str_vectorised_fn(*args).astype(all_cases_string_type)
+            return str_vectorised_fn(*args).astype(_STRING_CATEGORY_DTYPE)
 
     else:
         vectorised_fn = np.vectorize(category_function)
-    new_coord = iris.coords.AuxCoord(vectorised_fn(from_coord,
-                                                   from_coord.points),
+    _add_category_points(cube, name, from_coord,
+                         vectorised_fn(from_coord, from_coord.points), units)
+
+
+def _categorisation_source(cube, name, from_coord):
+    """
+    Return the coordinate to be categorised, checking that the cube does not
+    already have a coordinate called 'name'.
+
+    """
+    # Interpret coord, if given as a name
+    if isinstance(from_coord, six.string_types):
+        from_coord = cube.coord(from_coord)
+
+    if len(cube.coords(name)) > 0:
+        msg = 'A coordinate "%s" already exists in the cube.' % name
+        raise ValueError(msg)
+
+    return from_coord
+
+
+def _add_category_points(cube, name, from_coord, points, units):
+    """
+    Add a new :class:`iris.coords.AuxCoord` with the given category points
+    to the cube, spanning the same dimensions as 'from_coord'.
+
+    """
+    new_coord = iris.coords.AuxCoord(points,
                                      units=units,
                                      attributes=from_coord.attributes.copy())
     new_coord.rename(name)
@@ -127,44 +150,164 @@ def _pt_date(coord, time):
     return coord.units.num2date(time)
 
 
+class _DateFields(object):
+    """
+    The calendar date components of all the points of a time coordinate.
+
+    The points are converted to dates with a single call to num2date, and
+    then to whole hours since the start of the year of the earliest point.
+    Every component is derived from those hour offsets by array arithmetic,
+    using a table of the days on which each month starts.
+
+    """
+    def __init__(self, coord):
+        self.units = coord.units
+        # Copy the points, as the coordinate may return a view of its points
+        # which is then changed in place.
+        self.points = coord.points.copy()
+        self._fields = self._calculate()
+
+    def _calculate(self):
+        dates = np.asarray(_pt_date(self, self.points), dtype=object)
+        first = dates.flat[np.argmin(self.points)]
+        last = dates.flat[np.argmax(self.points)]
+        date_type = type(first)
+        hour_units = cf_units.Unit(
+            'hours since {:04d}-01-01'.format(first.year),
+            calendar=self.units.calendar)
+
+        # The year, month and start day of every month spanned.
+        years, months, starts = [], [], []
+        for year in range(first.year, last.year + 1):
+            for month in range(1, 13):
+                try:
+                    starts.append(date_type(year, month, 1))
+                except ValueError:
+                    # Not every calendar has a year zero.
+                    continue
+                years.append(year)
+                months.append(month)
+        years = np.array(years, dtype=np.int_)
+        months = np.array(months, dtype=np.int_)
+        starts = np.around(hour_units.date2num(starts) / 24).astype(np.int_)
+
+        hours = np.floor(hour_units.date2num(dates)).astype(np.int_)
+        days = hours // 24
+        index = np.searchsorted(starts, days, side='right') - 1
+        month = months[index]
+        # Note: cftime.datetime objects return a normal tuple from
+        # timetuple(), unlike datetime.datetime objects that return a
+        # namedtuple. Index the time tuple (element 6 is day of week).
+        first_weekday = date_type(first.year, 1, 1).timetuple()[6]
+        fields = {'year': years[index],
+                  'month': month,
+                  'day': days - starts[index] + 1,
+                  'hour': hours % 24,
+                  'day_of_year': days - starts[index - month + 1] + 1,
+                  'weekday': (days + first_weekday) % 7}
+        if self.units.calendar in (cf_units.CALENDAR_STANDARD,
+                                   cf_units.CALENDAR_GREGORIAN):
+            # Skip the days dropped by the change to the Gregorian calendar,
+            # which are still counted by the day of year.
+            in_1582 = fields['year'] == 1582
+            october = in_1582 & (month == 10) & (fields['day'] > 4)
+            fields['day'][october] += 10
+            fields['day_of_year'][october | (in_1582 & (month > 10))] += 10
+        return fields
+
+    def matches(self, coord):
+        """Whether these are the date components of the given coordinate."""
+        points = coord.points
+        return (coord.units == self.units and
+                points.shape == self.points.shape and
+                np.array_equal(points, self.points))
+
+    def __getitem__(self, name):
+        return self._fields[name]
+
+
+# The date components already computed for each live time coordinate, so that
+# several categorisations of the same coordinate share a single conversion.
+_DATE_FIELDS_CACHE = weakref.WeakKeyDictionary()
+
+
+def _date_fields(coord):
+    """
+    Return the :class:`_DateFields` of a time coordinate, reusing those
+    computed by any previous categorisation of the same, unchanged,
+    coordinate.
+
+    """
+    fields = _DATE_FIELDS_CACHE.get(coord)
+    if fields is None or not fields.matches(coord):
+        fields = _DateFields(coord)
+        _DATE_FIELDS_CACHE[coord] = fields
+    return fields
+
+
+def _add_date_categorised_coord(cube, name, from_coord, category_function,
+                                units='1'):
+    """
+    Add a new coordinate to a cube, by categorising the dates of an existing
+    time coordinate.
+
+    This is the equivalent of :func:`add_categorised_coord` for
+    categorisations that depend only on the calendar date components of the
+    points. The 'category_function' is called once, with the
+    :class:`_DateFields` of 'from_coord', and returns the array of all the
+    category values.
+
+    """
+    from_coord = _categorisation_source(cube, name, from_coord)
+    points = category_function(_date_fields(from_coord))
+    _add_category_points(cube, name, from_coord, points, units)
+
+
+def _names_lookup(names):
+    """Return an array of category names, for indexing with numbers."""
+    return np.array(list(names), dtype=_STRING_CATEGORY_DTYPE)
+
+
 # --------------------------------------------
 # Time categorisations : calendar date components
 
 def add_year(cube, coord, name='year'):
     """Add a categorical calendar-year coordinate."""
-    add_categorised_coord(
+    _add_date_categorised_coord(
         cube, name, coord,
-        lambda coord, x: _pt_date(coord, x).year)
+        lambda fields: fields['year'])
 
 
 def add_month_number(cube, coord, name='month_number'):
     """Add a categorical month coordinate, values 1..12."""
-    add_categorised_coord(
+    _add_date_categorised_coord(
         cube, name, coord,
-        lambda coord, x: _pt_date(coord, x).month)
+        lambda fields: fields['month'])
 
 
 def add_month_fullname(cube, coord, name='month_fullname'):
     """Add a categorical month coordinate, values 'January'..'December'."""
-    add_categorised_coord(
+    month_names = _names_lookup(calendar.month_name)
+    _add_date_categorised_coord(
         cube, name, coord,
-        lambda coord, x: calendar.month_name[_pt_date(coord, x).month],
+        lambda fields: month_names[fields['month']],
         units='no_unit')
 
 
 def add_month(cube, coord, name='month'):
     """Add a categorical month coordinate, values 'Jan'..'Dec'."""
-    add_categorised_coord(
+    month_names = _names_lookup(calendar.month_abbr)
+    _add_date_categorised_coord(
         cube, name, coord,
-        lambda coord, x: calendar.month_abbr[_pt_date(coord, x).month],
+        lambda fields: month_names[fields['month']],
         units='no_unit')
 
 
 def add_day_of_month(cube, coord, name='day_of_month'):
     """Add a categorical day-of-month coordinate, values 1..31."""
-    add_categorised_coord(
+    _add_date_categorised_coord(
         cube, name, coord,
-        lambda coord, x: _pt_date(coord, x).day)
+        lambda fields: fields['day'])
 
 
 def add_day_of_year(cube, coord, name='day_of_year'):
@@ -173,13 +316,9 @@ def add_day_of_year(cube, coord, name='day_of_year'):
     (1..366 in leap years).
 
     """
-    # Note: cftime.datetime objects return a normal tuple from timetuple(),
-    # unlike datetime.datetime objects that return a namedtuple.
-    # Index the time tuple (element 7 is day of year) instead of using named
-    # element tm_yday.
-    add_categorised_coord(
+    _add_date_categorised_coord(
         cube, name, coord,
-        lambda coord, x: _pt_date(coord, x).timetuple()[7])
+        lambda fields: fields['day_of_year'])
 
 
 # --------------------------------------------
@@ -187,24 +326,26 @@ def add_day_of_year(cube, coord, name='day_of_year'):
 
 def add_weekday_number(cube, coord, name='weekday_number'):
     """Add a categorical weekday coordinate, values 0..6  [0=Monday]."""
-    add_categorised_coord(
+    _add_date_categorised_coord(
         cube, name, coord,
-        lambda coord, x: _pt_date(coord, x).weekday())
+        lambda fields: fields['weekday'])
 
 
 def add_weekday_fullname(cube, coord, name='weekday_fullname'):
     """Add a categorical weekday coordinate, values 'Monday'..'Sunday'."""
-    add_categorised_coord(
+    day_names = _names_lookup(calendar.day_name)
+    _add_date_categorised_coord(
         cube, name, coord,
-        lambda coord, x: calendar.day_name[_pt_date(coord, x).weekday()],
+        lambda fields: day_names[fields['weekday']],
         units='no_unit')
 
 
 def add_weekday(cube, coord, name='weekday'):
     """Add a categorical weekday coordinate, values 'Mon'..'Sun'."""
-    add_categorised_coord(
+    day_names = _names_lookup(calendar.day_abbr)
+    _add_date_categorised_coord(
         cube, name, coord,
-        lambda coord, x: calendar.day_abbr[_pt_date(coord, x).weekday()],
+        lambda fields: day_names[fields['weekday']],
         units='no_unit')
 
 
@@ -213,9 +354,9 @@ def add_weekday(cube, coord, name='weekday'):
 
 def add_hour(cube, coord, name='hour'):
     """Add a categorical hour coordinate, values 0..23."""
-    add_categorised_coord(
+    _add_date_categorised_coord(
         cube, name, coord,
-        lambda coord, x: _pt_date(coord, x).hour)
+        lambda fields: fields['hour'])
 
 
 # ----------------------------------------------
@@ -325,13 +466,16 @@ def add_season(cube, coord, name='season',
     # as the indices.
     month_season_numbers = _month_season_numbers(seasons)
 
+    # Map month numbers directly to season names.
+    month_seasons = _names_lookup(
+        [seasons[number] for number in month_season_numbers[1:]])
+
     # Define a categorisation function.
-    def _season(coord, value):
-        dt = _pt_date(coord, value)
-        return seasons[month_season_numbers[dt.month]]
+    def _season(fields):
+        return month_seasons[fields['month'] - 1]
 
     # Apply the categorisation.
-    add_categorised_coord(cube, name, coord, _season, units='no_unit')
+    _add_date_categorised_coord(cube, name, coord, _season, units='no_unit')
 
 
 def add_season_number(cube, coord, name='season_number',
@@ -360,17 +504,17 @@ def add_season_number(cube, coord, name='season_number',
     """
     # Check that the seasons are valid.
     _validate_seasons(seasons)
-    # Get a list of the season number each month is is, using month numbers
-    # as the indices.
-    month_season_numbers = _month_season_numbers(seasons)
+    # Get an array of the season number each month is in, using (month
+    # number - 1) as the indices.
+    month_season_numbers = np.array(_month_season_numbers(seasons)[1:],
+                                    dtype=np.int_)
 
     # Define a categorisation function.
-    def _season_number(coord, value):
-        dt = _pt_date(coord, value)
-        return month_season_numbers[dt.month]
+    def _season_number(fields):
+        return month_season_numbers[fields['month'] - 1]
 
     # Apply the categorisation.
-    add_categorised_coord(cube, name, coord, _season_number)
+    _add_date_categorised_coord(cube, name, coord, _season_number)
 
 
 def add_season_year(cube, coord, name='season_year',
@@ -399,18 +543,17 @@ def add_season_year(cube, coord, name='season_year',
     """
     # Check that the seasons are valid.
     _validate_seasons(seasons)
-    # Define the adjustments to be made to the year.
-    month_year_adjusts = _month_year_adjusts(seasons)
+    # Define the adjustments to be made to the year, using (month number - 1)
+    # as the indices.
+    month_year_adjusts = np.array(_month_year_adjusts(seasons)[1:],
+                                  dtype=np.int_)
 
     # Define a categorisation function.
-    def _season_year(coord, value):
-        dt = _pt_date(coord, value)
-        year = dt.year
-        year += month_year_adjusts[dt.month]
-        return year
+    def _season_year(fields):
+        return fields['year'] + month_year_adjusts[fields['month'] - 1]
 
     # Apply the categorisation.
-    add_categorised_coord(cube, name, coord, _season_year)
+    _add_date_categorised_coord(cube, name, coord, _season_year)
 
 
 def add_season_membership(cube, coord, season, name='season_membership'):
@@ -439,10 +582,7 @@ def add_season_membership(cube, coord, season, name='season_membership'):
     """
     months = _months_in_season(season)
 
-    def _season_membership(coord, value):
-        dt = _pt_date(coord, value)
-        if dt.month in months:
-            return True
-        return False
+    def _season_membership(fields):
+        return np.isin(fields['month'], months)
 
-    add_categorised_coord(cube, name, coord, _season_membership)
+    _add_date_categorised_coord(cube, name, coord, _season_membership)
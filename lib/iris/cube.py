@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2010 - 2018, Met Office
+# (C) British Crown Copyright 2010 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -444,12 +444,18 @@ class CubeList(list):
         """
         # Register each of our cubes with its appropriate ProtoCube.
         proto_cubes_by_name = {}
+        # The ProtoCubes that each cube may register with, by the digest of
+        # its signature.
+        proto_cubes_by_digest = {}
+        unhashable_keys = iris._merge._unhashable_attribute_keys(self)
         for cube in self:
             name = cube.standard_name
             proto_cubes = proto_cubes_by_name.setdefault(name, [])
+            digest = iris._merge._signature_digest(cube, unhashable_keys)
+            candidates = proto_cubes_by_digest.setdefault(digest, [])
             proto_cube = None
 
-            for target_proto_cube in proto_cubes:
+            for target_proto_cube in candidates:
                 if target_proto_cube.register(cube):
                     proto_cube = target_proto_cube
                     break
@@ -457,6 +463,7 @@ class CubeList(list):
             if proto_cube is None:
                 proto_cube = iris._merge.ProtoCube(cube)
                 proto_cubes.append(proto_cube)
+                candidates.append(proto_cube)
 
         # Emulate Python 2 behaviour.
         def _none_sort(item):
@@ -3318,7 +3325,8 @@ bound=(1994-12-01 00:00:00, 1998-12-01 00:00:00)
 
         .. note::
 
-            This operation does not yet have support for lazy evaluation.
+            This operation supports lazy evaluation, provided that the
+            aggregator has a lazy implementation.
 
         For example:
 
@@ -3408,34 +3416,13 @@ bound=(1994-12-01 00:00:00, 1998-12-01 00:00:00)
         for coord in groupby_coords + shared_coords:
             aggregateby_cube.remove_coord(coord)
 
-        # Determine the group-by cube data shape.
-        data_shape = list(self.shape + aggregator.aggregate_shape(**kwargs))
-        data_shape[dimension_to_groupby] = len(groupby)
-
         # Aggregate the group-by data.
-        cube_slice = [slice(None, None)] * len(data_shape)
-
-        for i, groupby_slice in enumerate(groupby.group()):
-            # Slice the cube with the group-by slice to create a group-by
-            # sub-cube.
-            cube_slice[dimension_to_groupby] = groupby_slice
-            groupby_sub_cube = self[tuple(cube_slice)]
-            # Perform the aggregation over the group-by sub-cube and
-            # repatriate the aggregated data into the aggregate-by cube data.
-            cube_slice[dimension_to_groupby] = i
-            result = aggregator.aggregate(groupby_sub_cube.data,
-                                          axis=dimension_to_groupby,
-                                          **kwargs)
-
-            # Determine aggregation result data type for the aggregate-by cube
-            # data on first pass.
-            if i == 0:
-                if ma.isMaskedArray(self.data):
-                    aggregateby_data = ma.zeros(data_shape, dtype=result.dtype)
-                else:
-                    aggregateby_data = np.zeros(data_shape, dtype=result.dtype)
-
-            aggregateby_data[tuple(cube_slice)] = result
+        if self.has_lazy_data():
+            data = self.lazy_data()
+        else:
+            data = self.data
+        aggregateby_data = iris.analysis._aggregate_by_groups(
+            aggregator, data, groupby, dimension_to_groupby, **kwargs)
 
         # Add the aggregation meta data to the aggregate-by cube.
         aggregator.update_metadata(aggregateby_cube,
@@ -3488,7 +3475,9 @@ bound=(1994-12-01 00:00:00, 1998-12-01 00:00:00)
 
         .. note::
 
-            This operation does not yet have support for lazy evaluation.
+            This operation supports lazy evaluation, except when the
+            aggregator returns weights or adds dimensions to the result
+            (such as :data:`iris.analysis.PERCENTILE` with several percents).
 
         For example:
 
@@ -3578,13 +3567,6 @@ bound=(1994-12-01 00:00:00, 1998-12-01 00:00:00)
         key[dimension] = slice(None, self.shape[dimension] - window + 1)
         new_cube = self[tuple(key)]
 
-        # take a view of the original data using the rolling_window function
-        # this will add an extra dimension to the data at dimension + 1 which
-        # represents the rolled window (i.e. will have a length of window)
-        rolling_window_data = iris.util.rolling_window(self.data,
-                                                       window=window,
-                                                       axis=dimension)
-
         # now update all of the coordinates to reflect the aggregation
         for coord_ in self.coords(dimensions=dimension):
             if coord_.has_bounds():
@@ -3623,7 +3605,7 @@ bound=(1994-12-01 00:00:00, 1998-12-01 00:00:00)
             new_cube, [coord],
             action='with a rolling window of length %s over' % window,
             **kwargs)
-        # and perform the data transformation, generating weights first if
+        # and perform the data transformation, checking the weights first if
         # needed
         if isinstance(aggregator, iris.analysis.WeightedAggregator) and \
                 aggregator.uses_weighting(**kwargs):
@@ -3633,12 +3615,15 @@ bound=(1994-12-01 00:00:00, 1998-12-01 00:00:00)
                     raise ValueError('Weights for rolling window aggregation '
                                      'must be a 1d array with the same length '
                                      'as the window.')
-                kwargs = dict(kwargs)
-                kwargs['weights'] = iris.util.broadcast_to_shape(
-                    weights, rolling_window_data.shape, (dimension + 1,))
-        data_result = aggregator.aggregate(rolling_window_data,
-                                           axis=dimension + 1,
-                                           **kwargs)
+        if self.has_lazy_data() and not kwargs.get('returned', False) and \
+                not aggregator.aggregate_shape(**kwargs):
+            # Aggregate each chunk of the lazy data independently, so that
+            # the data need never be realised in full.
+            data_result = iris.analysis._lazy_rolling_window_aggregate(
+                self.lazy_data(), aggregator, window, dimension, **kwargs)
+        else:
+            data_result = iris.analysis._rolling_window_aggregate(
+                self.data, aggregator, window, dimension, **kwargs)
         result = aggregator.post_process(new_cube, data_result, [coord],
                                          **kwargs)
         return result
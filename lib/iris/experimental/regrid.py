@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2013 - 2018, Met Office
+# (C) British Crown Copyright 2013 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -22,7 +22,6 @@ from __future__ import (absolute_import, division, print_function)
 from six.moves import (filter, input, map, range, zip)  # noqa
 import six
 
-from collections import namedtuple
 import copy
 import functools
 import warnings
@@ -32,9 +31,11 @@ import cf_units
 import numpy as np
 import numpy.ma as ma
 import scipy.interpolate
-from scipy.sparse import csc_matrix, diags as sparse_diags
+from scipy.sparse import (csc_matrix, csr_matrix, diags as sparse_diags,
+                          kron as sparse_kron)
 import six
 
+from iris._lazy_data import map_complete_blocks
 import iris.analysis.cartography
 from iris.analysis._interpolation import (get_xy_dim_coords, get_xy_coords,
                                           snapshot_grid)
@@ -44,11 +45,6 @@ import iris.cube
 from iris.util import _meshgrid, promote_aux_coord_to_dim_coord
 
 
-_Version = namedtuple('Version', ('major', 'minor', 'micro'))
-_NP_VERSION = _Version(*(int(val) for val in
-                         np.version.version.split('.') if val.isdigit()))
-
-
 def _get_xy_coords(cube):
     """
     Return the x and y coordinates from a cube.
@@ -349,82 +345,64 @@ def _get_bounds_in_units(coord, units, dtype):
     return coord.units.convert(coord.bounds.astype(dtype), units).astype(dtype)
 
 
-def _weighted_mean_with_mdtol(data, weights, axis=None, mdtol=0):
+def _regrid_area_weighted_axis_weights(src_bounds, grid_bounds,
+                                       grid_decreasing, length_func):
     """
-    Return the weighted mean of an array over the specified axis
-    using the provided weights (if any) and a permitted fraction of
-    masked data.
+    Return the weights of the source cells overlapping each target cell
+    along a single axis, as a sparse matrix, with whether the overlapping
+    source cells of each target cell are split into two regions.
 
     Args:
 
-    * data (array-like):
-        Data to be averaged.
-
-    * weights (array-like):
-        An array of the same shape as the data that specifies the contribution
-        of each corresponding data element to the calculated mean.
-
-    Kwargs:
-
-    * axis (int or tuple of ints):
-        Axis along which the mean is computed. The default is to compute
-        the mean of the flattened array.
-
-    * mdtol (float):
-        Tolerance of missing data. The value returned in each element of the
-        returned array will be masked if the fraction of masked data exceeds
-        mdtol. This fraction is weighted by the `weights` array if one is
-        provided. mdtol=0 means no missing data is tolerated
-        while mdtol=1 will mean the resulting element will be masked if and
-        only if all the contributing elements of data are masked.
-        Defaults to 0.
+    * src_bounds:
+        A NumPy array of bounds along the axis defining the source grid.
+    * grid_bounds:
+        A NumPy array of bounds along the axis defining the new grid.
+    * grid_decreasing:
+        Boolean indicating whether the coordinate of the new grid is in
+        descending order.
+    * length_func:
+        A function that returns the (n,) lengths along the axis of an (n, 2)
+        shaped array of bounds.
 
     Returns:
-        Numpy array (possibly masked) or scalar.
+        A tuple of the (n_grid, n_src) sparse weights matrix and a Boolean
+        array of whether the source cells of each target cell are split.
 
     """
-    if ma.is_masked(data):
-        res, unmasked_weights_sum = ma.average(data, weights=weights,
-                                               axis=axis, returned=True)
-        if mdtol < 1:
-            weights_sum = weights.sum(axis=axis)
-            frac_masked = 1 - np.true_divide(unmasked_weights_sum, weights_sum)
-            mask_pt = frac_masked > mdtol
-            if np.any(mask_pt) and not isinstance(res, ma.core.MaskedConstant):
-                if np.isscalar(res):
-                    res = ma.masked
-                elif ma.isMaskedArray(res):
-                    res.mask |= mask_pt
-                else:
-                    res = ma.masked_array(res, mask=mask_pt)
-    else:
-        res = np.average(data, weights=weights, axis=axis)
-    return res
-
-
-def _regrid_area_weighted_array(src_data, x_dim, y_dim,
-                                src_x_bounds, src_y_bounds,
-                                grid_x_bounds, grid_y_bounds,
-                                grid_x_decreasing, grid_y_decreasing,
-                                area_func, circular=False, mdtol=0):
+    n_src = src_bounds.shape[0]
+    split = np.zeros(grid_bounds.shape[0], dtype=bool)
+    weights = [np.zeros(0)]
+    columns = [np.zeros(0, dtype=int)]
+    row_starts = [0]
+    for i, (lower, upper) in enumerate(grid_bounds):
+        # Reverse lower and upper if dest grid is decreasing.
+        if grid_decreasing:
+            lower, upper = upper, lower
+        bounds, indices = _cropped_bounds(src_bounds, lower, upper)
+        if isinstance(indices, tuple):
+            split[i] = True
+            indices = list(indices)
+        weights.append(length_func(bounds))
+        columns.append(np.arange(n_src)[indices])
+        row_starts.append(row_starts[-1] + len(columns[-1]))
+    matrix = csr_matrix((np.concatenate(weights), np.concatenate(columns),
+                         row_starts),
+                        shape=(grid_bounds.shape[0], n_src))
+    return matrix, split
+
+
+def _regrid_area_weighted_weights(src_x_bounds, src_y_bounds,
+                                  grid_x_bounds, grid_y_bounds,
+                                  grid_x_decreasing, grid_y_decreasing,
+                                  area_func, circular=False):
     """
-    Regrid the given data from its source grid to a new grid using
-    an area weighted mean to determine the resulting data values.
-
-    .. note::
-
-        Elements in the returned array that lie either partially
-        or entirely outside of the extent of the source grid will
-        be masked irrespective of the value of mdtol.
+    Calculate the area weights of the source cells overlapping each cell
+    of a new grid, once, for the regridding of any data on the source grid
+    by :func:`_regrid_area_weighted_array`.
 
     Args:
 
-    * src_data:
-        An N-dimensional NumPy array.
-    * x_dim:
-        The X dimension within `src_data`.
-    * y_dim:
-        The Y dimension within `src_data`.
     * src_x_bounds:
         A NumPy array of bounds along the X axis defining the source grid.
     * src_y_bounds:
@@ -449,6 +427,72 @@ def _regrid_area_weighted_array(src_data, x_dim, y_dim,
         A boolean indicating whether the `src_x_bounds` are periodic. Default
         is False.
 
+    Returns:
+        A tuple of the sparse weights matrix, with a row for each cell of
+        the new grid and a column for each source cell, both in (Y, X)
+        order, a Boolean array of whether each cell of the new grid is
+        within the extent of the source grid, and the (Y, X) shape of the
+        new grid.
+
+    """
+    # The area of a cell is the product of a function of its Y bounds and
+    # a function of its X bounds, so the weights are the Kronecker product
+    # of the weights along each axis.  Their scale is arbitrary, as it
+    # cancels in the weighted mean.
+    unit_bounds = np.array([[0, 1]], dtype=src_x_bounds.dtype)
+    y_weights, y_split = _regrid_area_weighted_axis_weights(
+        src_y_bounds, grid_y_bounds, grid_y_decreasing,
+        lambda bounds: area_func(bounds, unit_bounds)[:, 0])
+    x_weights, x_split = _regrid_area_weighted_axis_weights(
+        src_x_bounds, grid_x_bounds, grid_x_decreasing,
+        lambda bounds: area_func(unit_bounds, bounds)[0])
+
+    # Determine which grid bounds are within src extent.
+    y_within = _within_bounds(src_y_bounds, grid_y_bounds, grid_y_decreasing)
+    x_within = _within_bounds(src_x_bounds, grid_x_bounds, grid_x_decreasing)
+    if not circular:
+        # A new cell with x_0 > x_1 is [0]->x_1 and x_0->[0] + mod, in the
+        # case of wrapped longitudes. However if the src grid is not global
+        # (i.e. circular) this new cell would include a region outside of
+        # the extent of the src grid and should therefore be masked.
+        x_0, x_1 = grid_x_bounds.T
+        if grid_x_decreasing:
+            x_0, x_1 = x_1, x_0
+        x_within = x_within & ~(x_0 > x_1)
+    if np.any(y_split & y_within) and np.any(x_split & x_within):
+        raise RuntimeError('Cannot handle split bounds in both x and y.')
+    weights = sparse_kron(y_weights, x_weights, format='csr')
+    within = np.outer(y_within, x_within).ravel()
+    grid_shape = (grid_y_bounds.shape[0], grid_x_bounds.shape[0])
+    return weights, within, grid_shape
+
+
+def _regrid_area_weighted_array(src_data, x_dim, y_dim, weights_info,
+                                mdtol=0):
+    """
+    Regrid the given data from its source grid to a new grid using
+    an area weighted mean to determine the resulting data values.
+
+    .. note::
+
+        Elements in the returned array that lie either partially
+        or entirely outside of the extent of the source grid will
+        be masked irrespective of the value of mdtol.
+
+    Args:
+
+    * src_data:
+        An N-dimensional NumPy array.
+    * x_dim:
+        The X dimension within `src_data`.
+    * y_dim:
+        The Y dimension within `src_data`.
+    * weights_info:
+        The area weights of the source cells overlapping each cell of the
+        new grid, from :func:`_regrid_area_weighted_weights`.
+
+    Kwargs:
+
     * mdtol:
         Tolerance of missing data. The value returned in each element of the
         returned array will be masked if the fraction of missing data exceeds
@@ -464,159 +508,62 @@ def _regrid_area_weighted_array(src_data, x_dim, y_dim,
         grid.
 
     """
-    # Create empty data array to match the new grid.
-    # Note that dtype is not preserved and that the array is
-    # masked to allow for regions that do not overlap.
-    new_shape = list(src_data.shape)
-    if x_dim is not None:
-        new_shape[x_dim] = grid_x_bounds.shape[0]
-    if y_dim is not None:
-        new_shape[y_dim] = grid_y_bounds.shape[0]
+    weights, within, grid_shape = weights_info
 
     # Use input cube dtype or convert values to the smallest possible float
     # dtype when necessary.
     dtype = np.promote_types(src_data.dtype, np.float16)
-
-    # Flag to indicate whether the original data was a masked array.
     src_masked = ma.isMaskedArray(src_data)
-    if src_masked:
-        new_data = ma.zeros(new_shape, fill_value=src_data.fill_value,
-                            dtype=dtype)
-    else:
-        new_data = ma.zeros(new_shape, dtype=dtype)
-    # Assign to mask to explode it, allowing indexed assignment.
-    new_data.mask = False
-
-    indices = [slice(None)] * new_data.ndim
 
-    # Determine which grid bounds are within src extent.
-    y_within_bounds = _within_bounds(src_y_bounds, grid_y_bounds,
-                                     grid_y_decreasing)
-    x_within_bounds = _within_bounds(src_x_bounds, grid_x_bounds,
-                                     grid_x_decreasing)
-
-    # Cache which src_bounds are within grid bounds
-    cached_x_bounds = []
-    cached_x_indices = []
-    for (x_0, x_1) in grid_x_bounds:
-        if grid_x_decreasing:
-            x_0, x_1 = x_1, x_0
-        x_bounds, x_indices = _cropped_bounds(src_x_bounds, x_0, x_1)
-        cached_x_bounds.append(x_bounds)
-        cached_x_indices.append(x_indices)
+    # Give the data a length one dimension in place of a scalar coordinate.
+    data = src_data
+    y_added = y_dim is None
+    if y_added:
+        y_dim = data.ndim
+        data = data[..., np.newaxis]
+    x_added = x_dim is None
+    if x_added:
+        x_dim = data.ndim
+        data = data[..., np.newaxis]
+
+    # Flatten the data into a column for each point of the other dimensions,
+    # so that all of it is regridded by a single sparse matrix product.
+    order = [dim for dim in range(data.ndim) if dim not in (y_dim, x_dim)]
+    order += [y_dim, x_dim]
+    data = data.transpose(order)
+    other_shape = data.shape[:-2]
+    data = data.reshape(-1, data.shape[-2] * data.shape[-1]).T
+
+    sum_weights = weights * np.ones(weights.shape[1])
+    if ma.is_masked(data):
+        mask = ma.getmaskarray(data)
+        numerator = weights * ma.filled(data, 0)
+        valid_weights = weights * (~mask).astype(np.float64)
+        masked_weights = weights * mask.astype(np.float64)
+        new_mask = valid_weights == 0
+        if mdtol < 1:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                frac_masked = masked_weights / sum_weights[:, np.newaxis]
+            new_mask |= frac_masked > mdtol
+    else:
+        numerator = weights * np.asarray(data)
+        valid_weights = sum_weights[:, np.newaxis]
+        new_mask = np.broadcast_to(valid_weights == 0, numerator.shape)
+    new_mask = new_mask | ~within[:, np.newaxis]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        new_data = numerator / valid_weights
+    new_data[new_mask] = 0
+    new_data = ma.masked_array(new_data.astype(dtype), mask=new_mask)
+    if src_masked:
+        new_data.fill_value = src_data.fill_value
 
-    # Simple for loop approach.
-    for j, (y_0, y_1) in enumerate(grid_y_bounds):
-        # Reverse lower and upper if dest grid is decreasing.
-        if grid_y_decreasing:
-            y_0, y_1 = y_1, y_0
-        y_bounds, y_indices = _cropped_bounds(src_y_bounds, y_0, y_1)
-        for i, (x_0, x_1) in enumerate(grid_x_bounds):
-            # Reverse lower and upper if dest grid is decreasing.
-            if grid_x_decreasing:
-                x_0, x_1 = x_1, x_0
-            x_bounds = cached_x_bounds[i]
-            x_indices = cached_x_indices[i]
-
-            # Determine whether to mask element i, j based on overlap with
-            # src.
-            # If x_0 > x_1 then we want [0]->x_1 and x_0->[0] + mod in the case
-            # of wrapped longitudes. However if the src grid is not global
-            # (i.e. circular) this new cell would include a region outside of
-            # the extent of the src grid and should therefore be masked.
-            outside_extent = x_0 > x_1 and not circular
-            if (outside_extent or not y_within_bounds[j] or not
-                    x_within_bounds[i]):
-                # Mask out element(s) in new_data
-                if x_dim is not None:
-                    indices[x_dim] = i
-                if y_dim is not None:
-                    indices[y_dim] = j
-                new_data[tuple(indices)] = ma.masked
-            else:
-                # Calculate weighted mean of data points.
-                # Slice out relevant data (this may or may not be a view()
-                # depending on x_indices being a slice or not).
-                if x_dim is not None:
-                    indices[x_dim] = x_indices
-                if y_dim is not None:
-                    indices[y_dim] = y_indices
-                if isinstance(x_indices, tuple) and \
-                        isinstance(y_indices, tuple):
-                    raise RuntimeError('Cannot handle split bounds '
-                                       'in both x and y.')
-                data = src_data[tuple(indices)]
-
-                # Calculate weights based on areas of cropped bounds.
-                weights = area_func(y_bounds, x_bounds)
-
-                # Numpy 1.7 allows the axis keyword arg to be a tuple.
-                # If the version of NumPy is less than 1.7 manipulate the axes
-                # of the data so the x and y dimensions can be flattened.
-                if _NP_VERSION.minor < 7:
-                    if y_dim is not None and x_dim is not None:
-                        flattened_shape = list(data.shape)
-                        if y_dim > x_dim:
-                            data = np.rollaxis(data, y_dim, data.ndim)
-                            data = np.rollaxis(data, x_dim, data.ndim)
-                            del flattened_shape[y_dim]
-                            del flattened_shape[x_dim]
-                        else:
-                            data = np.rollaxis(data, x_dim, data.ndim)
-                            data = np.rollaxis(data, y_dim, data.ndim)
-                            del flattened_shape[x_dim]
-                            del flattened_shape[y_dim]
-                            weights = weights.T
-                        flattened_shape.append(-1)
-                        data = data.reshape(*flattened_shape)
-                    elif y_dim is not None:
-                        flattened_shape = list(data.shape)
-                        del flattened_shape[y_dim]
-                        flattened_shape.append(-1)
-                        data = data.swapaxes(y_dim, -1).reshape(
-                            *flattened_shape)
-                    elif x_dim is not None:
-                        flattened_shape = list(data.shape)
-                        del flattened_shape[x_dim]
-                        flattened_shape.append(-1)
-                        data = data.swapaxes(x_dim, -1).reshape(
-                            *flattened_shape)
-                    weights = weights.ravel()
-                    axis = -1
-                else:
-                    # Transpose weights to match dim ordering in data.
-                    weights_shape_y = weights.shape[0]
-                    weights_shape_x = weights.shape[1]
-                    if x_dim is not None and y_dim is not None and \
-                            x_dim < y_dim:
-                        weights = weights.T
-                    # Broadcast the weights array to allow numpy's ma.average
-                    # to be called.
-                    weights_padded_shape = [1] * data.ndim
-                    axes = []
-                    if y_dim is not None:
-                        weights_padded_shape[y_dim] = weights_shape_y
-                        axes.append(y_dim)
-                    if x_dim is not None:
-                        weights_padded_shape[x_dim] = weights_shape_x
-                        axes.append(x_dim)
-                    # Assign new shape to raise error on copy.
-                    weights.shape = weights_padded_shape
-                    # Broadcast weights to match shape of data.
-                    _, weights = np.broadcast_arrays(data, weights)
-                    # Axes of data over which the weighted mean is calculated.
-                    axis = tuple(axes)
-
-                # Calculate weighted mean taking into account missing data.
-                new_data_pt = _weighted_mean_with_mdtol(
-                    data, weights=weights, axis=axis, mdtol=mdtol)
-
-                # Insert data (and mask) values into new array.
-                if x_dim is not None:
-                    indices[x_dim] = i
-                if y_dim is not None:
-                    indices[y_dim] = j
-                new_data[tuple(indices)] = new_data_pt
+    # Restore the shape and dimension order of the source data.
+    new_data = new_data.T.reshape(other_shape + grid_shape)
+    new_data = new_data.transpose(np.argsort(order))
+    if x_added:
+        new_data = new_data[..., 0]
+    if y_added:
+        new_data = new_data[..., 0]
 
     # Remove new mask if original data was not masked
     # and no values in the new array are masked.
@@ -626,51 +573,17 @@ def _regrid_area_weighted_array(src_data, x_dim, y_dim,
     return new_data
 
 
-def regrid_area_weighted_rectilinear_src_and_grid(src_cube, grid_cube,
-                                                  mdtol=0):
+def _regrid_area_weighted_rectilinear_src_and_grid__prepare(src_grid_cube,
+                                                            grid_cube):
     """
-    Return a new cube with data values calculated using the area weighted
-    mean of data values from src_grid regridded onto the horizontal grid of
-    grid_cube.
+    First (setup) part of 'regrid_area_weighted_rectilinear_src_and_grid'.
 
-    This function requires that the horizontal grids of both cubes are
-    rectilinear (i.e. expressed in terms of two orthogonal 1D coordinates)
-    and that these grids are in the same coordinate system. This function
-    also requires that the coordinates describing the horizontal grids
-    all have bounds.
-
-    .. note::
-
-        Elements in data array of the returned cube that lie either partially
-        or entirely outside of the horizontal extent of the src_cube will
-        be masked irrespective of the value of mdtol.
-
-    Args:
-
-    * src_cube:
-        An instance of :class:`iris.cube.Cube` that supplies the data,
-        metadata and coordinates.
-    * grid_cube:
-        An instance of :class:`iris.cube.Cube` that supplies the desired
-        horizontal grid definition.
-
-    Kwargs:
-
-    * mdtol:
-        Tolerance of missing data. The value returned in each element of the
-        returned cube's data array will be masked if the fraction of masked
-        data in the overlapping cells of the source cube exceeds mdtol. This
-        fraction is calculated based on the area of masked cells within each
-        target cell. mdtol=0 means no missing data is tolerated while mdtol=1
-        will mean the resulting element will be masked if and only if all the
-        overlapping cells of the source cube are masked. Defaults to 0.
-
-    Returns:
-        A new :class:`iris.cube.Cube` instance.
+    Check the horizontal grids and calculate the area weights, which can
+    then be re-used for any cube on the source grid.
 
     """
     # Get the 1d monotonic (or scalar) src and grid coordinates.
-    src_x, src_y = _get_xy_coords(src_cube)
+    src_x, src_y = _get_xy_coords(src_grid_cube)
     grid_x, grid_y = _get_xy_coords(grid_cube)
 
     # Condition 1: All x and y coordinates must have contiguous bounds to
@@ -688,22 +601,6 @@ def regrid_area_weighted_rectilinear_src_and_grid(src_cube, grid_cube,
                          "and grid cubes must have the same coordinate "
                          "system.")
 
-    # Condition 3: cannot create vector coords from scalars.
-    src_x_dims = src_cube.coord_dims(src_x)
-    src_x_dim = None
-    if src_x_dims:
-        src_x_dim = src_x_dims[0]
-    src_y_dims = src_cube.coord_dims(src_y)
-    src_y_dim = None
-    if src_y_dims:
-        src_y_dim = src_y_dims[0]
-    if src_x_dim is None and grid_x.shape[0] != 1 or \
-            src_y_dim is None and grid_y.shape[0] != 1:
-        raise ValueError('The horizontal grid coordinates of source cube '
-                         'includes scalar coordinates, but the new grid does '
-                         'not. The new grid must not require additional data '
-                         'dimensions to be created.')
-
     # Determine whether to calculate flat or spherical areas.
     # Don't only rely on coord system as it may be None.
     spherical = (isinstance(src_cs, (iris.coord_systems.GeogCS,
@@ -750,17 +647,63 @@ def regrid_area_weighted_rectilinear_src_and_grid(src_cube, grid_cube,
     else:
         area_func = _cartesian_area
 
-    # Calculate new data array for regridded cube.
-    new_data = _regrid_area_weighted_array(src_cube.data, src_x_dim, src_y_dim,
-                                           src_x_bounds, src_y_bounds,
-                                           grid_x_bounds, grid_y_bounds,
-                                           grid_x_decreasing,
-                                           grid_y_decreasing,
-                                           area_func, circular, mdtol)
+    # Calculate the weights of the source cells in each new cell.
+    weights_info = _regrid_area_weighted_weights(src_x_bounds, src_y_bounds,
+                                                 grid_x_bounds, grid_y_bounds,
+                                                 grid_x_decreasing,
+                                                 grid_y_decreasing,
+                                                 area_func, circular)
 
-    # Wrap up the data as a Cube.
     # Create 2d meshgrids as required by _create_cube func.
     meshgrid_x, meshgrid_y = _meshgrid(grid_x.points, grid_y.points)
+
+    regrid_info = (grid_x, grid_y, meshgrid_x, meshgrid_y, weights_info)
+    return regrid_info
+
+
+def _regrid_area_weighted_rectilinear_src_and_grid__perform(src_cube,
+                                                            regrid_info,
+                                                            mdtol):
+    """
+    Second (regrid) part of 'regrid_area_weighted_rectilinear_src_and_grid'.
+
+    Perform the prepared regrid calculation on a single cube.
+
+    """
+    grid_x, grid_y, meshgrid_x, meshgrid_y, weights_info = regrid_info
+    src_x, src_y = _get_xy_coords(src_cube)
+
+    # Condition 3: cannot create vector coords from scalars.
+    src_x_dims = src_cube.coord_dims(src_x)
+    src_x_dim = None
+    if src_x_dims:
+        src_x_dim = src_x_dims[0]
+    src_y_dims = src_cube.coord_dims(src_y)
+    src_y_dim = None
+    if src_y_dims:
+        src_y_dim = src_y_dims[0]
+    if src_x_dim is None and grid_x.shape[0] != 1 or \
+            src_y_dim is None and grid_y.shape[0] != 1:
+        raise ValueError('The horizontal grid coordinates of source cube '
+                         'includes scalar coordinates, but the new grid does '
+                         'not. The new grid must not require additional data '
+                         'dimensions to be created.')
+
+    # Calculate new data array for regridded cube, lazily if the source data
+    # is lazy, regridding the chunks of its other dimensions separately.
+    regrid = functools.partial(_regrid_area_weighted_array, x_dim=src_x_dim,
+                               y_dim=src_y_dim, weights_info=weights_info,
+                               mdtol=mdtol)
+    dims, out_sizes = [], []
+    for dim, coord in ((src_y_dim, grid_y), (src_x_dim, grid_x)):
+        if dim is not None:
+            dims.append(dim)
+            out_sizes.append(coord.shape[0])
+    new_data = map_complete_blocks(
+        src_cube, regrid, dims, out_sizes,
+        dtype=np.promote_types(src_cube.dtype, np.float16))
+
+    # Wrap up the data as a Cube.
     regrid_callback = RectilinearRegridder._regrid
     new_cube = RectilinearRegridder._create_cube(new_data, src_cube,
                                                  src_x_dim, src_y_dim,
@@ -780,6 +723,55 @@ def regrid_area_weighted_rectilinear_src_and_grid(src_cube, grid_cube,
     return new_cube
 
 
+def regrid_area_weighted_rectilinear_src_and_grid(src_cube, grid_cube,
+                                                  mdtol=0):
+    """
+    Return a new cube with data values calculated using the area weighted
+    mean of data values from src_grid regridded onto the horizontal grid of
+    grid_cube.
+
+    This function requires that the horizontal grids of both cubes are
+    rectilinear (i.e. expressed in terms of two orthogonal 1D coordinates)
+    and that these grids are in the same coordinate system. This function
+    also requires that the coordinates describing the horizontal grids
+    all have bounds.
+
+    .. note::
+
+        Elements in data array of the returned cube that lie either partially
+        or entirely outside of the horizontal extent of the src_cube will
+        be masked irrespective of the value of mdtol.
+
+    Args:
+
+    * src_cube:
+        An instance of :class:`iris.cube.Cube` that supplies the data,
+        metadata and coordinates.
+    * grid_cube:
+        An instance of :class:`iris.cube.Cube` that supplies the desired
+        horizontal grid definition.
+
+    Kwargs:
+
+    * mdtol:
+        Tolerance of missing data. The value returned in each element of the
+        returned cube's data array will be masked if the fraction of masked
+        data in the overlapping cells of the source cube exceeds mdtol. This
+        fraction is calculated based on the area of masked cells within each
+        target cell. mdtol=0 means no missing data is tolerated while mdtol=1
+        will mean the resulting element will be masked if and only if all the
+        overlapping cells of the source cube are masked. Defaults to 0.
+
+    Returns:
+        A new :class:`iris.cube.Cube` instance.
+
+    """
+    regrid_info = _regrid_area_weighted_rectilinear_src_and_grid__prepare(
+        src_cube, grid_cube)
+    return _regrid_area_weighted_rectilinear_src_and_grid__perform(
+        src_cube, regrid_info, mdtol)
+
+
 def _transform_xy_arrays(crs_from, x, y, crs_to):
     """
     Transform 2d points between cartopy coordinate reference systems.
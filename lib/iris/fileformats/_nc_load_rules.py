@@ -0,0 +1,319 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Plain Python translation of CF-netCDF data variables into cubes.
+
+The :class:`Translator` applies the rules of the pyke rule base
+``fc_rules_cf.krb``, in the same order and with the same helper functions,
+but from fixed tables rather than by inference.  It is a drop-in replacement
+for the pyke knowledge engine used by :mod:`iris.fileformats.netcdf`.
+
+"""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+import collections
+
+import iris.fileformats.pp as pp
+
+
+# The fc_rules_cf.krb helper functions, from the compiled rule base.
+_HELPERS = None
+
+
+def _helpers():
+    global _HELPERS
+    if _HELPERS is None:
+        try:
+            from iris.fileformats._pyke_rules.compiled_krb import \
+                fc_rules_cf_fc
+        except ImportError:
+            # Compile the rule base, as a pyke engine would on first use.
+            from iris.fileformats.netcdf import _pyke_kb_engine
+            _pyke_kb_engine()
+            from iris.fileformats._pyke_rules.compiled_krb import \
+                fc_rules_cf_fc
+        _HELPERS = fc_rules_cf_fc
+    return _HELPERS
+
+
+def _build_coordinate_system(engine, cf_grid_var):
+    return _helpers().build_coordinate_system(cf_grid_var)
+
+
+# The grid mapping rules, as:
+#   (rule name, grid_mapping_name, provided coordinate system,
+#    name of the builder helper, name of the supported parameters helper).
+_GRID_MAPPING_RULES = [
+    ('fc_provides_grid_mapping_rotated_latitude_longitude',
+     'rotated_latitude_longitude', 'rotated_latitude_longitude',
+     'build_rotated_coordinate_system', None),
+    ('fc_provides_grid_mapping_latitude_longitude',
+     'latitude_longitude', 'latitude_longitude',
+     _build_coordinate_system, None),
+    ('fc_provides_grid_mapping_transverse_mercator',
+     'transverse_mercator', 'transverse_mercator',
+     'build_transverse_mercator_coordinate_system', None),
+    ('fc_provides_grid_mapping_mercator',
+     'mercator', 'mercator',
+     'build_mercator_coordinate_system',
+     'has_supported_mercator_parameters'),
+    ('fc_provides_grid_mapping_stereographic',
+     'stereographic', 'stereographic',
+     'build_stereographic_coordinate_system',
+     'has_supported_stereographic_parameters'),
+    ('fc_provides_grid_mapping_lambert_conformal',
+     'lambert_conformal_conic', 'lambert_conformal',
+     'build_lambert_conformal_coordinate_system', None),
+    ('fc_provides_grid_mapping_lambert_azimuthal_equal_area',
+     'lambert_azimuthal_equal_area', 'lambert_azimuthal_equal_area',
+     'build_lambert_azimuthal_equal_area_coordinate_system', None),
+    ('fc_provides_grid_mapping_albers_equal_area',
+     'albers_conical_equal_area', 'albers_equal_area',
+     'build_albers_equal_area_coordinate_system', None),
+]
+
+# The coordinate classification rules, as:
+#   (rule name, provided coordinate type, name of the test helper).
+_COORDINATE_RULES = [
+    ('fc_provides_coordinate_latitude', 'latitude', 'is_latitude'),
+    ('fc_provides_coordinate_longitude', 'longitude', 'is_longitude'),
+    ('fc_provides_projection_x_coordinate', 'projection_x_coordinate',
+     'is_projection_x_coordinate'),
+    ('fc_provides_projection_y_coordinate', 'projection_y_coordinate',
+     'is_projection_y_coordinate'),
+    ('fc_provides_coordinate_time', 'time', 'is_time'),
+    ('fc_provides_coordinate_time_period', 'time_period', 'is_time_period'),
+]
+
+# The auxiliary coordinate rules, as:
+#   (rule name, names of the helpers which must pass,
+#    names of the helpers which must fail, coordinate name).
+_AUXILIARY_COORDINATE_RULES = [
+    ('fc_build_auxiliary_coordinate_time',
+     ('is_time',), (), None),
+    ('fc_build_auxiliary_coordinate_time_period',
+     ('is_time_period',), (), None),
+    ('fc_build_auxiliary_coordinate_latitude',
+     ('is_latitude',), ('is_rotated_latitude',), 'latitude'),
+    ('fc_build_auxiliary_coordinate_latitude_rotated',
+     ('is_latitude', 'is_rotated_latitude'), (), 'grid_latitude'),
+    ('fc_build_auxiliary_coordinate_longitude',
+     ('is_longitude',), ('is_rotated_longitude',), 'longitude'),
+    ('fc_build_auxiliary_coordinate_longitude_rotated',
+     ('is_longitude', 'is_rotated_longitude'), (), 'grid_longitude'),
+    ('fc_build_auxiliary_coordinate',
+     (), ('is_time', 'is_time_period', 'is_latitude', 'is_longitude'), None),
+]
+
+# Requires that neither a lat-lon nor a rotated lat-lon coordinate system is
+# provided.
+_NO_LAT_LON = 'no_lat_lon'
+
+# The dimension coordinate rules, as:
+#   (rule name, coordinate type, required coordinate system,
+#    names of the helpers which must pass,
+#    names of the helpers which must fail, coordinate name).
+_DIMENSION_COORDINATE_RULES = [
+    ('fc_build_coordinate_latitude', 'latitude', 'latitude_longitude',
+     (), ('is_rotated_latitude',), 'latitude'),
+    ('fc_build_coordinate_latitude_rotated', 'latitude',
+     'rotated_latitude_longitude',
+     ('is_rotated_latitude',), (), 'grid_latitude'),
+    ('fc_build_coordinate_longitude', 'longitude', 'latitude_longitude',
+     (), ('is_rotated_longitude',), 'longitude'),
+    ('fc_build_coordinate_longitude_rotated', 'longitude',
+     'rotated_latitude_longitude',
+     ('is_rotated_longitude',), (), 'grid_longitude'),
+    ('fc_build_coordinate_latitude_nocs', 'latitude', _NO_LAT_LON,
+     (), (), 'latitude'),
+    ('fc_build_coordinate_longitude_nocs', 'longitude', _NO_LAT_LON,
+     (), (), 'longitude'),
+]
+for _coord_system in ['transverse_mercator', 'lambert_conformal', 'mercator',
+                      'stereographic', 'lambert_azimuthal_equal_area',
+                      'albers_equal_area']:
+    for _axis in 'xy':
+        _DIMENSION_COORDINATE_RULES.append(
+            ('fc_build_coordinate_projection_{}_{}'.format(_axis,
+                                                           _coord_system),
+             'projection_{}_coordinate'.format(_axis), _coord_system,
+             (), (), 'projection_{}_coordinate'.format(_axis)))
+_DIMENSION_COORDINATE_RULES.extend([
+    ('fc_build_coordinate_time', 'time', None, (), (), None),
+    ('fc_build_coordinate_time_period', 'time_period', None, (), (), None),
+])
+
+# The dimensionless vertical coordinates with supported formulae.
+_FORMULA_TYPES = ['atmosphere_hybrid_height_coordinate',
+                  'atmosphere_hybrid_sigma_pressure_coordinate',
+                  'ocean_sigma_z_coordinate',
+                  'ocean_sigma_coordinate',
+                  'ocean_s_coordinate',
+                  'ocean_s_coordinate_g1',
+                  'ocean_s_coordinate_g2']
+
+
+class Translator(object):
+    """
+    Translate a CF-netCDF data variable, and its case specific facts, into
+    a cube.
+
+    This has the interface of the pyke knowledge engine used by
+    :func:`iris.fileformats.netcdf._load_cube`, and holds the same rule
+    processing hooks: `cf_var`, `cube`, `provides`, `requires`,
+    `rule_triggered` and `filename`.
+
+    """
+    def __init__(self):
+        self.facts = collections.defaultdict(list)
+        self.cf_var = None
+        self.cube = None
+        self.provides = {}
+        self.requires = {}
+        self.rule_triggered = set()
+        self.filename = None
+
+    def reset(self):
+        """Remove all the case specific facts."""
+        self.facts.clear()
+
+    def add_case_specific_fact(self, kb_name, fact_name, args):
+        """Add a case specific fact, such as ``coordinate('lat',)``."""
+        self.facts[fact_name].append(tuple(args))
+
+    def print_stats(self):
+        print('{} rules triggered'.format(len(self.rule_triggered)))
+
+    def _test(self, cf_name, passes, fails):
+        helpers = _helpers()
+        return (all(getattr(helpers, name)(self, cf_name)
+                    for name in passes) and
+                not any(getattr(helpers, name)(self, cf_name)
+                        for name in fails))
+
+    def activate(self, rule_base_name):
+        """Translate the CF-netCDF data variable into the cube."""
+        helpers = _helpers()
+        cf_group = self.cf_var.cf_group
+        facts = self.facts
+        triggered = self.rule_triggered.add
+
+        helpers.build_cube_metadata(self)
+        triggered('fc_default')
+
+        # Build the coordinate system.
+        coord_systems = set()
+        for rule, mapping_name, coord_system, build, check in \
+                _GRID_MAPPING_RULES:
+            if not callable(build):
+                build = getattr(helpers, build)
+            for cf_name, in facts['grid_mapping']:
+                if (helpers.is_grid_mapping(self, cf_name, mapping_name) and
+                        (check is None or
+                         getattr(helpers, check)(self, cf_name))):
+                    cf_grid_var = cf_group.grid_mappings[cf_name]
+                    self.provides['coordinate_system'] = build(self,
+                                                               cf_grid_var)
+                    coord_systems.add(coord_system)
+                    triggered(rule)
+
+        # Classify the dimension coordinates.
+        coord_types = collections.OrderedDict()
+        for rule, coord_type, test in _COORDINATE_RULES:
+            for cf_name, in facts['coordinate']:
+                if getattr(helpers, test)(self, cf_name):
+                    coord_types.setdefault(coord_type, []).append(cf_name)
+                    triggered(rule)
+        classified = set(cf_name for cf_names in coord_types.values()
+                         for cf_name in cf_names)
+
+        for cf_name, in facts['label']:
+            helpers.build_auxiliary_coordinate(self, cf_group.labels[cf_name])
+            triggered('fc_build_label_coordinate')
+
+        for rule, passes, fails, coord_name in _AUXILIARY_COORDINATE_RULES:
+            for cf_name, in facts['auxiliary_coordinate']:
+                if self._test(cf_name, passes, fails):
+                    cf_coord_var = cf_group.auxiliary_coordinates[cf_name]
+                    helpers.build_auxiliary_coordinate(self, cf_coord_var,
+                                                       coord_name=coord_name)
+                    triggered(rule)
+
+        for cf_name, in facts['cell_measure']:
+            helpers.build_cell_measures(self, cf_group.cell_measures[cf_name])
+            triggered('fc_build_cell_measure')
+
+        # Build the classified dimension coordinates.
+        lat_lon = {'latitude_longitude', 'rotated_latitude_longitude'}
+        for rule, coord_type, coord_system, passes, fails, coord_name in \
+                _DIMENSION_COORDINATE_RULES:
+            if coord_system is None:
+                cs = None
+            elif coord_system == _NO_LAT_LON:
+                if coord_systems & lat_lon:
+                    continue
+                cs = None
+            elif coord_system in coord_systems:
+                cs = self.provides['coordinate_system']
+            else:
+                continue
+            for cf_name in coord_types.get(coord_type, []):
+                if self._test(cf_name, passes, fails):
+                    cf_coord_var = cf_group.coordinates[cf_name]
+                    helpers.build_dimension_coordinate(self, cf_coord_var,
+                                                       coord_name=coord_name,
+                                                       coord_system=cs)
+                    triggered(rule)
+
+        for cf_name, in facts['coordinate']:
+            if cf_name not in classified:
+                helpers.build_dimension_coordinate(
+                    self, cf_group.coordinates[cf_name])
+                triggered('fc_default_coordinate')
+
+        # Translate the UM specific attributes.
+        cf_var = self.cf_var
+        if (hasattr(cf_var, 'ukmo__um_stash_source') or
+                hasattr(cf_var, 'um_stash_source')):
+            attr_value = (getattr(cf_var, 'um_stash_source', None) or
+                          getattr(cf_var, 'ukmo__um_stash_source'))
+            self.cube.attributes['STASH'] = pp.STASH.from_msi(attr_value)
+            triggered('fc_attribute_ukmo__um_stash_source')
+        if hasattr(cf_var, 'ukmo__process_flags'):
+            attr_value = cf_var.ukmo__process_flags
+            self.cube.attributes['ukmo__process_flags'] = tuple(
+                [x.replace('_', ' ') for x in attr_value.split(' ')])
+            triggered('fc_attribute_ukmo__process_flags')
+
+        # Identify any dimensionless vertical coordinate formula.
+        roots = [cf_root for cf_root, in facts['formula_root']]
+        for formula_type in _FORMULA_TYPES:
+            for cf_root in roots:
+                standard_name = getattr(cf_group[cf_root], 'standard_name',
+                                        None)
+                if standard_name == formula_type:
+                    self.requires['formula_type'] = formula_type
+                    triggered('fc_formula_type_{}'.format(formula_type))
+        for cf_root in roots:
+            for cf_name, term_root, term in facts['formula_term']:
+                if term_root == cf_root:
+                    formula_terms = self.requires.setdefault('formula_terms',
+                                                             {})
+                    formula_terms[term] = cf_name
+                    triggered('fc_formula_terms')
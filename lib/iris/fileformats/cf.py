@@ -922,9 +922,15 @@ class CFReader(object):
     This class allows the contents of a netCDF file to be interpreted according
     to the 'NetCDF Climate and Forecast (CF) Metadata Conventions'.
 
+    If `names` is given, only the CF-netCDF data variables with one of those
+    names, as their variable name, standard name or long name, and the
+    variables they reference, have their :class:`CFGroup` built.  The
+    `cf_group` of any other data variable is None.
+
     """
-    def __init__(self, filename, warn=False, monotonic=False):
+    def __init__(self, filename, warn=False, monotonic=False, names=None):
         self._filename = os.path.expanduser(filename)
+        self._names = None if names is None else set(names)
         # All CF variable types EXCEPT for the "special cases" of
         # CFDataVariable, CFCoordinateVariable and _CFFormulaTermsVariable.
         self._variable_types = (CFAncillaryDataVariable, CFAuxiliaryCoordinateVariable,
@@ -997,11 +1003,22 @@ class CFReader(object):
         for name in data_variable_names:
             self.cf_group[name] = CFDataVariable(name, self._dataset.variables[name])
 
+    def _matches_names(self, cf_variable):
+        # Whether the variable could make a cube with one of the given names.
+        names = [cf_variable.cf_name,
+                 getattr(cf_variable, 'standard_name', None),
+                 getattr(cf_variable, 'long_name', None)]
+        return any(isinstance(name, six.string_types) and name in self._names
+                   for name in names)
+
     def _build_cf_groups(self):
         """Build the first order relationships between CF-netCDF variables."""
 
+        # These are fixed while the groups are built.
+        coordinate_names = set(self.cf_group.coordinates.keys())
+        formula_terms = self.cf_group.formula_terms
+
         def _build(cf_variable):
-            coordinate_names = list(self.cf_group.coordinates.keys())
             cf_group = CFGroup()
 
             # Build CF variable relationships.
@@ -1047,7 +1064,7 @@ class CFReader(object):
                                     in coordinates_attr.split() if cf_name in
                                     self.cf_group.coordinates})
                 # Add appropriate formula terms.
-                for cf_var in six.itervalues(self.cf_group.formula_terms):
+                for cf_var in six.itervalues(formula_terms):
                     for cf_root in cf_var.cf_terms_by_root:
                         if (cf_root in cf_group and
                                 cf_var.cf_name not in cf_group):
@@ -1076,13 +1093,32 @@ class CFReader(object):
         # a subset of the dimensionality of the data variable.
         ignored = set()
 
+        if self._names is not None:
+            matches = [cf_variable
+                       for cf_variable in six.itervalues(self.cf_group)
+                       if self._matches_names(cf_variable)]
+            if all(isinstance(cf_variable, CFDataVariable)
+                   for cf_variable in matches):
+                # Only the requested data variables, and the variables they
+                # reference, need their groups. Any promoted variable would
+                # be named for a variable which is not a data variable, so
+                # none is requested.
+                built = set()
+                while matches:
+                    cf_variable = matches.pop()
+                    if cf_variable.cf_name not in built:
+                        built.add(cf_variable.cf_name)
+                        _build(cf_variable)
+                        matches.extend(cf_variable.cf_group.values())
+                return
+
         for cf_variable in six.itervalues(self.cf_group):
             _build(cf_variable)
 
         # Determine whether there are any formula terms that
         # may be promoted to a CFDataVariable and restrict promotion to only
         # those formula terms that are reference surface/phenomenon.
-        for cf_var in six.itervalues(self.cf_group.formula_terms):
+        for cf_var in six.itervalues(formula_terms):
             for cf_root, cf_term in six.iteritems(cf_var.cf_terms_by_root):
                 cf_root_var = self.cf_group[cf_root]
                 name = cf_root_var.standard_name or cf_root_var.long_name
@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2010 - 2018, Met Office
+# (C) British Crown Copyright 2010 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -27,14 +27,18 @@ Version 1.4, 27 February 2009.
 from __future__ import (absolute_import, division, print_function)
 from six.moves import (filter, input, map, range, zip)  # noqa
 from six.moves import zip_longest  # Previous line may not be tampered with!
+from six.moves import queue
 import six
 
 import collections
 from itertools import repeat
+import operator
 import os
 import os.path
 import re
 import string
+import sys
+import threading
 import warnings
 
 import dask.array as da
@@ -43,6 +47,7 @@ import numpy as np
 import numpy.ma as ma
 from pyke import knowledge_engine
 
+import iris._constraints
 from iris._deprecation import warn_deprecated
 import iris.analysis
 from iris.aux_factory import HybridHeightFactory, HybridPressureFactory, \
@@ -54,10 +59,11 @@ import iris.coords
 import iris.cube
 import iris.exceptions
 import iris.fileformats.cf
+import iris.fileformats._nc_load_rules
 import iris.fileformats._pyke_rules
 import iris.io
 import iris.util
-from iris._lazy_data import as_lazy_data
+from iris._lazy_data import as_lazy_data, is_lazy_data
 
 # Show Pyke inference engine statistics.
 DEBUG = False
@@ -371,6 +377,129 @@ def _pyke_kb_engine():
     return engine
 
 
+class _DatasetPool(object):
+    """
+    A bounded, thread-safe, least-recently-used pool of open read-only
+    :class:`netCDF4.Dataset` instances, keyed by absolute file path.
+
+    The maximum number of datasets held open is controlled by
+    :data:`iris.config.netcdf.dataset_pool_size`. When the pool is full, the
+    least recently used dataset is closed to make room. A size of zero
+    disables pooling, in which case every access opens and closes the file.
+
+    Cached datasets are discarded whenever the file on disk changes, and
+    the pool is reset in any process forked from the one that populated it.
+
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._pid = os.getpid()
+
+    @staticmethod
+    def _fingerprint(path):
+        stat = os.stat(path)
+        return (stat.st_ino, stat.st_size, stat.st_mtime)
+
+    def _check_pid(self):
+        # Datasets opened by a parent process must not be shared with a
+        # forked child, so simply forget them (without closing).
+        pid = os.getpid()
+        if pid != self._pid:
+            self._entries = collections.OrderedDict()
+            self._pid = pid
+
+    @staticmethod
+    def _close_entries(entries):
+        # Called without holding the pool lock, so that waiting for a
+        # dataset which is busy in another thread does not block the pool.
+        for entry in entries:
+            with entry.lock:
+                entry.dataset.close()
+                entry.closed = True
+
+    def _trim(self, size):
+        evicted = []
+        while len(self._entries) > size:
+            _, entry = self._entries.popitem(last=False)
+            evicted.append(entry)
+        return evicted
+
+    def _entry(self, path, size):
+        fingerprint = self._fingerprint(path)
+        stale = []
+        with self._lock:
+            self._check_pid()
+            entry = self._entries.pop(path, None)
+            if entry is not None and entry.fingerprint != fingerprint:
+                stale.append(entry)
+                entry = None
+            if entry is None:
+                entry = _PooledDataset(netCDF4.Dataset(path), fingerprint)
+            self._entries[path] = entry
+            stale.extend(self._trim(size))
+        self._close_entries(stale)
+        return entry
+
+    def read(self, path, variable_name, keys):
+        """
+        Return the indexed payload of the named variable in the given file.
+
+        """
+        path = os.path.abspath(path)
+        size = iris.config.netcdf.dataset_pool_size
+        if size < 1:
+            self.clear()
+            dataset = netCDF4.Dataset(path)
+            try:
+                return dataset.variables[variable_name][keys]
+            finally:
+                dataset.close()
+        while True:
+            entry = self._entry(path, size)
+            with entry.lock:
+                # The entry may have been evicted by another thread since it
+                # was handed out, in which case try again.
+                if not entry.closed:
+                    return entry.dataset.variables[variable_name][keys]
+
+    def discard(self, path):
+        """Close and forget any pooled dataset for the given file path."""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._check_pid()
+            entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._close_entries([entry])
+
+    def clear(self):
+        """Close and forget all pooled datasets."""
+        with self._lock:
+            self._check_pid()
+            evicted = self._trim(0)
+        self._close_entries(evicted)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _PooledDataset(object):
+    """An open dataset held by a :class:`_DatasetPool`."""
+
+    __slots__ = ('dataset', 'fingerprint', 'lock', 'closed')
+
+    def __init__(self, dataset, fingerprint):
+        self.dataset = dataset
+        self.fingerprint = fingerprint
+        # Serialises access to the dataset, which is not thread-safe.
+        self.lock = threading.Lock()
+        self.closed = False
+
+
+#: The process-wide pool of open datasets used by :class:`NetCDFDataProxy`.
+_DATASET_POOL = _DatasetPool()
+
+
 class NetCDFDataProxy(object):
     """A reference to the data payload of a single NetCDF file variable."""
 
@@ -388,13 +517,9 @@ class NetCDFDataProxy(object):
         return len(self.shape)
 
     def __getitem__(self, keys):
-        dataset = netCDF4.Dataset(self.path)
-        try:
-            variable = dataset.variables[self.variable_name]
-            # Get the NetCDF variable data and slice.
-            var = variable[keys]
-        finally:
-            dataset.close()
+        # Get the NetCDF variable data and slice, re-using an open dataset
+        # where possible.
+        var = _DATASET_POOL.read(self.path, self.variable_name, keys)
         return np.asanyarray(var)
 
     def __repr__(self):
@@ -471,11 +596,16 @@ def _pyke_stats(engine, cf_name):
             print('\t%s' % rule)
 
         print('Case Specific Facts:')
-        kb_facts = engine.get_kb(_PYKE_FACT_BASE)
+        if isinstance(engine, iris.fileformats._nc_load_rules.Translator):
+            for key, args in six.iteritems(engine.facts):
+                for arg in args:
+                    print('\t%s%s' % (key, arg))
+        else:
+            kb_facts = engine.get_kb(_PYKE_FACT_BASE)
 
-        for key in six.iterkeys(kb_facts.entity_lists):
-            for arg in kb_facts.entity_lists[key].case_specific_facts:
-                print('\t%s%s' % (key, arg))
+            for key in six.iterkeys(kb_facts.entity_lists):
+                for arg in kb_facts.entity_lists[key].case_specific_facts:
+                    print('\t%s%s' % (key, arg))
 
 
 def _set_attributes(attributes, key, value):
@@ -501,6 +631,32 @@ def _get_actual_dtype(cf_var):
     return dummy_data.dtype
 
 
+def _consolidated_chunks(shape, storage_chunks, itemsize, target):
+    """
+    Return the chunks of a variable of the given shape, each made of whole
+    storage chunks and no larger than the target size in bytes, unless a
+    single storage chunk is larger.
+
+    The chunks grow along the leading dimensions first, as these (such as
+    time or height) are the dimensions most commonly reduced, while the
+    storage chunks of a variable commonly span its trailing dimensions.
+
+    """
+    # The storage chunks of an unlimited dimension may exceed its length.
+    chunks = [min(chunk, length) for chunk, length in zip(storage_chunks,
+                                                          shape)]
+    size = itemsize * int(np.prod(chunks))
+    for i, length in enumerate(shape):
+        multiple = target // max(size, 1)
+        if multiple < 2:
+            break
+        if chunks[i]:
+            new_chunk = min(chunks[i] * multiple, length)
+            size = size // chunks[i] * new_chunk
+            chunks[i] = new_chunk
+    return tuple(chunks)
+
+
 def _get_cf_var_data(cf_var, filename):
     # Get lazy chunked data out of a cf variable.
     dtype = _get_actual_dtype(cf_var)
@@ -514,6 +670,11 @@ def _get_cf_var_data(cf_var, filename):
     # Chunks can be an iterable, None, or `'contiguous'`.
     if chunks == 'contiguous':
         chunks = None
+    elif chunks is not None and iris.config.netcdf.chunk_bytes > 0:
+        # Group the storage chunks, which may be very small, into chunks of
+        # a size worth a dask task.
+        chunks = _consolidated_chunks(cf_var.shape, chunks, dtype.itemsize,
+                                      iris.config.netcdf.chunk_bytes)
     return as_lazy_data(proxy, chunks=chunks)
 
 
@@ -677,7 +838,103 @@ def _load_aux_factory(engine, cube):
         cube.add_aux_factory(factory)
 
 
-def load_cubes(filenames, callback=None):
+def _constraint_names(constraint):
+    # Return the set of cube names which can match the constraint, or None
+    # if it can match any name.
+    if isinstance(constraint, iris._constraints.ConstraintCombination):
+        lhs = _constraint_names(constraint.lhs)
+        rhs = _constraint_names(constraint.rhs)
+        if constraint.operator is not operator.and_:
+            names = None
+        elif lhs is None:
+            names = rhs
+        elif rhs is None:
+            names = lhs
+        else:
+            names = lhs & rhs
+    elif constraint._name:
+        names = {constraint._name}
+    else:
+        names = None
+    return names
+
+
+def _load_names(constraints):
+    # Return the names of the cubes which the constraints can select, or
+    # None if they can select any cube.
+    names = set()
+    for constraint in iris._constraints.list_of_constraints(constraints):
+        constraint_names = _constraint_names(constraint)
+        if constraint_names is None:
+            return None
+        names.update(constraint_names)
+    return names
+
+
+def _nc_attribute(cf_var, name):
+    # Return the value of a netCDF attribute of the CF variable, or None,
+    # without marking the attribute as used by the load rules.
+    value = None
+    if name in cf_var.cf_data.ncattrs():
+        value = cf_var.cf_data.getncattr(name)
+    return value
+
+
+# The cube attributes which the load rules derive from other attributes.
+_DERIVED_ATTRIBUTES = ('STASH', 'ukmo__process_flags',
+                       'invalid_standard_name')
+
+
+def _may_select(constraint, cf, cf_var):
+    # Return whether the constraint may select the cube of the CF data
+    # variable, judged from the metadata of the variable before the cube is
+    # built. This never rejects a cube which the constraint would select.
+    if isinstance(constraint, iris._constraints.ConstraintCombination):
+        result = (constraint.operator is not operator.and_ or
+                  (_may_select(constraint.lhs, cf, cf_var) and
+                   _may_select(constraint.rhs, cf, cf_var)))
+    elif isinstance(constraint, iris._constraints.AttributeConstraint):
+        result = True
+        global_attributes = cf.cf_group.global_attributes
+        for name, value in six.iteritems(constraint._attributes):
+            if name in _DERIVED_ATTRIBUTES:
+                continue
+            # The cube attribute is either that of the variable or the
+            # global attribute.
+            candidates = []
+            if name in cf_var.cf_data.ncattrs():
+                candidates.append(_nc_attribute(cf_var, name))
+            if name in global_attributes:
+                candidates.append(global_attributes[name])
+            if not candidates:
+                result = False
+            elif (isinstance(value, six.string_types) and
+                    all(isinstance(candidate, six.string_types)
+                        for candidate in candidates)):
+                result = value in candidates
+            if not result:
+                break
+    elif constraint._name:
+        # The cube is named for one of these.
+        names = [cf_var.cf_name, _nc_attribute(cf_var, 'standard_name'),
+                 _nc_attribute(cf_var, 'long_name')]
+        result = any(isinstance(name, six.string_types) and
+                     name == constraint._name for name in names)
+    else:
+        result = True
+    return result
+
+
+def _has_coord_constraints(constraint):
+    if isinstance(constraint, iris._constraints.ConstraintCombination):
+        result = (_has_coord_constraints(constraint.lhs) or
+                  _has_coord_constraints(constraint.rhs))
+    else:
+        result = bool(constraint._coord_constraints)
+    return result
+
+
+def load_cubes(filenames, callback=None, constraints=None):
     """
     Loads cubes from a list of NetCDF filenames/URLs.
 
@@ -691,24 +948,51 @@ def load_cubes(filenames, callback=None):
     * callback (callable function):
         Function which can be passed on to :func:`iris.io.run_callback`.
 
+    * constraints (:class:`~iris.Constraint` or list):
+        The load constraints. Without a callback, which may change the
+        cubes, only the data variables whose names and attributes the
+        constraints may select are translated into cubes, and a single
+        constraint on coordinate values is applied to each cube by indexing
+        its lazy data. The constraints must still be applied to the cubes
+        loaded.
+
     Returns:
         Generator of loaded NetCDF :class:`iris.cubes.Cube`.
 
     """
-    # Initialise the pyke inference engine.
-    engine = _pyke_kb_engine()
+    if iris.config.netcdf.load_rules == 'pyke':
+        # Initialise the pyke inference engine.
+        engine = _pyke_kb_engine()
+    else:
+        engine = iris.fileformats._nc_load_rules.Translator()
 
     if isinstance(filenames, six.string_types):
         filenames = [filenames]
 
+    selectors = None
+    names = None
+    extractor = None
+    if callback is None and constraints is not None:
+        selectors = iris._constraints.list_of_constraints(constraints)
+        names = _load_names(selectors)
+        if len(selectors) == 1 and _has_coord_constraints(selectors[0]):
+            extractor = selectors[0]
+
     for filename in filenames:
         # Ingest the netCDF file.
-        cf = iris.fileformats.cf.CFReader(filename)
+        cf = iris.fileformats.cf.CFReader(filename, names=names)
 
-        # Process each CF data variable.
+        # Process each CF data variable, skipping those which the CFReader
+        # has not built as they cannot be selected.
         data_variables = (list(cf.cf_group.data_variables.values()) +
                           list(cf.cf_group.promoted.values()))
         for cf_var in data_variables:
+            if cf_var.cf_group is None:
+                continue
+            if selectors is not None and not any(
+                    _may_select(selector, cf, cf_var)
+                    for selector in selectors):
+                continue
             cube = _load_cube(engine, cf, cf_var, filename)
 
             # Process any associated formula terms and attach
@@ -725,6 +1009,11 @@ def load_cubes(filenames, callback=None):
             if cube is None:
                 continue
 
+            if extractor is not None:
+                cube = extractor.extract(cube)
+                if cube is None:
+                    continue
+
             yield cube
 
 
@@ -762,6 +1051,10 @@ class _FillValueMaskCheckAndStoreTarget(object):
     given value and whether it was masked, before passing the chunk to the
     given target.
 
+    Both checks are reductions over each chunk as it is stored, and are
+    skipped once they have been satisfied by an earlier chunk.  They only
+    ever set their results, so chunks may be stored by concurrent threads.
+
     """
     def __init__(self, target, fill_value=None):
         self.target = target
@@ -770,16 +1063,112 @@ class _FillValueMaskCheckAndStoreTarget(object):
         self.is_masked = False
 
     def __setitem__(self, keys, arr):
-        if self.fill_value is not None:
-            self.contains_value = self.contains_value or self.fill_value in arr
-        self.is_masked = self.is_masked or ma.is_masked(arr)
+        if self.fill_value is not None and not self.contains_value:
+            # Masked points compare as masked, which fill as not equal.
+            if np.any(ma.filled(arr == self.fill_value, False)):
+                self.contains_value = True
+        if not self.is_masked and ma.is_masked(arr):
+            self.is_masked = True
         self.target[keys] = arr
 
 
+class _ChunkWriter(object):
+    """
+    Writes the chunks of lazy data computed by the threads of the dask
+    scheduler to their netCDF variables, from a single dedicated thread.
+
+    The computed chunks wait in a bounded queue, so that computation
+    overlaps the writes without holding more than a few chunks in memory.
+    Only the writer thread accesses the dataset, as HDF5 is not
+    thread-safe.
+
+    """
+    def __init__(self, queue_size):
+        self._queue = queue.Queue(queue_size)
+        self._exc_info = None
+        self._thread = threading.Thread(target=self._write_chunks,
+                                        name='iris-netcdf-writer')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _write_chunks(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            target, keys, arr = item
+            if self._exc_info is None:
+                try:
+                    target[keys] = arr
+                except Exception:
+                    # Keep draining the queue, so that no computing
+                    # thread blocks, but write nothing more.
+                    self._exc_info = sys.exc_info()
+
+    def _raise(self):
+        if self._exc_info is not None:
+            six.reraise(*self._exc_info)
+
+    def put(self, target, keys, arr):
+        """Queue a chunk to be written to the given target."""
+        # Stop the computation as soon as a write has failed.
+        self._raise()
+        self._queue.put((target, keys, arr))
+
+    def close(self):
+        """
+        Wait for all of the queued chunks to be written, then raise the
+        error of any write that failed.
+
+        """
+        self._queue.put(None)
+        self._thread.join()
+        self._raise()
+
+
+class _QueuedStoreTarget(object):
+    """
+    To be used with da.store. Passes each chunk to a :class:`_ChunkWriter`
+    for writing to the given target.
+
+    """
+    def __init__(self, writer, target):
+        self.writer = writer
+        self.target = target
+
+    def __setitem__(self, keys, arr):
+        self.writer.put(self.target, keys, arr)
+
+
+def _store(sources, targets):
+    """
+    Store the lazy data sources in the corresponding netCDF variables,
+    through :class:`_FillValueMaskCheckAndStoreTarget` targets.
+
+    Unless :data:`iris.config.netcdf` disables the write queue, the chunks
+    are computed in parallel, checked, and then queued for a single writer
+    thread.
+
+    """
+    queue_size = iris.config.netcdf.write_queue_size
+    if queue_size <= 0:
+        da.store(sources, targets)
+    else:
+        writer = _ChunkWriter(queue_size)
+        for target in targets:
+            target.target = _QueuedStoreTarget(writer, target.target)
+        try:
+            # No lock is needed, as only the writer thread writes.
+            da.store(sources, targets, lock=False)
+        finally:
+            # Leave no write pending when the dataset closes.
+            writer.close()
+
+
 class Saver(object):
     """A manager for saving netcdf files."""
 
-    def __init__(self, filename, netcdf_format):
+    def __init__(self, filename, netcdf_format, compute=True):
         """
         A manager for saving netcdf files.
 
@@ -792,13 +1181,22 @@ class Saver(object):
             Underlying netCDF file format, one of 'NETCDF4', 'NETCDF4_CLASSIC',
             'NETCDF3_CLASSIC' or 'NETCDF3_64BIT'. Default is 'NETCDF4' format.
 
+        Kwargs:
+
+        * compute (bool):
+            If True, the default, the lazy data of each cube is stored as the
+            cube is written. If False, the lazy data of all the cubes written
+            is stored by :meth:`complete`, or on leaving the context, in a
+            single computation, so that the data the cubes share is computed
+            only once.
+
         Returns:
             None.
 
         For example::
 
             # Initialise Manager for saving
-            with Saver(filename, netcdf_format) as sman:
+            with Saver(filename, netcdf_format, compute=False) as sman:
                 # Iterate through the cubelist.
                 for cube in cubes:
                     sman.write(cube)
@@ -820,6 +1218,12 @@ class Saver(object):
         self._existing_dim = {}
         #: A dictionary, mapping formula terms to owner cf variable name
         self._formula_terms_cache = {}
+        #: Whether lazy data is stored as each cube is written
+        self._compute = compute
+        #: List of the lazy data writes awaiting :meth:`complete`
+        self._delayed_writes = []
+        # Ensure no stale read handle on the file outlives its rewrite.
+        _DATASET_POOL.discard(filename)
         #: NetCDF dataset
         try:
             self._dataset = netCDF4.Dataset(filename, mode='w',
@@ -841,9 +1245,30 @@ class Saver(object):
     def __exit__(self, type, value, traceback):
         """Flush any buffered data to the CF-netCDF file before closing."""
 
+        if type is None:
+            self.complete()
         self._dataset.sync()
         self._dataset.close()
 
+    def complete(self):
+        """
+        Store the lazy data of all the cubes written since the last call,
+        when the manager was created with `compute=False`.
+
+        The data of all the cubes is stored by a single computation, with
+        the masking and fill-value checks of each cube made as its chunks
+        are stored.
+
+        """
+        if self._delayed_writes:
+            writes, self._delayed_writes = self._delayed_writes, []
+            _store([write[0] for write in writes],
+                   [write[1] for write in writes])
+            for _, target, cube_name, dtype, fill_value in writes:
+                self._check_fill_value(cube_name, dtype, fill_value,
+                                       target.is_masked,
+                                       target.contains_value)
+
     def write(self, cube, local_keys=None, unlimited_dimensions=None,
               zlib=False, complevel=4, shuffle=True, fletcher32=False,
               contiguous=False, chunksizes=None, endian='native',
@@ -1899,6 +2324,30 @@ class Saver(object):
             # Refer to grid var
             _setncattr(cf_var_cube, 'grid_mapping', cs.grid_mapping_name)
 
+    @staticmethod
+    def _check_fill_value(cube_name, dtype, fill_value, is_masked,
+                          contains_fill_value):
+        """
+        Warn if the stored data of a cube will not read back as saved,
+        because of its masked points or its points equal to the fill value.
+
+        """
+        if dtype.itemsize == 1 and fill_value is None:
+            if is_masked:
+                msg = ("Cube '{}' contains byte data with masked points, but "
+                       "no fill_value keyword was given. As saved, these "
+                       "points will read back as valid values. To save as "
+                       "masked byte data, please explicitly specify the "
+                       "'fill_value' keyword.")
+                warnings.warn(msg.format(cube_name))
+        elif contains_fill_value:
+            msg = ("Cube '{}' contains unmasked data points equal to the "
+                   "fill-value, {}. As saved, these points will read back "
+                   "as missing data. To save these as normal values, please "
+                   "specify a 'fill_value' keyword not equal to any valid "
+                   "data points.")
+            warnings.warn(msg.format(cube_name, fill_value))
+
     def _create_cf_data_variable(self, cube, dimension_names, local_keys=None,
                                  packing=None, fill_value=None, **kwargs):
         """
@@ -1996,7 +2445,7 @@ class Saver(object):
                 # Store lazy data and check whether it is masked and contains
                 # the fill value
                 target = _FillValueMaskCheckAndStoreTarget(cf_var, fill_value)
-                da.store([data], [target])
+                _store([data], [target])
                 return target.is_masked, target.contains_value
 
         if not packing:
@@ -2018,24 +2467,17 @@ class Saver(object):
             fill_value_to_check = netCDF4.default_fillvals[dtype.str[1:]]
 
         # Store the data and check if it is masked and contains the fill value
-        is_masked, contains_fill_value = store(data, cf_var,
-                                               fill_value_to_check)
-
-        if dtype.itemsize == 1 and fill_value is None:
-            if is_masked:
-                msg = ("Cube '{}' contains byte data with masked points, but "
-                       "no fill_value keyword was given. As saved, these "
-                       "points will read back as valid values. To save as "
-                       "masked byte data, please explicitly specify the "
-                       "'fill_value' keyword.")
-                warnings.warn(msg.format(cube.name()))
-        elif contains_fill_value:
-            msg = ("Cube '{}' contains unmasked data points equal to the "
-                   "fill-value, {}. As saved, these points will read back "
-                   "as missing data. To save these as normal values, please "
-                   "specify a 'fill_value' keyword not equal to any valid "
-                   "data points.")
-            warnings.warn(msg.format(cube.name(), fill_value))
+        if is_lazy_data(data) and not self._compute:
+            # Leave the store, and its checks, to self.complete.
+            target = _FillValueMaskCheckAndStoreTarget(cf_var,
+                                                       fill_value_to_check)
+            self._delayed_writes.append((data, target, cube.name(), dtype,
+                                         fill_value))
+        else:
+            is_masked, contains_fill_value = store(data, cf_var,
+                                                   fill_value_to_check)
+            self._check_fill_value(cube.name(), dtype, fill_value, is_masked,
+                                   contains_fill_value)
 
         if cube.standard_name:
             _setncattr(cf_var, 'standard_name', cube.standard_name)
@@ -2343,7 +2785,9 @@ def save(cube, filename, netcdf_format='NETCDF4', local_keys=None,
                 raise ValueError(msg)
 
     # Initialise Manager for saving
-    with Saver(filename, netcdf_format) as sman:
+    # The lazy data of all the cubes is stored together, on leaving the
+    # context, so that any data they share is computed only once.
+    with Saver(filename, netcdf_format, compute=False) as sman:
         # Iterate through the cubelist.
         for cube, packspec, fill_value in zip(cubes, packspecs, fill_values):
             sman.write(cube, local_keys, unlimited_dimensions, zlib, complevel,
@@ -26,11 +26,18 @@ import six
 import abc
 import collections
 from copy import deepcopy
+import hashlib
+import io
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 import operator
 import os
 import re
 import struct
+import tempfile
+import threading
 import warnings
+import zipfile
 
 import cf_units
 import numpy as np
@@ -641,15 +648,44 @@ class PPDataProxy(object):
     def ndim(self):
         return len(self.shape)
 
+    def _mapped_data(self):
+        """
+        Return the data of the field as an array mapped onto the file, or
+        None if the payload must be read and decoded.
+
+        Mapping is only used when enabled by :data:`iris.config.pp`, and
+        only for payloads which are stored as a plain array.  The map is
+        copy-on-write, so the file itself is never changed.  Native-endian
+        data is returned without any copy, and other data with a single
+        byteswapping copy.
+
+        """
+        data = None
+        lbpack = self.lbpack
+        n_bytes = int(np.prod(self.shape)) * self.src_dtype.itemsize
+        if (iris.config.pp.mmap and lbpack.n1 in (0, 2) and
+                lbpack.n2 != 2 and self.boundary_packing is None and
+                0 < n_bytes <= self.data_len):
+            data = np.memmap(self.path, dtype=self.src_dtype, mode='c',
+                             offset=self.offset, shape=self.shape)
+            if not data.dtype.isnative:
+                data = data.astype(self.dtype)
+            if self.mdi in data:
+                data = ma.masked_values(data, self.mdi, copy=False)
+        return data
+
     def __getitem__(self, keys):
-        with open(self.path, 'rb') as pp_file:
-            pp_file.seek(self.offset, os.SEEK_SET)
-            data_bytes = pp_file.read(self.data_len)
-            data = _data_bytes_to_shaped_array(data_bytes,
-                                               self.lbpack,
-                                               self.boundary_packing,
-                                               self.shape, self.src_dtype,
-                                               self.mdi, self.mask)
+        data = self._mapped_data()
+        if data is None:
+            with open(self.path, 'rb') as pp_file:
+                pp_file.seek(self.offset, os.SEEK_SET)
+                data_bytes = pp_file.read(self.data_len)
+                data = _data_bytes_to_shaped_array(data_bytes,
+                                                   self.lbpack,
+                                                   self.boundary_packing,
+                                                   self.shape,
+                                                   self.src_dtype,
+                                                   self.mdi, self.mask)
         data = data.__getitem__(keys)
         return np.asanyarray(data, dtype=self.dtype)
 
@@ -686,6 +722,219 @@ class PPDataProxy(object):
         return result
 
 
+#: Byte ranges of a file separated by no more than this many bytes are
+#: fetched with a single read by :func:`_read_byte_ranges`.
+_READ_GAP = 2 ** 16
+
+
+def _read_byte_ranges(path, ranges):
+    """
+    Return the bytes of each of a sequence of (offset, length) ranges of a
+    file.
+
+    The file is opened once, and read in order of offset.  Ranges which are
+    adjacent, or nearly so, are fetched together with a single read.
+
+    """
+    order = sorted(range(len(ranges)), key=lambda i: ranges[i][0])
+    result = [None] * len(ranges)
+    with open(path, 'rb') as pp_file:
+        i_run = 0
+        while i_run < len(order):
+            run_start, length = ranges[order[i_run]]
+            run_stop = run_start + length
+            # Extend the run over the following ranges that start close to
+            # the end of the run so far.
+            i_end = i_run + 1
+            while i_end < len(order) and \
+                    ranges[order[i_end]][0] - run_stop <= _READ_GAP:
+                offset, length = ranges[order[i_end]]
+                run_stop = max(run_stop, offset + length)
+                i_end += 1
+            pp_file.seek(run_start, os.SEEK_SET)
+            run_bytes = pp_file.read(run_stop - run_start)
+            for i in order[i_run:i_end]:
+                start = ranges[i][0] - run_start
+                result[i] = run_bytes[start:start + ranges[i][1]]
+            i_run = i_end
+    return result
+
+
+def _decode_field(args):
+    # Decode one field's payload, from the arguments of
+    # _data_bytes_to_shaped_array.
+    return _data_bytes_to_shaped_array(*args)
+
+
+class _DecodePool(object):
+    """
+    A thread pool for decoding the packed data payloads of many PP fields at
+    once.
+
+    The number of threads is controlled by
+    :data:`iris.config.pp.decode_workers`.  The WGDOS and RLE decoders of
+    :mod:`mo_pack` run in compiled code, so several fields can be decoded
+    concurrently.  The pool is started on first use, restarted when the
+    number of workers changes, and reset in any process forked from the one
+    that started it.
+
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pool = None
+        self._size = None
+        self._pid = os.getpid()
+
+    @staticmethod
+    def _workers():
+        workers = iris.config.pp.decode_workers
+        if workers < 1:
+            workers = multiprocessing.cpu_count()
+        return workers
+
+    def _get_pool(self, size):
+        with self._lock:
+            pid = os.getpid()
+            if pid != self._pid:
+                # The threads of a parent process do not exist in a forked
+                # child, so simply forget them.
+                self._pool = None
+                self._pid = pid
+            if self._pool is not None and self._size != size:
+                self._pool.close()
+                self._pool = None
+            if self._pool is None:
+                self._pool = ThreadPool(size)
+                self._size = size
+            return self._pool
+
+    def decode(self, jobs):
+        """
+        Return the decoded array of each of a sequence of fields, given as
+        tuples of the arguments of :func:`_data_bytes_to_shaped_array`.
+
+        Only packed payloads are passed to the pool, and only when there is
+        more than one of them.
+
+        """
+        results = [None] * len(jobs)
+        packed = []
+        for i, args in enumerate(jobs):
+            if args[1].n1 in (1, 4):
+                packed.append(i)
+            else:
+                results[i] = _decode_field(args)
+        size = self._workers()
+        if size > 1 and len(packed) > 1:
+            decoded = self._get_pool(size).map(_decode_field,
+                                               [jobs[i] for i in packed])
+        else:
+            decoded = [_decode_field(jobs[i]) for i in packed]
+        for i, data in zip(packed, decoded):
+            results[i] = data
+        return results
+
+
+_DECODE_POOL = _DecodePool()
+
+
+class _PPDataProxyStack(object):
+    """
+    The data payloads of an array of PP fields, as a single array.
+
+    The fields must all have the same shape and dtype.  Indexing reads the
+    payloads of all the selected fields together, so a dask chunk that spans
+    many fields stored consecutively in a file is fetched with a few large
+    reads rather than a file open per field.
+
+    """
+    def __init__(self, proxies):
+        """
+        Args:
+
+        * proxies (array of :class:`PPDataProxy`):
+            The data proxy of each field, arranged as the leading dimensions
+            of the array.
+
+        """
+        self.proxies = proxies
+        first = proxies.flat[0]
+        self.shape = proxies.shape + tuple(first.shape)
+        self.dtype = first.dtype
+        self.fill_value = first.fill_value
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @staticmethod
+    def stackable(proxies):
+        """
+        Whether an array of field data proxies can be combined into a
+        :class:`_PPDataProxyStack`.
+
+        """
+        flat = proxies.ravel()
+        result = len(flat) > 0 and all(isinstance(proxy, PPDataProxy)
+                                       for proxy in flat)
+        if result:
+            shape, dtype = flat[0].shape, flat[0].dtype
+            result = 0 not in shape and all(
+                proxy.shape == shape and proxy.dtype == dtype
+                for proxy in flat[1:])
+        return result
+
+    def __getitem__(self, keys):
+        if not isinstance(keys, tuple):
+            keys = (keys,)
+        n_stack = self.proxies.ndim
+        selected = self.proxies[keys[:n_stack]]
+        if not isinstance(selected, np.ndarray):
+            proxy = selected
+            selected = np.empty((), dtype=object)
+            selected[()] = proxy
+        proxies = selected.ravel()
+
+        arrays = [proxy._mapped_data() for proxy in proxies]
+
+        # Read the payloads of the other fields in each file together.
+        paths = collections.OrderedDict()
+        for i, proxy in enumerate(proxies):
+            if arrays[i] is None:
+                paths.setdefault(proxy.path, []).append(i)
+        read = []
+        jobs = []
+        for path, indices in paths.items():
+            ranges = [(proxies[i].offset, proxies[i].data_len)
+                      for i in indices]
+            for i, field_bytes in zip(indices,
+                                      _read_byte_ranges(path, ranges)):
+                proxy = proxies[i]
+                read.append(i)
+                jobs.append((field_bytes, proxy.lbpack,
+                             proxy.boundary_packing, proxy.shape,
+                             proxy.src_dtype, proxy.mdi, proxy.mask))
+        # Decode them together, so packed fields are decoded in parallel.
+        for i, data in zip(read, _DECODE_POOL.decode(jobs)):
+            arrays[i] = data
+
+        field_shape = self.shape[n_stack:]
+        if not arrays:
+            data = np.empty((0,) + field_shape, dtype=self.dtype)
+        elif any(ma.isMaskedArray(array) for array in arrays):
+            data = ma.stack(arrays)
+        else:
+            data = np.stack(arrays)
+        data = data.reshape(selected.shape + field_shape)
+        data = data[(slice(None),) * selected.ndim + keys[n_stack:]]
+        return np.asanyarray(data, dtype=self.dtype)
+
+    def __repr__(self):
+        fmt = '<{self.__class__.__name__} shape={self.shape}' \
+              ' dtype={self.dtype!r}>'
+        return fmt.format(self=self)
+
+
 def _data_bytes_to_shaped_array(data_bytes, lbpack, boundary_packing,
                                 data_shape, data_type, mdi,
                                 mask=None):
@@ -833,7 +1082,8 @@ def _pp_attribute_names(header_defn):
     special_headers = list('_' + name for name in _SPECIAL_HEADERS)
     extra_data = list(EXTRA_DATA.values())
     special_attributes = ['_raw_header', 'raw_lbtim', 'raw_lbpack',
-                          'boundary_packing', '_index_in_structured_load_file']
+                          'boundary_packing', '_index_in_structured_load_file',
+                          '_data_proxy']
     return normal_headers + special_headers + extra_data + special_attributes
 
 
@@ -867,6 +1117,8 @@ class PPField(six.with_metaclass(abc.ABCMeta, object)):
         self.raw_lbpack = None
         self.boundary_packing = None
         self._index_in_structured_load_file = None
+        # The PPDataProxy of a deferred data payload read from a file.
+        self._data_proxy = None
         if header is not None:
             self.raw_lbtim = header[self.HEADER_DICT['lbtim'][0]]
             self.raw_lbpack = header[self.HEADER_DICT['lbpack'][0]]
@@ -1044,6 +1296,7 @@ class PPField(six.with_metaclass(abc.ABCMeta, object)):
     @data.setter
     def data(self, value):
         self._data = value
+        self._data_proxy = None
 
     def core_data(self):
         return self._data
@@ -1088,11 +1341,10 @@ class PPField(six.with_metaclass(abc.ABCMeta, object)):
             elif ib in EXTRA_DATA:
                 attr_name = EXTRA_DATA[ib]
                 dtype = np.dtype('%cf%d' % (dtype_endian_char, PP_WORD_DEPTH))
-                values = np.fromfile(pp_file, dtype=dtype, count=ia)
-                # Ensure the values are in the native byte order
-                if not values.dtype.isnative:
-                    values.byteswap(True)
-                    values.dtype = values.dtype.newbyteorder('=')
+                values = np.frombuffer(file_reader(data_len), dtype=dtype)
+                # Ensure the values are writeable, and in the native byte
+                # order.
+                values = values.astype(dtype.newbyteorder('='))
                 setattr(self, attr_name, values)
             else:
                 raise ValueError('Unknown IB value for extra data: %s' % ib)
@@ -1401,6 +1653,9 @@ class PPField(six.with_metaclass(abc.ABCMeta, object)):
         if isinstance(other, PPField):
             result = True
             for attr in self.__slots__:
+                if attr == '_data_proxy':
+                    # Only a record of where the data came from.
+                    continue
                 attrs = [hasattr(self, attr), hasattr(other, attr)]
                 if all(attrs):
                     self_attr = getattr(self, attr)
@@ -1573,6 +1828,21 @@ def load(filename, read_data=False, little_ended=False):
                                         little_ended=little_ended))
 
 
+def _load(filename, read_data=False, little_ended=False, pp_filter=None):
+    """
+    As :func:`load`, but skipping those fields whose STASH codes are
+    rejected by a filter from :func:`_convert_constraints`.
+
+    The STASH codes are taken directly from the scanned header words, so no
+    PPField is made for a skipped field.
+
+    """
+    return _interpret_fields(_field_gen(filename,
+                                        read_data_bytes=read_data,
+                                        little_ended=little_ended,
+                                        pp_filter=pp_filter))
+
+
 def _interpret_fields(fields):
     """
     Turn the fields read with load and FF2PP._extract_field into useable
@@ -1646,9 +1916,372 @@ def _create_field_data(field, data_shape, land_mask):
                             field.bmdi, land_mask)
         block_shape = data_shape if 0 not in data_shape else (1, 1)
         field.data = as_lazy_data(proxy, chunks=block_shape)
+        field._data_proxy = proxy
+
+
+#: The number of bytes read at a time when scanning a PP file for fields.
+_SCAN_BLOCK_SIZE = 2 ** 20
+
+# The number of bytes at the start of each field record in a PP file: the
+# header length, the header, the header length again and the data length.
+_RECORD_PREFIX_LEN = (NUM_LONG_HEADERS + NUM_FLOAT_HEADERS + 3) * PP_WORD_DEPTH
+
+# The index of the header release number (LBREL) within a PP header.
+_LBREL_WORD = 21
+
+# The indices of the STASH section and item (LBUSER4), and the STASH model
+# (LBUSER7), within a PP header.
+_LBUSER4_WORD = 41
+_LBUSER7_WORD = 44
+
+
+class _FieldTable(object):
+    """
+    The headers and payload locations of a sequence of fields from a PP file,
+    as arrays with one row per field.
+
+    """
+    def __init__(self, longs, floats, offsets, data_lens, extras,
+                 data_bytes=None):
+        #: The long header words of each field, as an (N, 45) array.
+        self.longs = longs
+        #: The float header words of each field, as an (N, 19) array.
+        self.floats = floats
+        #: The file offset of the data payload of each field.
+        self.offsets = offsets
+        #: The length in bytes of the data payload of each field.
+        self.data_lens = data_lens
+        #: The bytes of the extra data section of each field.
+        self.extras = extras
+        #: The bytes of the data payload of each field, if they were read.
+        self.data_bytes = data_bytes
+
+    def __len__(self):
+        return len(self.offsets)
+
+    @classmethod
+    def concatenate(cls, tables):
+        """Combine a sequence of tables into one."""
+        tables = list(tables)
+        longs = np.empty((0, NUM_LONG_HEADERS), dtype=np.int32)
+        floats = np.empty((0, NUM_FLOAT_HEADERS), dtype=np.float32)
+        offsets = np.empty(0, dtype=np.int64)
+        data_lens = np.empty(0, dtype=np.int64)
+        extras = []
+        for table in tables:
+            extras.extend(table.extras)
+        return cls(np.concatenate([longs] + [t.longs for t in tables]),
+                   np.concatenate([floats] + [t.floats for t in tables]),
+                   np.concatenate([offsets] + [t.offsets for t in tables]),
+                   np.concatenate([data_lens] + [t.data_lens for t in tables]),
+                   extras)
+
+    def fields(self, filename, little_ended=False, pp_filter=None):
+        """
+        Generate the "half-formed" PPField instances described by the table,
+        as :func:`_field_gen` does.
+
+        If a filter from :func:`_convert_constraints` is given, only the
+        fields whose STASH codes it may keep are made.
+
+        """
+        longs = self.longs
+        floats = self.floats
+        if pp_filter is None:
+            rows = range(len(self))
+        else:
+            rows = np.flatnonzero(pp_filter.rows(longs))
+        for i in rows:
+            header = tuple(longs[i]) + tuple(floats[i])
+            pp_field = make_pp_field(header)
+            dtype = _data_dtype(pp_field, little_ended)
+            if self.data_bytes is not None:
+                pp_field.data = LoadedArrayBytes(self.data_bytes[i], dtype)
+            else:
+                pp_field.data = (filename, int(self.offsets[i]),
+                                 int(self.data_lens[i]), dtype)
+            extra_bytes = self.extras[i]
+            if extra_bytes:
+                pp_field._read_extra_data(None, io.BytesIO(extra_bytes).read,
+                                          len(extra_bytes),
+                                          little_ended=little_ended)
+            yield pp_field
+
+
+class _FieldScanner(object):
+    """
+    Finds the fields of an open PP file, reading the file in large blocks
+    rather than field by field.
+
+    The header words of all the fields within each block are decoded
+    together, into a :class:`_FieldTable`.
+
+    """
+    def __init__(self, pp_file, read_data_bytes=False, little_ended=False,
+                 block_size=None):
+        self.pp_file = pp_file
+        self.read_data_bytes = read_data_bytes
+        self.little_ended = little_ended
+        self.block_size = block_size or _SCAN_BLOCK_SIZE
+        #: Whether the scan reached the end of the file, rather than stopping
+        #: at a field that could not be interpreted.
+        self.complete = False
+
+    def _read(self, block, block_start, start, length):
+        # Return bytes of the file, from the current block if possible.
+        offset = start - block_start
+        if offset + length <= len(block):
+            result = block[offset:offset + length]
+        else:
+            self.pp_file.seek(start, os.SEEK_SET)
+            result = self.pp_file.read(length)
+        return result
+
+    def tables(self):
+        """Generate the :class:`_FieldTable` of each block of the file."""
+        dtype_endian_char = '<' if self.little_ended else '>'
+        int_dtype = '{}i{}'.format(dtype_endian_char, PP_WORD_DEPTH)
+        uint_dtype = '{}u{}'.format(dtype_endian_char, PP_WORD_DEPTH)
+        float_dtype = '{}f{}'.format(dtype_endian_char, PP_WORD_DEPTH)
+        long_words = np.arange(NUM_LONG_HEADERS)
+        float_words = np.arange(NUM_LONG_HEADERS,
+                                NUM_LONG_HEADERS + NUM_FLOAT_HEADERS)
+
+        # The file offset of the next field record.
+        position = 0
+        field_count = 0
+        read_size = self.block_size
+        finished = False
+        while not finished:
+            self.pp_file.seek(position, os.SEEK_SET)
+            block = self.pp_file.read(max(read_size, _RECORD_PREFIX_LEN))
+            block_start = position
+            if len(block) <= PP_WORD_DEPTH:
+                # Nothing more than a header length => EOF
+                self.complete = True
+                break
+            n_words = len(block) // PP_WORD_DEPTH
+            ints = np.frombuffer(block, dtype=int_dtype, count=n_words)
+            uints = np.frombuffer(block, dtype=uint_dtype, count=n_words)
+            if len(block) < _RECORD_PREFIX_LEN:
+                # The file ends part way through a field record.
+                if n_words > _LBREL_WORD + 1 and \
+                        ints[_LBREL_WORD + 1] not in PP_CLASSES:
+                    reason = 'Unsupported header release number: {}'.format(
+                        ints[_LBREL_WORD + 1])
+                else:
+                    reason = 'Incomplete header'
+                msg = 'Unable to interpret field {}. {}. Skipping the ' \
+                      'remainder of the file.'
+                warnings.warn(msg.format(field_count, reason))
+                break
+
+            header_words = []
+            offsets = []
+            data_lens = []
+            extras = []
+            data_bytes = [] if self.read_data_bytes else None
+            # Find all the fields whose headers are in this block.
+            while position + _RECORD_PREFIX_LEN <= block_start + len(block):
+                # The word index of the header, past the header length.
+                word = (position - block_start) // PP_WORD_DEPTH + 1
+                lbrel = ints[word + _LBREL_WORD]
+                if lbrel not in PP_CLASSES:
+                    msg = 'Unable to interpret field {}. Unsupported header ' \
+                          'release number: {}. Skipping the remainder of ' \
+                          'the file.'.format(field_count, lbrel)
+                    warnings.warn(msg)
+                    finished = True
+                    break
+
+                # Read the word telling me how long the data + extra data is
+                # This value is # of bytes
+                len_of_data_plus_extra = int(uints[word + 65])
+                lblrec_len = int(ints[word + 14]) * PP_WORD_DEPTH
+                if len_of_data_plus_extra != lblrec_len:
+                    wmsg = ('LBLREC has a different value to the integer '
+                            'recorded after the header in the file ({} and '
+                            '{}). Skipping the remainder of the file.')
+                    warnings.warn(wmsg.format(lblrec_len,
+                                              len_of_data_plus_extra))
+                    finished = True
+                    break
+
+                # calculate the extra length in bytes
+                extra_len = int(ints[word + 19]) * PP_WORD_DEPTH
+                data_len = len_of_data_plus_extra - extra_len
+                offset = position + _RECORD_PREFIX_LEN
+                if self.read_data_bytes:
+                    data_bytes.append(self._read(block, block_start, offset,
+                                                 data_len))
+                extra_bytes = b''
+                if extra_len:
+                    extra_bytes = self._read(block, block_start,
+                                             offset + data_len, extra_len)
+
+                header_words.append(word)
+                offsets.append(offset)
+                data_lens.append(data_len)
+                extras.append(extra_bytes)
+                field_count += 1
+                # Move past the data, extra data and the trailing length.
+                position = offset + len_of_data_plus_extra + PP_WORD_DEPTH
+
+                # Only read ahead by whole blocks while the blocks are likely
+                # to contain several fields.
+                if position - offsets[-1] > self.block_size // 2:
+                    read_size = _RECORD_PREFIX_LEN
+                else:
+                    read_size = self.block_size
+
+            if header_words:
+                header_words = np.array(header_words)[:, np.newaxis]
+                longs = ints[header_words + long_words].astype(np.int32)
+                floats = ints[header_words + float_words].view(float_dtype)
+                floats = floats.astype(np.float32)
+                yield _FieldTable(longs, floats,
+                                  np.array(offsets, dtype=np.int64),
+                                  np.array(data_lens, dtype=np.int64),
+                                  extras, data_bytes)
+
+
+class _PPIndex(object):
+    """
+    A record of the field headers and payload locations of a PP file, which
+    can be saved alongside the file to avoid re-scanning it on later loads.
+
+    See :class:`iris.config.PP`.
+
+    """
+    # Increment this when the content of the index files changes.
+    VERSION = 1
+
+    def __init__(self, little_ended=False):
+        self.little_ended = little_ended
+        self.tables = []
+
+    def __len__(self):
+        return sum(len(table) for table in self.tables)
+
+    def append(self, table):
+        """Record the next :class:`_FieldTable` of fields in the PP file."""
+        self.tables.append(table)
+
+    @staticmethod
+    def path(filename):
+        """Return the path of the index file of the given PP file."""
+        filename = os.path.abspath(filename)
+        index_dir = iris.config.pp.index_dir
+        if index_dir is None:
+            dirname, basename = os.path.split(filename)
+            result = os.path.join(dirname, '.{}.idx'.format(basename))
+        else:
+            name = hashlib.md5(filename.encode('utf-8')).hexdigest()
+            result = os.path.join(index_dir, '{}.idx'.format(name))
+        return result
+
+    @staticmethod
+    def _source_state(filename, little_ended):
+        # The properties of the PP file that a valid index must match.
+        stat = os.stat(filename)
+        return np.array([_PPIndex.VERSION, stat.st_size, stat.st_mtime,
+                         little_ended], dtype=np.float64)
+
+    @classmethod
+    def read(cls, filename, little_ended=False):
+        """
+        Return the index of the given PP file, or None if there is no valid
+        index for the current state of the file.
+
+        """
+        try:
+            with np.load(cls.path(filename)) as content:
+                arrays = {name: content[name] for name in content.files}
+            state = cls._source_state(filename, little_ended)
+        except (EnvironmentError, ValueError, zipfile.BadZipfile):
+            return None
+        if not np.array_equal(arrays.get('source'), state):
+            return None
+        try:
+            extra = arrays['extra'].tobytes()
+            bounds = arrays['extra_bounds']
+            extras = [extra[start:stop]
+                      for start, stop in zip(bounds[:-1], bounds[1:])]
+            table = _FieldTable(arrays['longs'], arrays['floats'],
+                                arrays['offsets'], arrays['data_lens'],
+                                extras)
+        except KeyError:
+            return None
+        if not (len(table.longs) == len(table.floats) ==
+                len(table.data_lens) == len(table.extras) == len(table)):
+            return None
+        index = cls(little_ended)
+        index.append(table)
+        return index
+
+    def write(self, filename, state):
+        """
+        Save this index for the given PP file, as it was when scanned.
 
+        Failure to write the index file is not an error, as the index is
+        only an optimisation.
 
-def _field_gen(filename, read_data_bytes, little_ended=False):
+        """
+        table = _FieldTable.concatenate(self.tables)
+        extra_lens = [len(extra) for extra in table.extras]
+        arrays = dict(
+            source=state,
+            longs=table.longs,
+            floats=table.floats,
+            offsets=table.offsets,
+            data_lens=table.data_lens,
+            extra=np.frombuffer(b''.join(table.extras), dtype=np.uint8),
+            extra_bounds=np.cumsum([0] + extra_lens, dtype=np.int64))
+        path = self.path(filename)
+        temp_path = None
+        try:
+            # Write to a temporary file, which then replaces any existing
+            # index, so that no other process can see a partial index.
+            with tempfile.NamedTemporaryFile(dir=os.path.dirname(path),
+                                             suffix='.idx',
+                                             delete=False) as temp_file:
+                temp_path = temp_file.name
+                np.savez(temp_file, **arrays)
+            os.rename(temp_path, path)
+        except EnvironmentError:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def fields(self, filename, pp_filter=None):
+        """
+        Generate the "half-formed" PPField instances of the given PP file,
+        as :func:`_field_gen` does, without reading the file itself.
+
+        """
+        for table in self.tables:
+            for pp_field in table.fields(filename, self.little_ended,
+                                         pp_filter):
+                yield pp_field
+
+
+def _data_dtype(pp_field, little_ended=False):
+    """Return the dtype of the data payload of a PP field."""
+    dtype = LBUSER_DTYPE_LOOKUP.get(pp_field.lbuser[0],
+                                    LBUSER_DTYPE_LOOKUP['default'])
+    if little_ended:
+        # Change data dtype for a little-ended file.
+        dtype = str(dtype)
+        if dtype[0] != '>':
+            msg = ("Unexpected dtype {!r} can't be converted to "
+                   "little-endian")
+            raise ValueError(msg)
+
+        dtype = np.dtype('<' + dtype[1:])
+    return dtype
+
+
+def _field_gen(filename, read_data_bytes, little_ended=False,
+               pp_filter=None):
     """
     Returns a generator of "half-formed" PPField instances derived from
     the given filename.
@@ -1661,98 +2294,37 @@ def _field_gen(filename, read_data_bytes, little_ended=False):
     sufficient information within the field to determine the final
     two-dimensional shape of the data.
 
-    """
-    dtype_endian_char = '<' if little_ended else '>'
-    with open(filename, 'rb') as pp_file:
-        # Get a reference to the seek method on the file
-        # (this is accessed 3* #number of headers so can provide a small
-        # performance boost)
-        pp_file_seek = pp_file.seek
-        pp_file_read = pp_file.read
+    When :data:`iris.config.pp` enables index files, fields with deferred
+    data are made from a valid index of the file, if there is one.
+    Otherwise, an index is recorded while scanning the file.
 
-        field_count = 0
-        # Keep reading until we reach the end of file
-        while True:
-            # Move past the leading header length word
-            pp_file_seek(PP_WORD_DEPTH, os.SEEK_CUR)
-            # Get the LONG header entries
-            dtype = '%ci%d' % (dtype_endian_char, PP_WORD_DEPTH)
-            header_longs = np.fromfile(pp_file, dtype=dtype,
-                                       count=NUM_LONG_HEADERS)
-            # Nothing returned => EOF
-            if len(header_longs) == 0:
-                break
-            # Get the FLOAT header entries
-            dtype = '%cf%d' % (dtype_endian_char, PP_WORD_DEPTH)
-            header_floats = np.fromfile(pp_file, dtype=dtype,
-                                        count=NUM_FLOAT_HEADERS)
-            header = tuple(header_longs) + tuple(header_floats)
-
-            # Make a PPField of the appropriate sub-class (depends on header
-            # release number)
-            try:
-                pp_field = make_pp_field(header)
-            except ValueError as e:
-                msg = 'Unable to interpret field {}. {}. Skipping ' \
-                      'the remainder of the file.'.format(field_count,
-                                                          str(e))
-                warnings.warn(msg)
-                break
+    If a filter from :func:`_convert_constraints` is given, fields are only
+    made for those header rows whose STASH codes it may keep.
 
-            # Skip the trailing 4-byte word containing the header length
-            pp_file_seek(PP_WORD_DEPTH, os.SEEK_CUR)
-
-            # Read the word telling me how long the data + extra data is
-            # This value is # of bytes
-            len_of_data_plus_extra = struct.unpack_from(
-                '%cL' % dtype_endian_char,
-                pp_file_read(PP_WORD_DEPTH))[0]
-            if len_of_data_plus_extra != pp_field.lblrec * PP_WORD_DEPTH:
-                wmsg = ('LBLREC has a different value to the integer recorded '
-                        'after the header in the file ({} and {}). '
-                        'Skipping the remainder of the file.')
-                warnings.warn(wmsg.format(pp_field.lblrec * PP_WORD_DEPTH,
-                                          len_of_data_plus_extra))
-                break
+    """
+    index = None
+    if not read_data_bytes and iris.config.pp.index_files:
+        index = _PPIndex.read(filename, little_ended)
+        if index is not None:
+            for pp_field in index.fields(filename, pp_filter):
+                yield pp_field
+            return
+        index = _PPIndex(little_ended)
+        state = _PPIndex._source_state(filename, little_ended)
 
-            # calculate the extra length in bytes
-            extra_len = pp_field.lbext * PP_WORD_DEPTH
-
-            # Derive size and datatype of payload
-            data_len = len_of_data_plus_extra - extra_len
-            dtype = LBUSER_DTYPE_LOOKUP.get(pp_field.lbuser[0],
-                                            LBUSER_DTYPE_LOOKUP['default'])
-            if little_ended:
-                # Change data dtype for a little-ended file.
-                dtype = str(dtype)
-                if dtype[0] != '>':
-                    msg = ("Unexpected dtype {!r} can't be converted to "
-                           "little-endian")
-                    raise ValueError(msg)
-
-                dtype = np.dtype('<' + dtype[1:])
-
-            if read_data_bytes:
-                # Read the actual bytes. This can then be converted to a numpy
-                # array at a higher level.
-                pp_field.data = LoadedArrayBytes(pp_file.read(data_len),
-                                                 dtype)
-            else:
-                # Provide enough context to read the data bytes later on.
-                pp_field.data = (filename, pp_file.tell(), data_len, dtype)
-                # Seek over the actual data payload.
-                pp_file_seek(data_len, os.SEEK_CUR)
-
-            # Do we have any extra data to deal with?
-            if extra_len:
-                pp_field._read_extra_data(pp_file, pp_file_read, extra_len,
-                                          little_ended=little_ended)
+    with open(filename, 'rb') as pp_file:
+        scanner = _FieldScanner(pp_file, read_data_bytes=read_data_bytes,
+                                little_ended=little_ended)
+        for table in scanner.tables():
+            if index is not None:
+                index.append(table)
+            for pp_field in table.fields(filename, little_ended,
+                                         pp_filter):
+                yield pp_field
 
-            # Skip that last 4 byte record telling me the length of the field I
-            # have already read
-            pp_file_seek(PP_WORD_DEPTH, os.SEEK_CUR)
-            field_count += 1
-            yield pp_field
+    # Do not index a file that could not be fully read.
+    if index is not None and scanner.complete:
+        index.write(filename, state)
 
 
 # Stash codes not to be filtered (reference altitude and pressure fields).
@@ -1800,29 +2372,71 @@ def _convert_constraints(constraints):
             # pp constraints
             unhandled_constraints = True
 
-    def pp_filter(field):
-        """
-        return True if field is to be kept,
-        False if field does not match filter
+    if pp_constraints and not unhandled_constraints:
+        result = _STASHFilter(pp_constraints['stash'])
+    else:
+        result = None
+    return result
 
-        """
-        res = True
-        if field.stash not in _STASH_ALLOW:
-            if pp_constraints.get('stash'):
 
-                    res = False
-                    for call_func in pp_constraints['stash']:
+class _STASHFilter(object):
+    """
+    A filter of PP fields by their STASH codes, as made by
+    :func:`_convert_constraints`.
+
+    Calling the filter with a field returns True if the field is to be
+    kept, or False if it does not match the filter.
 
-                        if call_func(str(field.stash)):
-                            res = True
-                            break
+    """
+    # The STASH code of a land mask field, which must be kept so that any
+    # land compressed fields can be decompressed.
+    _LAND_MASK = STASH(1, 0, 30)
+
+    def __init__(self, call_funcs):
+        self._call_funcs = call_funcs
+        # The filter result for each STASH code seen so far. Files with many
+        # fields typically hold only a few distinct codes, so the constraint
+        # functions need only be called once per code.
+        self._results = {}
+
+    def _keep(self, stash):
+        try:
+            return self._results[stash]
+        except KeyError:
+            pass
+        res = True
+        if stash not in _STASH_ALLOW:
+            res = False
+            for call_func in self._call_funcs:
+                if call_func(str(stash)):
+                    res = True
+                    break
+        self._results[stash] = res
         return res
 
-    if pp_constraints and not unhandled_constraints:
-        result = pp_filter
-    else:
-        result = None
-    return result
+    def __call__(self, field):
+        return self._keep(field.stash)
+
+    def rows(self, longs):
+        """
+        Return which rows of an (N, 45) array of PP header long words may be
+        kept, judged by the STASH codes in their LBUSER4 and LBUSER7 words.
+
+        Land mask fields are always kept, as they may be needed by the other
+        fields, but are still rejected when the fields themselves are
+        filtered.
+
+        """
+        codes = longs[:, [_LBUSER4_WORD, _LBUSER7_WORD]]
+        if not len(codes):
+            return np.zeros(0, dtype=bool)
+        codes, inverse = np.unique(codes, axis=0, return_inverse=True)
+        keep = []
+        for lbuser4, lbuser7 in codes:
+            stash = STASH(int(lbuser7), int(lbuser4) // 1000,
+                          int(lbuser4) % 1000)
+            keep.append(stash == self._LAND_MASK or self._keep(stash))
+        return np.array(keep, dtype=bool)[inverse.reshape(-1)]
 
 
 def load_cubes(filenames, callback=None, constraints=None):
@@ -1949,6 +2563,11 @@ def _load_cubes_variable_loader(filenames, callback, loading_function,
             loading_function_kwargs,
             um_fast_load._convert_collation)
     else:
+        if pp_filter is not None and loading_function is load:
+            # Skip the rejected PP fields before they are even made.
+            loading_function = _load
+            loading_function_kwargs = dict(loading_function_kwargs or {},
+                                           pp_filter=pp_filter)
         loader = iris.fileformats.rules.Loader(
             loading_function, loading_function_kwargs or {},
             iris.fileformats.pp_load_rules.convert)
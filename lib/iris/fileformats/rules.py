@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2010 - 2017, Met Office
+# (C) British Crown Copyright 2010 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -29,9 +29,11 @@ import warnings
 import cf_units
 
 from iris.analysis import Linear
+import iris.config
 import iris.cube
 import iris.exceptions
 import iris.fileformats.um_cf_map
+import iris.io
 
 Factory = collections.namedtuple('Factory', ['factory_class', 'args'])
 ReferenceTarget = collections.namedtuple('ReferenceTarget',
@@ -405,15 +407,29 @@ def load_pairs_from_fields(fields, converter):
 def load_cubes(filenames, user_callback, loader, filter_function=None):
     if isinstance(filenames, six.string_types):
         filenames = [filenames]
+    else:
+        # The filenames are counted, and then iterated over.
+        filenames = list(filenames)
+
+    parallel = iris.config.load.workers > 1
+
+    def _file_fields(filename):
+        fields = loader.field_generator(filename,
+                                        **loader.field_generator_kwargs)
+        # evaluate field against format specific desired attributes
+        # load if no format specific desired attributes are violated
+        fields = (field for field in fields
+                  if filter_function is None or filter_function(field))
+        if parallel:
+            # Read all the fields of the file within the worker thread.
+            fields = list(fields)
+        return fields
 
     def _generate_all_fields_and_filenames():
-        for filename in filenames:
-            for field in loader.field_generator(
-                    filename, **loader.field_generator_kwargs):
-                # evaluate field against format specific desired attributes
-                # load if no format specific desired attributes are violated
-                if filter_function is None or filter_function(field):
-                    yield (field, filename)
+        for filename, fields in zip(
+                filenames, iris.io._imap_files(_file_fields, filenames)):
+            for field in fields:
+                yield (field, filename)
 
     def loadcubes_user_callback_wrapper(cube, field, filename):
         # Run user-provided original callback function.
@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2016 - 2018, Met Office
+# (C) British Crown Copyright 2016 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -120,6 +120,8 @@ def _basic_load_function(filename, pp_filter=None, **kwargs):
     # when it is present.
     # Additional load keywords are 'passed on' to the lower-level function.
 
+    from iris.fileformats import pp
+
     # Helper function to select the correct fields loader call.
     def _select_raw_fields_loader(fname):
         # Return the PPfield loading function for a file name.
@@ -130,20 +132,23 @@ def _basic_load_function(filename, pp_filter=None, **kwargs):
         # 'recreates' that information by calling the format picker again.
         # NOTE: this may be inefficient, especially for web resources.
         from iris.fileformats import FORMAT_AGENT
-        from iris.fileformats.pp import load as pp_load
         from iris.fileformats.um import um_to_pp
         with open(fname, 'rb') as fh:
             spec = FORMAT_AGENT.get_spec(os.path.basename(fname), fh)
         if spec.name.startswith(_FF_SPEC_NAME):
             loader = um_to_pp
         elif spec.name.startswith(_PP_SPEC_NAME):
-            loader = pp_load
+            loader = pp.load
         else:
             emsg = 'Require {!r} to be a structured FieldsFile or a PP file.'
             raise ValueError(emsg.format(fname))
         return loader
 
     loader = _select_raw_fields_loader(filename)
+    if loader is pp.load and pp_filter is not None:
+        # PP fields rejected by STASH can be skipped before they are made.
+        loader = pp._load
+        kwargs = dict(kwargs, pp_filter=pp_filter)
 
     def iter_fields_decorated_with_load_indices(fields_iter):
         for i_field, field in enumerate(fields_iter):
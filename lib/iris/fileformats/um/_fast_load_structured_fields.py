@@ -32,6 +32,7 @@ import cftime
 import numpy as np
 
 from iris._lazy_data import as_lazy_data, multidim_lazy_stack
+from iris.fileformats.pp import _PPDataProxyStack
 from iris.fileformats.um._optimal_array_structuring import \
     optimal_array_structure
 
@@ -86,11 +87,19 @@ class BasicFieldCollation(object):
         if not self._structure_calculated:
             self._calculate_structure()
         if self._data_cache is None:
-            stack = np.empty(self.vector_dims_shape, 'object')
+            proxies = np.empty(self.vector_dims_shape, 'object')
             for nd_index, field in zip(np.ndindex(self.vector_dims_shape),
                                        self.fields):
-                stack[nd_index] = as_lazy_data(field._data)
-            self._data_cache = multidim_lazy_stack(stack)
+                proxies[nd_index] = getattr(field, '_data_proxy', None)
+            if _PPDataProxyStack.stackable(proxies):
+                # Read the data of many fields in each chunk, together.
+                self._data_cache = as_lazy_data(_PPDataProxyStack(proxies))
+            else:
+                stack = np.empty(self.vector_dims_shape, 'object')
+                for nd_index, field in zip(
+                        np.ndindex(self.vector_dims_shape), self.fields):
+                    stack[nd_index] = as_lazy_data(field._data)
+                self._data_cache = multidim_lazy_stack(stack)
         return self._data_cache
 
     def core_data(self):
@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2010 - 2018, Met Office
+# (C) British Crown Copyright 2010 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -25,10 +25,12 @@ import six
 
 from collections import OrderedDict
 import glob
+from multiprocessing.pool import ThreadPool
 import os.path
 import re
 import collections
 
+import iris.config
 import iris.fileformats
 import iris.cube
 import iris.exceptions
@@ -178,6 +180,43 @@ def expand_filespecs(file_specs):
     return [fname for fnames in all_expanded for fname in fnames]
 
 
+def _imap_files(function, filenames):
+    """
+    Return an iterator of the results of applying a function to each of a
+    sequence of filenames, in order.
+
+    When :data:`iris.config.load` sets more than one worker, the function is
+    applied to several files at once by a pool of threads. Only as many
+    files as there are workers are read ahead of the result being consumed,
+    so that the results for a long sequence of files are not all held in
+    memory at once.
+
+    """
+    workers = min(iris.config.load.workers, len(filenames))
+    if workers > 1:
+        pool = ThreadPool(workers)
+        try:
+            pending = collections.deque()
+            for filename in filenames:
+                pending.append(pool.apply_async(function, (filename,)))
+                if len(pending) == workers:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
+        finally:
+            pool.terminate()
+    else:
+        for filename in filenames:
+            yield function(filename)
+
+
+def _format_spec(filename):
+    # Identify the format of a file from its name and content.
+    with open(filename, 'rb') as fh:
+        return iris.fileformats.FORMAT_AGENT.get_spec(
+            os.path.basename(filename), fh)
+
+
 def load_files(filenames, callback, constraints=None):
     """
     Takes a list of filenames which may also be globs, and optionally a
@@ -194,10 +233,9 @@ def load_files(filenames, callback, constraints=None):
 
     # Create default dict mapping iris format handler to its associated filenames
     handler_map = collections.defaultdict(list)
-    for fn in all_file_paths:
-        with open(fn, 'rb') as fh:
-            handling_format_spec = iris.fileformats.FORMAT_AGENT.get_spec(os.path.basename(fn), fh)
-            handler_map[handling_format_spec].append(fn)
+    for fn, handling_format_spec in zip(
+            all_file_paths, _imap_files(_format_spec, all_file_paths)):
+        handler_map[handling_format_spec].append(fn)
 
     # Call each iris format handler with the approriate filenames
     for handling_format_spec in sorted(handler_map):
@@ -305,6 +305,45 @@ class TestCoordSystem(tests.IrisTest):
         self.assertCML(cube, ('netcdf', 'netcdf_laea.cml'))
 
 
+@tests.skip_data
+class TestLoadRules(tests.IrisTest):
+    def test_dispatch_matches_pyke(self):
+        paths = [('global', 'xyt', 'SMALL_total_column_co2.nc'),
+                 ('global', 'xyz_t', 'GEMS_CO2_Apr2006.nc'),
+                 ('rotated', 'xyt', 'small_rotPole_precipitation.nc'),
+                 ('transverse_mercator', 'tmean_1910_1910.nc'),
+                 ('lambert_conformal', 'test_lcc.nc'),
+                 ('mercator', 'toa_brightness_temperature.nc'),
+                 ('stereographic', 'toa_brightness_temperature.nc'),
+                 ('lambert_azimuthal_equal_area', 'euro_air_temp.nc'),
+                 ('label_and_climate', 'small_FC_167_mon_19601101.nc'),
+                 ('ORCA2', 'votemper.nc'),
+                 ('testing', 'cell_methods.nc')]
+        for path in paths:
+            filename = tests.get_data_path(('NetCDF',) + path)
+            with iris.config.netcdf.context(load_rules='pyke'):
+                expected = iris.load_raw(filename)
+            with iris.config.netcdf.context(load_rules='dispatch'):
+                cubes = iris.load_raw(filename)
+            self.assertEqual(cubes, expected)
+
+
+@tests.skip_data
+class TestConstrainedLoad(tests.IrisTest):
+    def setUp(self):
+        self.filename = tests.get_data_path(
+            ('NetCDF', 'global', 'xyt', 'SMALL_total_column_co2.nc'))
+
+    def test_coord_values(self):
+        constraint = iris.Constraint(latitude=lambda cell: cell > 0)
+        cubes = iris.load(self.filename, constraint)
+        self.assertTrue(all(cube.has_lazy_data() for cube in cubes))
+        self.assertEqual(cubes, iris.load(self.filename).extract(constraint))
+
+    def test_unmatched_name(self):
+        self.assertEqual(iris.load(self.filename, 'wibble'), CubeList())
+
+
 def _get_scale_factor_add_offset(cube, datatype):
     """Utility function used by netCDF data packing tests."""
     if isinstance(datatype, dict):
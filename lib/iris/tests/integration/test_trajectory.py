@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2010 - 2017, Met Office
+# (C) British Crown Copyright 2010 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -25,6 +25,7 @@ import six
 import iris.tests as tests
 
 import numpy as np
+import numpy.ma as ma
 
 import iris
 import iris.tests.stock as istk
@@ -196,14 +197,6 @@ class TestTriPolar(tests.IrisTest):
         test_cube = self.cube
         # Use just one 2d layer, just to be faster.
         test_cube = test_cube[0][0]
-        # Fix the fill value of the data to zero, just so that we get the same
-        # result under numpy < 1.11 as with 1.11.
-        # NOTE: numpy<1.11 *used* to assign missing data points into an
-        # unmasked array as =0.0, now =fill-value.
-        # TODO: arguably, we should support masked data properly in the
-        # interpolation routine.  In the legacy code, that is unfortunately
-        # just not the case.
-        test_cube.data.fill_value = 0
 
         # Test points on a regular global grid, with unrelated steps + offsets
         # and an extended range of longitude values.
@@ -214,7 +207,8 @@ class TestTriPolar(tests.IrisTest):
                          ('latitude', y_points.flatten())]
         result = traj_interpolate(test_cube, sample_points,
                                   method='nearest')
-        expected = [
+        # The zero values are masked, as is the source data at those points.
+        expected = ma.masked_equal([
             0., 0., 0., 0.,
             0., 0., 0., 0.,
             12.13186264, 10.69991493, 9.86881161, 7.08723927,
@@ -224,9 +218,9 @@ class TestTriPolar(tests.IrisTest):
             13.53453922, 0., 17.41485596, 0.,
             0., 13.0413475, 0., 17.10849571,
             -1.67040622, -1.64783156, 0., -1.97898054,
-            -1.67642927, -1.65173221, -1.623945, 0.]
+            -1.67642927, -1.65173221, -1.623945, 0.], 0)
 
-        self.assertArrayAllClose(result.data, expected)
+        self.assertMaskedArrayAlmostEqual(result.data, expected)
 
 
 class TestLazyData(tests.IrisTest):
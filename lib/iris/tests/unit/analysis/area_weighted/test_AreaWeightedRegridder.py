@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2014 - 2015, Met Office
+# (C) British Crown Copyright 2014 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -28,10 +28,12 @@ import iris.tests as tests
 
 import numpy as np
 
+from iris._lazy_data import as_lazy_data
 from iris.analysis._area_weighted import AreaWeightedRegridder
 from iris.coord_systems import GeogCS
 from iris.coords import DimCoord
 from iris.cube import Cube
+import iris.cube
 from iris.tests import mock
 
 
@@ -41,6 +43,8 @@ class Test(tests.IrisTest):
         cube = Cube(data)
         lat = DimCoord(y, 'latitude', units='degrees')
         lon = DimCoord(x, 'longitude', units='degrees')
+        lat.guess_bounds()
+        lon.guess_bounds()
         cube.add_dim_coord(lat, 0)
         cube.add_dim_coord(lon, 1)
         return cube
@@ -69,17 +73,17 @@ class Test(tests.IrisTest):
         src.data += 10
 
         with mock.patch('iris.experimental.regrid.'
-                        'regrid_area_weighted_rectilinear_src_and_grid',
-                        return_value=mock.sentinel.result) as regrid:
+                        '_regrid_area_weighted_rectilinear_src_and_grid'
+                        '__perform',
+                        return_value=mock.sentinel.result) as perform:
             result = regridder(src)
 
-        self.assertEqual(regrid.call_count, 1)
-        _, args, kwargs = regrid.mock_calls[0]
+        self.assertEqual(perform.call_count, 1)
+        _, args, kwargs = perform.mock_calls[0]
 
         self.assertEqual(args[0], src)
-        self.assertEqual(self.extract_grid(args[1]),
-                         self.extract_grid(target_grid))
-        self.assertEqual(kwargs, {'mdtol': mdtol})
+        self.assertIs(args[1], regridder._regrid_info)
+        self.assertEqual(args[2], mdtol)
         self.assertIs(result, mock.sentinel.result)
 
     def test_default(self):
@@ -88,6 +92,79 @@ class Test(tests.IrisTest):
     def test_specified_mdtol(self):
         self.check_mdtol(0.5)
 
+    def test_weights_calculated_once(self):
+        src_grid, target_grid = self.grids()
+        with mock.patch('iris.experimental.regrid.'
+                        '_regrid_area_weighted_rectilinear_src_and_grid'
+                        '__prepare',
+                        return_value=mock.sentinel.info) as prepare:
+            regridder = AreaWeightedRegridder(src_grid, target_grid)
+        with mock.patch('iris.experimental.regrid.'
+                        '_regrid_area_weighted_rectilinear_src_and_grid'
+                        '__perform') as perform:
+            regridder(src_grid)
+            regridder(src_grid)
+        self.assertEqual(prepare.call_count, 1)
+        self.assertEqual(perform.call_count, 2)
+
+    def test_result(self):
+        # Check hand-calculated results, for masked data with extra
+        # dimensions, on a flat grid where each weight is simply the area of
+        # overlap of a source cell and a target cell.
+        def make_cube(x_bounds, y_bounds, data):
+            cube = Cube(data)
+            for dim, (name, bounds) in enumerate(
+                    [('projection_y_coordinate', y_bounds),
+                     ('projection_x_coordinate', x_bounds)]):
+                bounds = np.array(bounds, dtype=np.float64)
+                coord = DimCoord(bounds.mean(axis=1), name, units='m',
+                                 bounds=bounds)
+                cube.add_dim_coord(coord, dim)
+            return cube
+
+        # Source cells 1 wide and 2 high, with the second point masked.
+        data = np.ma.masked_equal([[1., 2., 3.], [4., 5., 6.]], 2.)
+        src_grid = make_cube([[0, 1], [1, 2], [2, 3]], [[0, 2], [2, 4]],
+                             data)
+        target_grid = make_cube([[0.5, 1.5], [1.5, 3]], [[0, 3], [3, 4]],
+                                np.zeros((2, 2)))
+        src = iris.cube.CubeList()
+        for height in range(2):
+            cube = src_grid.copy(data + 10 * height)
+            cube.add_aux_coord(DimCoord(height, 'height', units='m'))
+            src.append(cube)
+        src = src.merge_cube()
+
+        # The weighted means of the unmasked points in each target cell,
+        # in which the masked point has 1/3 and 2/9 of the weight of the top
+        # two cells.
+        means = np.array([[(1 * 1 + 0.5 * 4 + 0.5 * 5) / 2,
+                           (2 * 3 + 0.5 * 5 + 1 * 6) / 3.5],
+                          [(0.5 * 4 + 0.5 * 5) / 1,
+                           (0.5 * 5 + 1 * 6) / 1.5]])
+        for mdtol, mask in [(0, [[True, True], [False, False]]),
+                            (0.25, [[True, False], [False, False]]),
+                            (1, [[False, False], [False, False]])]:
+            regridder = AreaWeightedRegridder(src_grid, target_grid,
+                                              mdtol=mdtol)
+            result = regridder(src)
+            self.assertEqual(result.shape, (2, 2, 2))
+            for height in range(2):
+                expected = np.ma.masked_array(means + 10 * height, mask=mask)
+                self.assertMaskedArrayAlmostEqual(result.data[height],
+                                                  expected)
+
+    def test_lazy(self):
+        src_grid = self.cube(np.linspace(20, 30, 3), np.linspace(10, 25, 4))
+        target_grid = self.cube(np.linspace(21, 29, 5),
+                                np.linspace(12, 23, 6))
+        regridder = AreaWeightedRegridder(src_grid, target_grid)
+        expected = regridder(src_grid)
+        src = src_grid.copy(as_lazy_data(src_grid.data, chunks=(2, 2)))
+        result = regridder(src)
+        self.assertTrue(result.has_lazy_data())
+        self.assertArrayAlmostEqual(result.data, expected.data)
+
     def test_invalid_high_mdtol(self):
         src, target = self.grids()
         msg = 'mdtol must be in range 0 - 1'
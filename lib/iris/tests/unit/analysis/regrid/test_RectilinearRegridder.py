@@ -26,11 +26,12 @@ import iris.tests as tests
 import numpy as np
 import numpy.ma as ma
 
+from iris._lazy_data import as_lazy_data
 from iris.analysis._regrid import RectilinearRegridder as Regridder
 from iris.aux_factory import HybridHeightFactory
 from iris.coord_systems import GeogCS, OSGB
 from iris.coords import AuxCoord, DimCoord
-from iris.cube import Cube
+from iris.cube import Cube, CubeList
 from iris.tests import mock
 from iris.tests.stock import global_pp, lat_lon_cube, realistic_4d
 
@@ -1375,5 +1376,60 @@ class Test___call____circular(tests.IrisTest):
             self.assertCMLApproxData(result, cml)
 
 
+class Test___call____lazy(tests.IrisTest):
+    def setUp(self):
+        cubes = CubeList()
+        for height in range(3):
+            cube = lat_lon_cube()
+            cube.data = cube.data * (height + 1)
+            cube.add_aux_coord(DimCoord(height, 'height', units='m'))
+            cubes.append(cube)
+        self.src = cubes.merge_cube()
+        self.grid = lat_lon_cube()
+        for coord in self.grid.dim_coords:
+            coord.points = coord.points + 0.5
+
+    def test_lazy_result(self):
+        for method in ('linear', 'nearest'):
+            regridder = Regridder(self.src, self.grid, method, 'mask')
+            expected = regridder(self.src)
+            src = self.src.copy(as_lazy_data(self.src.data,
+                                             chunks=(1, 2, 2)))
+            result = regridder(src)
+            self.assertTrue(result.has_lazy_data())
+            self.assertEqual(result.lazy_data().chunks,
+                             ((1, 1, 1), (3,), (4,)))
+            self.assertEqual(result.dtype, expected.dtype)
+            self.assertMaskedArrayEqual(result.data, expected.data)
+
+
+class Test___call____weights(tests.IrisTest):
+    def setUp(self):
+        self.src = lat_lon_cube()
+        self.grid = lat_lon_cube()
+        for coord in self.grid.dim_coords:
+            coord.points = coord.points + 0.5
+
+    def test_calculated_once(self):
+        regridder = Regridder(self.src, self.grid, 'linear', 'mask')
+        with mock.patch.object(Regridder, '_sample_grid',
+                               wraps=Regridder._sample_grid) as sample_grid, \
+                mock.patch.object(Regridder, '_regrid_weights',
+                                  wraps=Regridder._regrid_weights) as weights:
+            regridder(self.src)
+            regridder(self.src.copy(self.src.data * 2))
+        self.assertEqual(sample_grid.call_count, 1)
+        self.assertEqual(weights.call_count, 1)
+
+    def test_result(self):
+        for method in ('linear', 'nearest'):
+            src = self.src.copy(self.src.data * 2)
+            regridder = Regridder(self.src, self.grid, method, 'mask')
+            regridder(self.src)
+            result = regridder(src)
+            expected = Regridder(src, self.grid, method, 'mask')(src)
+            self.assertMaskedArrayEqual(result.data, expected.data)
+
+
 if __name__ == '__main__':
     tests.main()
@@ -0,0 +1,73 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Unit tests for :meth:`iris.analysis.trajectory._gather_points`.
+
+"""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import numpy as np
+import numpy.ma as ma
+
+from iris._lazy_data import as_lazy_data, is_lazy_data
+from iris.analysis.trajectory import _gather_points
+
+
+class Test(tests.IrisTest):
+    def setUp(self):
+        self.data = np.arange(2 * 5 * 6, dtype=np.int16).reshape((2, 5, 6))
+        # Points in several chunks, out of order and repeated.
+        self.point_indices = [np.array([4, 0, 1, 4, 2, 0]),
+                              np.array([5, 0, 3, 5, 1, 4])]
+        self.expected = self.data[:, self.point_indices[0],
+                                  self.point_indices[1]]
+
+    def test_real(self):
+        result = _gather_points(self.data, self.point_indices)
+        self.assertFalse(is_lazy_data(result))
+        self.assertEqual(result.dtype, np.int16)
+        self.assertArrayEqual(result, self.expected)
+
+    def test_lazy(self):
+        data = as_lazy_data(self.data, chunks=(1, 2, 3))
+        result = _gather_points(data, self.point_indices)
+        self.assertTrue(is_lazy_data(result))
+        self.assertEqual(result.dtype, np.int16)
+        self.assertArrayEqual(result.compute(), self.expected)
+
+    def test_lazy_one_point_dim(self):
+        data = as_lazy_data(self.data, chunks=(1, 2, 3))
+        result = _gather_points(data, [np.array([5, 0, 4, 1])])
+        self.assertArrayEqual(result.compute(), self.data[..., [5, 0, 4, 1]])
+
+    def test_lazy_masked(self):
+        data = ma.masked_equal(self.data, 35)
+        lazy_data = as_lazy_data(data, chunks=(1, 2, 3))
+        result = _gather_points(lazy_data, self.point_indices)
+        expected = data[:, self.point_indices[0], self.point_indices[1]]
+        self.assertMaskedArrayEqual(result.compute(), expected)
+        self.assertTrue(ma.is_masked(expected))
+
+
+if __name__ == "__main__":
+    tests.main()
@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2016, Met Office
+# (C) British Crown Copyright 2016 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -31,7 +31,10 @@ import numpy as np
 
 from iris.cube import Cube
 from iris.coords import DimCoord, AuxCoord
+from iris.tests import mock
 
+import iris.analysis.trajectory
+import iris.config
 from iris.analysis.trajectory import \
     _nearest_neighbour_indices_ndcoords as nn_ndinds
 
@@ -223,5 +226,92 @@ class TestLatlon(tests.IrisTest):
             expect=1)
 
 
+class TestMultidimensional(tests.IrisTest):
+    def setUp(self):
+        lats = AuxCoord([[10.0, 10.5, 11.0], [20.0, 20.5, 21.0]],
+                        standard_name='latitude', units='degrees')
+        lons = AuxCoord([[1.0, 12.0, 23.0], [2.0, 13.0, 24.0]],
+                        standard_name='longitude', units='degrees')
+        self.cube = Cube(np.zeros((4, 2, 3)))
+        self.cube.add_dim_coord(DimCoord(np.arange(4), long_name='z'), 0)
+        self.cube.add_aux_coord(lats, (1, 2))
+        self.cube.add_aux_coord(lons, (1, 2))
+        self.sample_points = [('longitude', [12.2, 23.5, 1.5]),
+                              ('latitude', [10.4, 21.1, 19.8])]
+
+    def test_2d_coords(self):
+        result = nn_ndinds(self.cube, self.sample_points, cache={})
+        self.assertEqual(result, [(slice(None), 0, 1),
+                                  (slice(None), 1, 2),
+                                  (slice(None), 1, 0)])
+
+    def test_transposed_coords(self):
+        cube = self.cube.copy()
+        cube.transpose((0, 2, 1))
+        result = nn_ndinds(cube, self.sample_points, cache={})
+        self.assertEqual(result, [(slice(None), 1, 0),
+                                  (slice(None), 2, 1),
+                                  (slice(None), 0, 1)])
+
+
+class TestCache(tests.IrisTest):
+    def setUp(self):
+        self.cube = Cube(np.zeros((2, 3)))
+        self.cube.add_dim_coord(DimCoord([10.0, 20.0], long_name='y'), 0)
+        self.cube.add_dim_coord(DimCoord([1.0, 2.0, 3.0], long_name='x'), 1)
+        self.sample_points = [('x', 2.8), ('y', 18.5)]
+        patch = mock.patch('iris.analysis.trajectory.cKDTree',
+                           wraps=iris.analysis.trajectory.cKDTree)
+        self.kdtree = patch.start()
+        self.addCleanup(patch.stop)
+        patch = mock.patch('iris.analysis.trajectory._KDTREES',
+                           iris.analysis.trajectory._KDTreeCache(2))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_same_grid(self):
+        nn_ndinds(self.cube, self.sample_points)
+        result = nn_ndinds(self.cube.copy(np.ones((2, 3))),
+                           self.sample_points)
+        self.assertEqual(result, [(1, 2)])
+        self.assertEqual(self.kdtree.call_count, 1)
+
+    def test_different_grid(self):
+        nn_ndinds(self.cube, self.sample_points)
+        cube = self.cube.copy()
+        cube.coord('x').points = [1.0, 2.0, 2.5]
+        result = nn_ndinds(cube, self.sample_points)
+        self.assertEqual(result, [(1, 2)])
+        self.assertEqual(self.kdtree.call_count, 2)
+
+    def test_given_cache(self):
+        cache = {}
+        nn_ndinds(self.cube, self.sample_points, cache=cache)
+        self.assertEqual(len(cache), 1)
+        nn_ndinds(self.cube, self.sample_points, cache=cache)
+        self.assertEqual(self.kdtree.call_count, 1)
+
+    def test_least_recently_used(self):
+        cache = iris.analysis.trajectory._KDTreeCache(2)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache.get('a')
+        cache['c'] = 3
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_configured_size(self):
+        cache = iris.analysis.trajectory._KDTreeCache()
+        cache['a'] = 1
+        with iris.config.trajectory.context(kdtree_cache_size=1):
+            cache['b'] = 2
+            self.assertIsNone(cache.get('a'))
+            self.assertEqual(cache.get('b'), 2)
+        with iris.config.trajectory.context(kdtree_cache_size=0):
+            cache.get('c')
+        self.assertEqual(len(cache._trees), 0)
+
+
 if __name__ == "__main__":
     tests.main()
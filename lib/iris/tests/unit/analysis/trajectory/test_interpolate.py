@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2016, Met Office
+# (C) British Crown Copyright 2016 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -27,7 +27,9 @@ from six.moves import (filter, input, map, range, zip)  # noqa
 import iris.tests as tests
 
 import numpy as np
+import numpy.ma as ma
 
+from iris._lazy_data import as_lazy_data
 from iris.coords import AuxCoord, DimCoord
 import iris.tests.stock
 
@@ -180,6 +182,27 @@ class TestNearest(tests.IrisTest):
         expected = cube[:, self.single_point_iy, self.single_point_ix]
         self.assertEqual(result, expected)
 
+    def test_dtype_and_mask(self):
+        # Check the result keeps the source dtype and mask.
+        cube = self.test_cube
+        data = ma.masked_less(cube.data.astype(np.int16), 5)
+        cube.data = data
+        sample_points = [('longitude', [-180, -90, 0, 90]),
+                         ('latitude', [0, 0, 0, 0])]
+        result = interpolate(cube, sample_points, method='nearest')
+        self.assertEqual(result.dtype, np.int16)
+        self.assertMaskedArrayEqual(result.data, data[:, 1, :])
+
+    def test_lazy(self):
+        # Check the result of lazy source data is lazy, and correct.
+        cube = self.test_cube
+        expected = interpolate(cube, self.single_sample_point,
+                               method='nearest')
+        cube.data = as_lazy_data(cube.data, chunks=(1, 2, 2))
+        result = interpolate(cube, self.single_sample_point, method='nearest')
+        self.assertTrue(result.has_lazy_data())
+        self.assertEqual(result, expected)
+
 
 if __name__ == "__main__":
     tests.main()
@@ -97,5 +97,26 @@ class Test__coordinate_dim_metadata_equality(tests.IrisTest):
         self.assertEqual(circular.dim_metadata, circular.dim_metadata)
 
 
+class Test_digest(tests.IrisTest):
+    def setUp(self):
+        cube = Cube(np.arange(3, dtype=np.float32),
+                    standard_name='air_temperature', units='K')
+        cube.add_dim_coord(DimCoord(np.arange(3), standard_name='time'), 0)
+        cube.add_aux_coord(AuxCoord(850, long_name='pressure'))
+        self.cube = cube
+
+    def test_concatenatable(self):
+        other = self.cube.copy()
+        other.coord('time').points = [3, 4, 5]
+        self.assertEqual(CubeSignature(self.cube).digest(),
+                         CubeSignature(other).digest())
+
+    def test_scalar_coord_value(self):
+        other = self.cube.copy()
+        other.coord('pressure').points = [500]
+        self.assertNotEqual(CubeSignature(self.cube).digest(),
+                            CubeSignature(other).digest())
+
+
 if __name__ == '__main__':
     tests.main()
@@ -283,6 +283,32 @@ class TestOrder(tests.IrisTest):
         self.assertEqual(result1, result2)
 
 
+class TestMany(tests.IrisTest):
+    def _make_cube(self, start, pressure):
+        cube = iris.cube.Cube(np.arange(2) + start,
+                              standard_name='air_temperature', units='K')
+        time = iris.coords.DimCoord([start, start + 1], 'time')
+        cube.add_dim_coord(time, 0)
+        cube.add_aux_coord(iris.coords.AuxCoord(pressure, long_name='p'))
+        return cube
+
+    def test_shuffled(self):
+        starts = np.random.RandomState(0).permutation(np.arange(0, 100, 2))
+        cubes = [self._make_cube(start, pressure)
+                 for start in starts for pressure in (500, 850)]
+        result = concatenate(cubes)
+        self.assertEqual(len(result), 2)
+        for cube, pressure in zip(result, (500, 850)):
+            self.assertArrayEqual(cube.coord('p').points, [pressure])
+            self.assertArrayEqual(cube.coord('time').points, np.arange(100))
+            self.assertArrayEqual(cube.data, np.arange(100))
+
+    def test_overlap(self):
+        cubes = [self._make_cube(start, 500) for start in (0, 4, 2, 3)]
+        result = concatenate(cubes)
+        self.assertEqual(len(result), 2)
+
+
 class TestConcatenate__dask(tests.IrisTest):
     def build_lazy_cube(self, points, bounds=None, nx=4):
         data = np.arange(len(points) * nx).reshape(len(points), nx)
@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2017, Met Office
+# (C) British Crown Copyright 2017 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -40,6 +40,26 @@ class Test(tests.IrisTest):
         self.options.conventions_override = True
         self.assertTrue(self.options.conventions_override)
 
+    def test_dataset_pool_size(self):
+        self.assertEqual(self.options.dataset_pool_size, 16)
+        self.options.dataset_pool_size = 4
+        self.assertEqual(self.options.dataset_pool_size, 4)
+
+    def test_load_rules(self):
+        self.assertEqual(self.options.load_rules, 'dispatch')
+        self.options.load_rules = 'pyke'
+        self.assertEqual(self.options.load_rules, 'pyke')
+
+    def test_write_queue_size(self):
+        self.assertEqual(self.options.write_queue_size, 8)
+        self.options.write_queue_size = 0
+        self.assertEqual(self.options.write_queue_size, 0)
+
+    def test_chunk_bytes(self):
+        self.assertEqual(self.options.chunk_bytes, 2 ** 27)
+        self.options.chunk_bytes = 0
+        self.assertEqual(self.options.chunk_bytes, 0)
+
     def test_bad_value(self):
         # A bad value should be ignored and replaced with the default value.
         bad_value = 'wibble'
@@ -0,0 +1,55 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for the `iris.config.PP` class."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import iris.config
+
+
+class Test(tests.IrisTest):
+    def setUp(self):
+        self.options = iris.config.PP()
+
+    def test_basic(self):
+        self.assertFalse(self.options.index_files)
+        self.assertIsNone(self.options.index_dir)
+        self.assertFalse(self.options.mmap)
+        self.assertEqual(self.options.decode_workers, 0)
+
+    def test_repr(self):
+        self.assertEqual(repr(self.options)[:12], 'PP options: ')
+
+    def test_bad_name(self):
+        with self.assertRaisesRegexp(AttributeError, 'for PP configuration'):
+            self.options.wibble = True
+
+    def test__contextmgr(self):
+        with self.options.context(index_files=True, index_dir='/tmp'):
+            self.assertTrue(self.options.index_files)
+            self.assertEqual(self.options.index_dir, '/tmp')
+        self.assertFalse(self.options.index_files)
+        self.assertIsNone(self.options.index_dir)
+
+
+if __name__ == '__main__':
+    tests.main()
@@ -0,0 +1,46 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for the `iris.config.Trajectory` class."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import iris.config
+
+
+class Test(tests.IrisTest):
+    def setUp(self):
+        self.options = iris.config.Trajectory()
+
+    def test_basic(self):
+        self.assertEqual(self.options.kdtree_cache_size, 4)
+
+    def test_repr(self):
+        self.assertEqual(repr(self.options)[:20], 'Trajectory options: ')
+
+    def test__contextmgr(self):
+        with self.options.context(kdtree_cache_size=0):
+            self.assertEqual(self.options.kdtree_cache_size, 0)
+        self.assertEqual(self.options.kdtree_cache_size, 4)
+
+
+if __name__ == '__main__':
+    tests.main()
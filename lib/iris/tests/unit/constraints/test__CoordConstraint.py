@@ -0,0 +1,157 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for the `iris._constraints._CoordConstraint` class."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+from cf_units import Unit
+import numpy as np
+
+from iris._constraints import _CoordConstraint, _MAX_VECTORISED_CALLS
+from iris.coords import AuxCoord, Cell, DimCoord
+from iris.cube import Cube
+from iris.tests import mock
+from iris.time import PartialDateTime
+
+
+class Test_extract(tests.IrisTest):
+    def setUp(self):
+        self.cube = Cube(np.zeros(10))
+        self.coord = DimCoord(np.arange(10.), long_name='x')
+        self.cube.add_dim_coord(self.coord, 0)
+        patcher = mock.patch('iris.coords.Coord.cells')
+        self.cells = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _extract(self, coord_thing):
+        constraint = _CoordConstraint('x', coord_thing)
+        return np.flatnonzero(constraint.extract(self.cube)[0])
+
+    def assertVectorised(self):
+        # The constraint did not visit each cell in turn.
+        self.assertEqual(self.cells.call_count, 0)
+
+    def test_chained_comparison(self):
+        result = self._extract(lambda cell: 2 <= cell < 5)
+        self.assertArrayEqual(result, [2, 3, 4])
+        self.assertVectorised()
+
+    def test_boolean_operators(self):
+        result = self._extract(lambda cell: cell < 2 or cell >= 8)
+        self.assertArrayEqual(result, [0, 1, 8, 9])
+        self.assertVectorised()
+
+    def test_bitwise_operators(self):
+        result = self._extract(lambda cell: (cell > 2) & ~(cell == 4))
+        self.assertArrayEqual(result, [3, 5, 6, 7, 8, 9])
+        self.assertVectorised()
+
+    def test_value_list(self):
+        result = self._extract([1, 3.0, 11])
+        self.assertArrayEqual(result, [1, 3])
+        self.assertVectorised()
+
+    def test_bounded_cells(self):
+        self.coord.guess_bounds()
+        result = self._extract(lambda cell: cell > 3.5)
+        # Bounded cells only exceed a value when they lie wholly beyond it.
+        self.assertArrayEqual(result, [5, 6, 7, 8, 9])
+        self.assertVectorised()
+
+    def test_bounded_value_list(self):
+        self.coord.guess_bounds()
+        result = self._extract([1.5, 7.2])
+        self.assertArrayEqual(result, [1, 2, 7])
+        self.assertVectorised()
+
+    def test_partial_datetimes(self):
+        self.coord.units = Unit('days since 2000-01-30', calendar='360_day')
+        result = self._extract(
+            lambda cell: PartialDateTime(month=2, day=3) <= cell <
+            PartialDateTime(month=2, day=6, hour=12))
+        self.assertArrayEqual(result, [3, 4, 5, 6])
+        self.assertVectorised()
+
+    def test_string_points(self):
+        self.cube.remove_coord('x')
+        self.cube.add_aux_coord(AuxCoord(list('abcdeabcde'), long_name='x'),
+                                0)
+        result = self._extract(lambda cell: cell == 'b' or cell == 'd')
+        self.assertArrayEqual(result, [1, 3, 6, 8])
+        self.assertVectorised()
+
+
+class Test_extract__fallback(tests.IrisTest):
+    def setUp(self):
+        self.cube = Cube(np.zeros(10))
+        coord = DimCoord(np.arange(10.), long_name='x')
+        self.cube.add_dim_coord(coord, 0)
+
+    def test_cell_attributes(self):
+        constraint = _CoordConstraint('x', lambda cell: cell.point % 3 == 0)
+        result = np.flatnonzero(constraint.extract(self.cube)[0])
+        self.assertArrayEqual(result, [0, 3, 6, 9])
+
+    def test_plain_boolean_result(self):
+        # A result which is not derived from comparing the cells says
+        # nothing about the cells, so each one is visited in turn.
+        constraint = _CoordConstraint(
+            'x', lambda cell: isinstance(cell, Cell) and cell.point > 6)
+        result = np.flatnonzero(constraint.extract(self.cube)[0])
+        self.assertArrayEqual(result, [7, 8, 9])
+
+    def test_plain_boolean_operand(self):
+        constraint = _CoordConstraint(
+            'x', lambda cell: (cell > 6) & isinstance(cell, Cell))
+        result = np.flatnonzero(constraint.extract(self.cube)[0])
+        self.assertArrayEqual(result, [7, 8, 9])
+
+    def test_exception_handling_function(self):
+        def func(cell):
+            try:
+                return cell > 'a'
+            except Exception:
+                return cell.point > 6
+
+        constraint = _CoordConstraint('x', func)
+        result = np.flatnonzero(constraint.extract(self.cube)[0])
+        self.assertArrayEqual(result, [7, 8, 9])
+
+    def test_limited_calls(self):
+        func = mock.Mock(side_effect=lambda cell: (cell == 1 or cell == 2 or
+                                                   cell == 3 or cell == 4 or
+                                                   cell == 5))
+        constraint = _CoordConstraint('x', func)
+        result = np.flatnonzero(constraint.extract(self.cube)[0])
+        self.assertArrayEqual(result, [1, 2, 3, 4, 5])
+        # Abandoned after a few calls, then called once per cell.
+        self.assertEqual(func.call_count, _MAX_VECTORISED_CALLS + 10)
+
+    def test_unsupported_comparison(self):
+        constraint = _CoordConstraint('x', lambda cell: cell > 'a')
+        msg = 'Unexpected type of other'
+        with self.assertRaisesRegexp(TypeError, msg):
+            constraint.extract(self.cube)
+
+
+if __name__ == '__main__':
+    tests.main()
@@ -0,0 +1,147 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Unit tests for the shared date decoding used by the calendar categorisation
+functions of :mod:`iris.coord_categorisation`.
+
+"""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+import six
+
+# import iris tests first so that some things can be initialised before
+# importing anything else
+import iris.tests as tests
+
+from cf_units import Unit
+import numpy as np
+
+import iris.coord_categorisation as ccat
+from iris.coords import AuxCoord
+from iris.cube import Cube
+from iris.tests import mock
+
+
+class Test(tests.IrisTest):
+    def setUp(self):
+        points = np.arange(0, 24 * 400, 6, dtype=np.float64).reshape(-1, 4)
+        self.cube = Cube(np.zeros(points.shape))
+        self.coord = AuxCoord(points, standard_name='time',
+                              units=Unit('hours since 1999-12-01',
+                                         calendar='360_day'))
+        self.cube.add_aux_coord(self.coord, (0, 1))
+
+    def _patch_num2date(self):
+        return mock.patch('cf_units.Unit.num2date', autospec=True,
+                          side_effect=Unit.num2date)
+
+    def test_single_conversion(self):
+        with self._patch_num2date() as num2date:
+            ccat.add_year(self.cube, 'time')
+            ccat.add_month(self.cube, 'time')
+            ccat.add_season(self.cube, 'time')
+            ccat.add_season_year(self.cube, 'time')
+        self.assertEqual(num2date.call_count, 1)
+
+    def test_changed_points(self):
+        ccat.add_year(self.cube, 'time')
+        self.coord.points = self.coord.points + 24 * 360
+        with self._patch_num2date() as num2date:
+            ccat.add_month_number(self.cube, 'time')
+        self.assertEqual(num2date.call_count, 1)
+        ccat.add_year(self.cube, 'time', name='new_year')
+        self.assertArrayEqual(self.cube.coord('new_year').points,
+                              self.cube.coord('year').points + 1)
+
+    def test_points_changed_in_place(self):
+        ccat.add_year(self.cube, 'time')
+        self.coord.points[:] += 24 * 360
+        with self._patch_num2date() as num2date:
+            ccat.add_year(self.cube, 'time', name='new_year')
+        self.assertEqual(num2date.call_count, 1)
+        self.assertArrayEqual(self.cube.coord('new_year').points,
+                              self.cube.coord('year').points + 1)
+
+    def test_changed_units(self):
+        ccat.add_day_of_month(self.cube, 'time')
+        self.coord.units = Unit('days since 1999-12-01', calendar='360_day')
+        ccat.add_day_of_month(self.cube, 'time', name='new_day')
+        self.assertArrayEqual(self.cube.coord('new_day').points[0],
+                              [1, 7, 13, 19])
+
+    def test_values(self):
+        ccat.add_year(self.cube, 'time')
+        ccat.add_month(self.cube, 'time')
+        ccat.add_day_of_month(self.cube, 'time')
+        ccat.add_hour(self.cube, 'time')
+        ccat.add_season(self.cube, 'time')
+        ccat.add_season_year(self.cube, 'time')
+        ccat.add_season_membership(self.cube, 'time', 'djf')
+        # The last point is 1999-12-01 plus 399 days and 18 hours,
+        # i.e. 2001-01-10T18:00 in a 360-day calendar.
+        index = (-1, -1)
+        self.assertEqual(self.cube.coord('year').points[index], 2001)
+        self.assertEqual(self.cube.coord('month').points[index], 'Jan')
+        self.assertEqual(self.cube.coord('day_of_month').points[index], 10)
+        self.assertEqual(self.cube.coord('hour').points[index], 18)
+        self.assertEqual(self.cube.coord('season').points[index], 'djf')
+        self.assertEqual(self.cube.coord('season_year').points[index], 2001)
+        self.assertTrue(
+            self.cube.coord('season_membership').points[index])
+        self.assertEqual(self.cube.coord('season_year').points[0, 0], 2000)
+        self.assertEqual(self.cube.coord('month').points.dtype.kind,
+                         'S' if six.PY2 else 'U')
+
+
+class Test_calendars(tests.IrisTest):
+    def check(self, calendar, origin='1581-12-25 06:00'):
+        units = Unit('hours since {}'.format(origin), calendar=calendar)
+        coord = AuxCoord(np.arange(-5000, 20000, 7.5), units=units)
+        fields = ccat._DateFields(coord)
+        dates = units.num2date(coord.points)
+        for name, getter in [('year', lambda date: date.year),
+                             ('month', lambda date: date.month),
+                             ('day', lambda date: date.day),
+                             ('hour', lambda date: date.hour),
+                             ('day_of_year', lambda date: date.timetuple()[7]),
+                             ('weekday', lambda date: date.timetuple()[6])]:
+            expected = [getter(date) for date in dates]
+            self.assertArrayEqual(fields[name], expected)
+
+    def test_gregorian(self):
+        # Spans the change from the Julian calendar in October 1582.
+        self.check('gregorian')
+
+    def test_proleptic_gregorian(self):
+        self.check('proleptic_gregorian', origin='2000-02-20')
+
+    def test_julian(self):
+        self.check('julian')
+
+    def test_365_day(self):
+        self.check('365_day')
+
+    def test_366_day(self):
+        self.check('366_day')
+
+    def test_360_day(self):
+        self.check('360_day')
+
+
+if __name__ == '__main__':
+    tests.main()
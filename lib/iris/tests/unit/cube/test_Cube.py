@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2013 - 2018, Met Office
+# (C) British Crown Copyright 2013 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -548,6 +548,77 @@ class Test_aggregated_by(tests.IrisTest):
         self.assertEqual(result.coord('bar'),
                          AuxCoord(['a|a', 'a'], long_name='bar'))
 
+    def test_grouped_reductions(self):
+        # The vectorised group reductions match aggregating each group.
+        for aggregator, kwargs in [(iris.analysis.SUM, {}),
+                                   (iris.analysis.MEAN, {}),
+                                   (iris.analysis.MIN, {}),
+                                   (iris.analysis.MAX, {}),
+                                   (iris.analysis.COUNT,
+                                    {'function': lambda x: x % 3 == 0})]:
+            res_cube = self.cube.aggregated_by('val', aggregator, **kwargs)
+            for i, group in enumerate([[0, 1, 2, 6, 7, 9], [3, 4, 10],
+                                       [5, 8]]):
+                expected = aggregator.aggregate(self.cube.data[:, group],
+                                                axis=1, **kwargs)
+                self.assertArrayEqual(res_cube.data[:, i], expected)
+
+    def test_masked_mdtol(self):
+        cube = self.cube.copy(ma.masked_less(self.cube.data, 5))
+        res_cube = cube.aggregated_by('val', MEAN, mdtol=0.5)
+        expected = ma.masked_array([[22 / 3, 10., 6.5]],
+                                   mask=[[False, True, False]])
+        self.assertMaskedArrayAlmostEqual(res_cube.data[:1], expected)
+
+    def test_mean_dtype(self):
+        # The mean has the dtype of numpy.ma.average of each group.
+        data = self.cube.data.astype(np.float32)
+        for data in [data, ma.masked_array(data),
+                     ma.masked_less(data, 5)]:
+            res_cube = self.cube.copy(data).aggregated_by('val', MEAN)
+            expected = MEAN.aggregate(data[:, [3, 4, 10]], axis=1)
+            self.assertEqual(res_cube.dtype, expected.dtype)
+
+
+class Test_aggregated_by__lazy(tests.IrisTest):
+    def setUp(self):
+        data = np.arange(44, dtype=np.float32).reshape(4, 11)
+        self.cube = Cube(as_lazy_data(data, chunks=(4, 4)))
+        val_coord = AuxCoord([0, 0, 0, 1, 1, 2, 0, 0, 2, 0, 1],
+                             long_name='val')
+        self.cube.add_aux_coord(val_coord, 1)
+        self.real_cube = self.cube.copy(data)
+
+    def test_grouped_reduction(self):
+        res_cube = self.cube.aggregated_by('val', MEAN)
+        self.assertTrue(res_cube.has_lazy_data())
+        self.assertTrue(self.cube.has_lazy_data())
+        expected = self.real_cube.aggregated_by('val', MEAN)
+        self.assertArrayAlmostEqual(res_cube.data, expected.data)
+
+    def test_mean_dtype(self):
+        res_cube = self.cube.aggregated_by('val', MEAN)
+        self.assertEqual(res_cube.dtype, np.float32)
+        self.assertEqual(res_cube.data.dtype, np.float32)
+        masked_cube = self.cube.copy(
+            as_lazy_data(ma.masked_less(self.real_cube.data, 5),
+                         chunks=(4, 4)))
+        res_cube = masked_cube.aggregated_by('val', MEAN)
+        self.assertEqual(res_cube.dtype, np.float32)
+        self.assertEqual(res_cube.data.dtype, np.float32)
+
+    def test_lazy_aggregator(self):
+        res_cube = self.cube.aggregated_by('val', iris.analysis.STD_DEV)
+        self.assertTrue(res_cube.has_lazy_data())
+        expected = self.real_cube.aggregated_by('val', iris.analysis.STD_DEV)
+        self.assertArrayAlmostEqual(res_cube.data, expected.data)
+
+    def test_non_lazy_aggregator(self):
+        res_cube = self.cube.aggregated_by('val', iris.analysis.MEDIAN)
+        self.assertFalse(res_cube.has_lazy_data())
+        expected = self.real_cube.aggregated_by('val', iris.analysis.MEDIAN)
+        self.assertArrayEqual(res_cube.data, expected.data)
+
 
 class Test_rolling_window(tests.IrisTest):
     def setUp(self):
@@ -591,6 +662,40 @@ class Test_rolling_window(tests.IrisTest):
         self.assertMaskedArrayEqual(expected_result, res_cube.data)
 
 
+class Test_rolling_window__lazy(tests.IrisTest):
+    def setUp(self):
+        data = np.arange(24, dtype=np.float32).reshape(8, 3) ** 2
+        # Chunks smaller than the window require data from several chunks.
+        self.cube = Cube(as_lazy_data(data, chunks=(2, 3)))
+        self.cube.add_dim_coord(DimCoord(np.arange(8), long_name='val'), 0)
+        self.real_cube = self.cube.copy(data)
+
+    def _check(self, aggregator, window, **kwargs):
+        res_cube = self.cube.rolling_window('val', aggregator, window,
+                                            **kwargs)
+        self.assertTrue(res_cube.has_lazy_data())
+        self.assertTrue(self.cube.has_lazy_data())
+        expected = self.real_cube.rolling_window('val', aggregator, window,
+                                                 **kwargs)
+        self.assertEqual(res_cube.coord('val'), expected.coord('val'))
+        self.assertArrayAllClose(res_cube.data, expected.data)
+
+    def test_mean(self):
+        self._check(iris.analysis.MEAN, 3)
+
+    def test_weighted_sum(self):
+        self._check(iris.analysis.SUM, 4, weights=np.array([1, 2, 2, 1]))
+
+    def test_non_lazy_aggregator(self):
+        self._check(iris.analysis.MEDIAN, 5)
+
+    def test_multiple_percentiles_realised(self):
+        res_cube = self.cube.rolling_window('val', iris.analysis.PERCENTILE,
+                                            3, percent=[25, 75])
+        self.assertFalse(res_cube.has_lazy_data())
+        self.assertEqual(res_cube.shape, (2, 6, 3))
+
+
 class Test_slices_dim_order(tests.IrisTest):
     '''
     This class tests the capability of iris.cube.Cube.slices(), including its
@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2014 - 2018, Met Office
+# (C) British Crown Copyright 2014 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -148,6 +148,15 @@ class Test_merge_cube(tests.IrisTest):
         with self.assertRaises(iris.exceptions.MergeError):
             CubeList([self.cube1, self.cube1]).merge_cube()
 
+    def test_array_attribute(self):
+        # An array attribute can equal a value of another type.
+        self.cube1.attributes['weights'] = np.array([1])
+        cube2 = self.cube1.copy()
+        cube2.attributes['weights'] = 1
+        cube2.coord("height").points = [1]
+        result = CubeList([self.cube1, cube2]).merge_cube()
+        self.assertEqual(result.shape, (2, 3))
+
 
 class Test_merge__time_triple(tests.IrisTest):
     @staticmethod
@@ -303,5 +303,47 @@ class Test_build_cf_groups__formula_terms(tests.IrisTest):
             self.assertEqual(warn.call_count, 2)
 
 
+class Test_build_cf_groups__names(tests.IrisTest):
+    def setUp(self):
+        self.lat = netcdf_variable('lat', 'lat', np.float, bounds='lat_bnds')
+        self.lat_bnds = netcdf_variable('lat_bnds', 'lat bnds', np.float)
+        self.temp = netcdf_variable('temp', 'lat', np.float,
+                                    standard_name='air_temperature')
+        self.precip = netcdf_variable('precip', 'lat', np.float)
+        self.variables = dict(lat=self.lat, lat_bnds=self.lat_bnds,
+                              temp=self.temp, precip=self.precip)
+        ncattrs = mock.Mock(return_value=[])
+        self.dataset = mock.Mock(file_format='NetCDF4',
+                                 variables=self.variables,
+                                 ncattrs=ncattrs)
+        patcher = mock.patch('iris.fileformats.cf.CFReader._reset')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_standard_name(self):
+        with mock.patch('netCDF4.Dataset', return_value=self.dataset):
+            cf_group = CFReader('dummy', names=['air_temperature']).cf_group
+        self.assertEqual(set(cf_group.data_variables), {'temp', 'precip'})
+        self.assertIsNone(cf_group['precip'].cf_group)
+        temp_cf_group = cf_group['temp'].cf_group
+        self.assertEqual(list(temp_cf_group.coordinates), ['lat'])
+        # The groups of the referenced variables are built too.
+        self.assertEqual(list(cf_group['lat'].cf_group.bounds), ['lat_bnds'])
+
+    def test_variable_name(self):
+        with mock.patch('netCDF4.Dataset', return_value=self.dataset):
+            cf_group = CFReader('dummy', names=['precip']).cf_group
+        self.assertIsNone(cf_group['temp'].cf_group)
+        self.assertIsNotNone(cf_group['precip'].cf_group)
+
+    def test_referenced_name(self):
+        # A name which is not of a data variable needs all the groups, in
+        # case the variable is promoted.
+        with mock.patch('netCDF4.Dataset', return_value=self.dataset):
+            cf_group = CFReader('dummy', names=['lat']).cf_group
+        self.assertIsNotNone(cf_group['temp'].cf_group)
+        self.assertIsNotNone(cf_group['precip'].cf_group)
+
+
 if __name__ == '__main__':
     tests.main()
@@ -0,0 +1,141 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Unit tests for the `iris.fileformats._nc_load_rules.Translator` class.
+
+"""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+from iris.cube import Cube
+from iris.fileformats._nc_load_rules import Translator
+from iris.tests import mock
+
+
+_TESTS = ['is_latitude', 'is_longitude', 'is_projection_x_coordinate',
+          'is_projection_y_coordinate', 'is_time', 'is_time_period',
+          'is_rotated_latitude', 'is_rotated_longitude']
+
+
+class Test_activate(tests.IrisTest):
+    def setUp(self):
+        # Mock the fc_rules_cf.krb helpers, with every test failing.
+        self.helpers = mock.Mock()
+        for name in _TESTS:
+            setattr(self.helpers, name, mock.Mock(return_value=False))
+        self.helpers.is_grid_mapping.return_value = False
+        patch = mock.patch('iris.fileformats._nc_load_rules._helpers',
+                           return_value=self.helpers)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        self.cf_group = mock.MagicMock(coordinates={'lat': mock.sentinel.lat,
+                                                    'x': mock.sentinel.x},
+                                       grid_mappings={'gm': mock.sentinel.gm})
+        self.translator = Translator()
+        self.translator.cf_var = mock.Mock(spec=['cf_group'],
+                                           cf_group=self.cf_group)
+        self.translator.cube = Cube(0)
+
+    def _passes(self, test, *cf_names):
+        getattr(self.helpers, test).side_effect = \
+            lambda engine, cf_name: cf_name in cf_names
+
+    def _dim_coord_calls(self):
+        return self.helpers.build_dimension_coordinate.call_args_list
+
+    def test_metadata(self):
+        self.translator.activate('fc_rules_cf')
+        self.helpers.build_cube_metadata.assert_called_once_with(
+            self.translator)
+        self.assertEqual(self.translator.rule_triggered, {'fc_default'})
+
+    def test_latitude_longitude(self):
+        self._passes('is_latitude', 'lat')
+        self.helpers.is_grid_mapping.side_effect = \
+            lambda engine, cf_name, name: name == 'latitude_longitude'
+        cs = self.helpers.build_coordinate_system.return_value
+        self.translator.add_case_specific_fact('facts_cf', 'grid_mapping',
+                                               ('gm',))
+        self.translator.add_case_specific_fact('facts_cf', 'coordinate',
+                                               ('lat',))
+        self.translator.activate('fc_rules_cf')
+        self.helpers.build_coordinate_system.assert_called_once_with(
+            mock.sentinel.gm)
+        self.assertEqual(self.translator.provides['coordinate_system'], cs)
+        self.assertEqual(self._dim_coord_calls(),
+                         [mock.call(self.translator, mock.sentinel.lat,
+                                    coord_name='latitude', coord_system=cs)])
+
+    def test_latitude_no_coord_system(self):
+        self._passes('is_latitude', 'lat')
+        self.translator.add_case_specific_fact('facts_cf', 'coordinate',
+                                               ('lat',))
+        self.translator.activate('fc_rules_cf')
+        self.assertEqual(self._dim_coord_calls(),
+                         [mock.call(self.translator, mock.sentinel.lat,
+                                    coord_name='latitude',
+                                    coord_system=None)])
+        self.assertIn('fc_build_coordinate_latitude_nocs',
+                      self.translator.rule_triggered)
+
+    def test_miscellaneous_coordinate(self):
+        self.translator.add_case_specific_fact('facts_cf', 'coordinate',
+                                               ('x',))
+        self.translator.activate('fc_rules_cf')
+        self.assertEqual(self._dim_coord_calls(),
+                         [mock.call(self.translator, mock.sentinel.x)])
+
+    def test_projection_x_no_coord_system(self):
+        # As for the pyke rules, a projection coordinate needs a projected
+        # coordinate system.
+        self._passes('is_projection_x_coordinate', 'x')
+        self.translator.add_case_specific_fact('facts_cf', 'coordinate',
+                                               ('x',))
+        self.translator.activate('fc_rules_cf')
+        self.assertEqual(self._dim_coord_calls(), [])
+
+    def test_formula_terms(self):
+        root = mock.Mock(standard_name='atmosphere_hybrid_height_coordinate')
+        self.cf_group.__getitem__.return_value = root
+        self.translator.add_case_specific_fact('facts_cf', 'formula_root',
+                                               ('lev',))
+        for cf_name, term in [('a', 'a'), ('b', 'b'), ('orog', 'orog')]:
+            self.translator.add_case_specific_fact(
+                'facts_cf', 'formula_term', (cf_name, 'lev', term))
+        self.translator.activate('fc_rules_cf')
+        self.assertEqual(self.translator.requires,
+                         {'formula_type':
+                          'atmosphere_hybrid_height_coordinate',
+                          'formula_terms': {'a': 'a', 'b': 'b',
+                                            'orog': 'orog'}})
+
+    def test_reset(self):
+        self.translator.add_case_specific_fact('facts_cf', 'coordinate',
+                                               ('x',))
+        self.translator.reset()
+        self.translator.activate('fc_rules_cf')
+        self.assertEqual(self._dim_coord_calls(), [])
+
+
+if __name__ == '__main__':
+    tests.main()
@@ -473,6 +473,62 @@ class Test_write_fill_value(tests.IrisTest):
                 pass
 
 
+class Test_write__compute(tests.IrisTest):
+    def _make_cube(self, name, data):
+        lat = DimCoord(np.arange(3), 'latitude', units='degrees')
+        lon = DimCoord(np.arange(4), 'longitude', units='degrees')
+        return Cube(as_lazy_data(data), long_name=name, units='K',
+                    dim_coords_and_dims=[(lat, 0), (lon, 1)])
+
+    def test_single_store(self):
+        # Test that the lazy data of all the cubes is stored together.
+        cubes = [self._make_cube(name, np.arange(12.).reshape(3, 4))
+                 for name in ('first', 'second')]
+        with self.temp_filename('.nc') as nc_path:
+            with mock.patch('dask.array.store') as store:
+                with Saver(nc_path, 'NETCDF4', compute=False) as saver:
+                    for cube in cubes:
+                        saver.write(cube)
+                    self.assertEqual(store.call_count, 0)
+        self.assertEqual(store.call_count, 1)
+        sources, targets = store.call_args[0]
+        self.assertEqual(len(sources), 2)
+        self.assertEqual(len(targets), 2)
+
+    def test_data(self):
+        data = np.arange(12.).reshape(3, 4)
+        cubes = [self._make_cube('first', data),
+                 self._make_cube('second', data + 1)]
+        with self.temp_filename('.nc') as nc_path:
+            with Saver(nc_path, 'NETCDF4', compute=False) as saver:
+                for cube in cubes:
+                    saver.write(cube)
+            ds = nc.Dataset(nc_path)
+            self.assertArrayEqual(ds.variables['first'][:], data)
+            self.assertArrayEqual(ds.variables['second'][:], data + 1)
+            ds.close()
+
+    def test_data__no_write_queue(self):
+        data = np.arange(12.).reshape(3, 4)
+        cube = self._make_cube('first', data)
+        with self.temp_filename('.nc') as nc_path:
+            with iris.config.netcdf.context(write_queue_size=0):
+                with Saver(nc_path, 'NETCDF4', compute=False) as saver:
+                    saver.write(cube)
+            ds = nc.Dataset(nc_path)
+            self.assertArrayEqual(ds.variables['first'][:], data)
+            ds.close()
+
+    def test_contains_fill_value(self):
+        # Test that the fill value checks are made by the single store.
+        cube = self._make_cube('first', np.arange(12.).reshape(3, 4))
+        with self.temp_filename('.nc') as nc_path:
+            with self.assertWarnsRegexp(
+                    'contains unmasked data points equal to the fill-value'):
+                with Saver(nc_path, 'NETCDF4', compute=False) as saver:
+                    saver.write(cube, fill_value=1)
+
+
 class Test_cf_valid_var_name(tests.IrisTest):
     def test_no_replacement(self):
         self.assertEqual(Saver.cf_valid_var_name('valid_Nam3'),
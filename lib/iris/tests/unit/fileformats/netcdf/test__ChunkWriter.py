@@ -0,0 +1,79 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for the `iris.fileformats.netcdf._ChunkWriter` class."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import threading
+
+import numpy as np
+
+from iris.fileformats.netcdf import _ChunkWriter
+
+
+class _Target(object):
+    # Records the chunks written, and the threads which wrote them.
+    def __init__(self, error=None):
+        self.chunks = []
+        self.threads = set()
+        self.error = error
+
+    def __setitem__(self, keys, arr):
+        if self.error is not None:
+            raise self.error
+        self.chunks.append((keys, arr))
+        self.threads.add(threading.current_thread())
+
+
+class Test(tests.IrisTest):
+    def test_writes(self):
+        target = _Target()
+        writer = _ChunkWriter(2)
+        chunks = [(slice(i, i + 1), np.arange(i)) for i in range(10)]
+        for keys, arr in chunks:
+            writer.put(target, keys, arr)
+        writer.close()
+        self.assertEqual([keys for keys, _ in target.chunks],
+                         [keys for keys, _ in chunks])
+        self.assertEqual(len(target.threads), 1)
+        self.assertNotIn(threading.current_thread(), target.threads)
+
+    def test_error(self):
+        target = _Target(error=IOError('write failed'))
+        writer = _ChunkWriter(2)
+        writer.put(target, slice(0, 1), np.arange(1))
+        with self.assertRaisesRegexp(IOError, 'write failed'):
+            writer.close()
+
+    def test_error_stops_put(self):
+        target = _Target(error=IOError('write failed'))
+        writer = _ChunkWriter(2)
+        writer.put(target, slice(0, 1), np.arange(1))
+        # Wait for the failed write to be made.
+        writer._queue.put(None)
+        writer._thread.join()
+        with self.assertRaisesRegexp(IOError, 'write failed'):
+            writer.put(target, slice(1, 2), np.arange(1))
+
+
+if __name__ == '__main__':
+    tests.main()
@@ -0,0 +1,138 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for the `iris.fileformats.netcdf._DatasetPool` class."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import os
+import shutil
+import tempfile
+
+import netCDF4
+import numpy as np
+
+import iris.config
+from iris.fileformats.netcdf import _DatasetPool
+from iris.tests import mock
+
+
+class Test_read(tests.IrisTest):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.paths = [self._make_file(i) for i in range(3)]
+        self.pool = _DatasetPool()
+
+    def tearDown(self):
+        self.pool.clear()
+        shutil.rmtree(self.tmpdir)
+
+    def _make_file(self, offset):
+        path = '{}/test_{}.nc'.format(self.tmpdir, offset)
+        dataset = netCDF4.Dataset(path, 'w')
+        try:
+            dataset.createDimension('x', 4)
+            var = dataset.createVariable('var', 'i4', ('x',))
+            var[:] = np.arange(4) + offset
+        finally:
+            dataset.close()
+        return path
+
+    def test_values(self):
+        result = self.pool.read(self.paths[1], 'var', slice(1, 3))
+        self.assertArrayEqual(result, [2, 3])
+
+    def test_reuses_dataset(self):
+        with mock.patch('netCDF4.Dataset', wraps=netCDF4.Dataset) as opener:
+            self.pool.read(self.paths[0], 'var', slice(None))
+            self.pool.read(self.paths[0], 'var', slice(0, 1))
+        self.assertEqual(opener.call_count, 1)
+        self.assertEqual(len(self.pool), 1)
+
+    def test_evicts_least_recently_used(self):
+        with iris.config.netcdf.context(dataset_pool_size=2):
+            self.pool.read(self.paths[0], 'var', 0)
+            self.pool.read(self.paths[1], 'var', 0)
+            self.pool.read(self.paths[0], 'var', 0)
+            dataset = self.pool._entries[self.paths[1]].dataset
+            self.pool.read(self.paths[2], 'var', 0)
+        self.assertEqual(list(self.pool._entries),
+                         [self.paths[0], self.paths[2]])
+        self.assertFalse(dataset.isopen())
+
+    def test_relative_path(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmpdir)
+        try:
+            self.pool.read(os.path.basename(self.paths[0]), 'var', 0)
+        finally:
+            os.chdir(cwd)
+        self.pool.read(self.paths[0], 'var', 0)
+        self.assertEqual(list(self.pool._entries), [self.paths[0]])
+
+    def test_evicts_outside_pool_lock(self):
+        def close(entries):
+            # The pool must not be locked while waiting on a busy dataset.
+            self.assertFalse(self.pool._lock.locked())
+            close_entries(entries)
+
+        close_entries = self.pool._close_entries
+        with iris.config.netcdf.context(dataset_pool_size=1):
+            self.pool.read(self.paths[0], 'var', 0)
+            with mock.patch.object(self.pool, '_close_entries',
+                                   side_effect=close) as closer:
+                self.pool.read(self.paths[1], 'var', 0)
+        self.assertEqual(closer.call_count, 1)
+
+    def test_pool_disabled(self):
+        with iris.config.netcdf.context(dataset_pool_size=0):
+            result = self.pool.read(self.paths[2], 'var', slice(None))
+        self.assertArrayEqual(result, [2, 3, 4, 5])
+        self.assertEqual(len(self.pool), 0)
+
+    def test_file_changed(self):
+        self.pool.read(self.paths[0], 'var', 0)
+        dataset = self.pool._entries[self.paths[0]].dataset
+        self.pool._entries[self.paths[0]].fingerprint = None
+        result = self.pool.read(self.paths[0], 'var', 0)
+        self.assertEqual(result, 0)
+        self.assertFalse(dataset.isopen())
+
+    def test_forked(self):
+        self.pool.read(self.paths[0], 'var', 0)
+        dataset = self.pool._entries[self.paths[0]].dataset
+        self.pool._pid = -1
+        self.pool.read(self.paths[1], 'var', 0)
+        self.assertEqual(list(self.pool._entries), [self.paths[1]])
+        # Datasets inherited from a parent process are left alone.
+        self.assertTrue(dataset.isopen())
+        dataset.close()
+
+
+class Test_discard(tests.IrisTest):
+    def test_unknown_path(self):
+        pool = _DatasetPool()
+        pool.discard('/no/such/file.nc')
+        self.assertEqual(len(pool), 0)
+
+
+if __name__ == '__main__':
+    tests.main()
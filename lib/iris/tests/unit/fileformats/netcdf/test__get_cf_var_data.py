@@ -27,6 +27,7 @@ from dask.array import Array as dask_array
 import numpy as np
 
 from iris._lazy_data import _limited_shape
+import iris.config
 import iris.fileformats.cf
 from iris.fileformats.netcdf import _get_cf_var_data
 from iris.tests import mock
@@ -55,10 +56,37 @@ class Test__get_cf_var_data(tests.IrisTest):
         self.assertIsInstance(lazy_data, dask_array)
 
     def test_cf_data_chunks(self):
+        # The storage chunks are grouped into chunks of the target size.
         chunks = [1, 12, 100]
         cf_var = self._make(chunks)
         lazy_data = _get_cf_var_data(cf_var, self.filename)
         lazy_data_chunks = [c[0] for c in lazy_data.chunks]
+        self.assertArrayEqual(lazy_data_chunks, self.shape)
+
+    def test_cf_data_chunks__chunk_bytes(self):
+        # The leading dimensions grow first, by whole storage chunks.
+        chunks = [1, 12, 100]
+        cf_var = self._make(chunks)
+        with iris.config.netcdf.context(chunk_bytes=3 * 48 * 100 * 4):
+            lazy_data = _get_cf_var_data(cf_var, self.filename)
+        lazy_data_chunks = [c[0] for c in lazy_data.chunks]
+        self.assertArrayEqual(lazy_data_chunks, [3, 48, 100])
+
+    def test_cf_data_chunks__storage_chunks(self):
+        chunks = [1, 12, 100]
+        cf_var = self._make(chunks)
+        with iris.config.netcdf.context(chunk_bytes=0):
+            lazy_data = _get_cf_var_data(cf_var, self.filename)
+        lazy_data_chunks = [c[0] for c in lazy_data.chunks]
+        self.assertArrayEqual(chunks, lazy_data_chunks)
+
+    def test_cf_data_chunks__large_storage_chunks(self):
+        # Storage chunks larger than the target size are not split.
+        chunks = [1, 240, 200]
+        cf_var = self._make(chunks)
+        with iris.config.netcdf.context(chunk_bytes=1000):
+            lazy_data = _get_cf_var_data(cf_var, self.filename)
+        lazy_data_chunks = [c[0] for c in lazy_data.chunks]
         self.assertArrayEqual(chunks, lazy_data_chunks)
 
     def test_cf_data_no_chunks(self):
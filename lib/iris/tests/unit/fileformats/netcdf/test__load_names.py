@@ -0,0 +1,57 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for the `iris.fileformats.netcdf._load_names` function."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import iris
+from iris.fileformats.netcdf import _load_names
+
+
+class Test(tests.IrisTest):
+    def test_name(self):
+        self.assertEqual(_load_names('air_temperature'), {'air_temperature'})
+
+    def test_names(self):
+        constraints = ['air_temperature', iris.Constraint('precipitation')]
+        self.assertEqual(_load_names(constraints),
+                         {'air_temperature', 'precipitation'})
+
+    def test_unnamed(self):
+        constraints = ['air_temperature', iris.Constraint(height=10)]
+        self.assertIsNone(_load_names(constraints))
+
+    def test_none(self):
+        self.assertIsNone(_load_names(None))
+
+    def test_combination(self):
+        constraint = (iris.Constraint(height=10) &
+                      iris.Constraint('air_temperature'))
+        self.assertEqual(_load_names(constraint), {'air_temperature'})
+
+    def test_attribute(self):
+        constraint = iris.AttributeConstraint(STASH='m01s00i024')
+        self.assertIsNone(_load_names(constraint))
+
+
+if __name__ == '__main__':
+    tests.main()
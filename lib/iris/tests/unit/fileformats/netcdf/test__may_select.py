@@ -0,0 +1,87 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for the `iris.fileformats.netcdf._may_select` function."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import iris
+from iris.fileformats.netcdf import _may_select
+from iris.tests import mock
+
+
+class Test(tests.IrisTest):
+    def setUp(self):
+        attributes = {'standard_name': 'air_temperature',
+                      'source': 'model'}
+        cf_data = mock.Mock(ncattrs=mock.Mock(return_value=list(attributes)),
+                            getncattr=attributes.get)
+        self.cf_var = mock.Mock(cf_name='temp', cf_data=cf_data)
+        self.cf = mock.Mock()
+        self.cf.cf_group.global_attributes = {'institution': 'Met Office'}
+
+    def _may_select(self, constraint):
+        return _may_select(constraint, self.cf, self.cf_var)
+
+    def test_no_constraint(self):
+        self.assertTrue(self._may_select(iris.Constraint()))
+
+    def test_standard_name(self):
+        self.assertTrue(self._may_select(iris.Constraint('air_temperature')))
+
+    def test_variable_name(self):
+        self.assertTrue(self._may_select(iris.Constraint('temp')))
+
+    def test_other_name(self):
+        self.assertFalse(self._may_select(iris.Constraint('precipitation')))
+
+    def test_attribute(self):
+        constraint = iris.AttributeConstraint(source='model')
+        self.assertTrue(self._may_select(constraint))
+
+    def test_attribute_mismatch(self):
+        constraint = iris.AttributeConstraint(source='observations')
+        self.assertFalse(self._may_select(constraint))
+
+    def test_global_attribute(self):
+        constraint = iris.AttributeConstraint(institution='Met Office')
+        self.assertTrue(self._may_select(constraint))
+
+    def test_missing_attribute(self):
+        constraint = iris.AttributeConstraint(experiment='historical')
+        self.assertFalse(self._may_select(constraint))
+
+    def test_callable_attribute(self):
+        constraint = iris.AttributeConstraint(source=lambda value: False)
+        self.assertTrue(self._may_select(constraint))
+
+    def test_derived_attribute(self):
+        constraint = iris.AttributeConstraint(STASH='m01s00i024')
+        self.assertTrue(self._may_select(constraint))
+
+    def test_combination(self):
+        constraint = (iris.Constraint('air_temperature') &
+                      iris.AttributeConstraint(source='observations'))
+        self.assertFalse(self._may_select(constraint))
+
+
+if __name__ == '__main__':
+    tests.main()
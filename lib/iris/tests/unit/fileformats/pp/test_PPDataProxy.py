@@ -23,6 +23,9 @@ from six.moves import (filter, input, map, range, zip)  # noqa
 # importing anything else.
 import iris.tests as tests
 
+import numpy as np
+
+import iris.config
 from iris.fileformats.pp import PPDataProxy, SplittableInt
 from iris.tests import mock
 
@@ -48,5 +51,47 @@ class Test_lbpack(tests.IrisTest):
         self.assertEqual(proxy.lbpack.n4, lbpack // 1000 % 10)
 
 
+class Test___getitem__mmap(tests.IrisTest):
+    def getitem(self, dtype, lbpack=0, keys=(slice(None), 1)):
+        self.values = np.arange(12, dtype=dtype).reshape(3, 4)
+        self.values[2, 3] = -99
+        with self.temp_filename() as path:
+            with open(path, 'wb') as fh:
+                fh.write(b'header')
+                fh.write(self.values.tobytes())
+            proxy = PPDataProxy((3, 4), self.values.dtype, path, 6,
+                                self.values.nbytes, lbpack, None, -99, None)
+            with iris.config.pp.context(mmap=True):
+                result = proxy[keys]
+        return result
+
+    def test_native(self):
+        result = self.getitem('=f4')
+        self.assertArrayEqual(result, self.values[:, 1])
+        self.assertEqual(result.dtype, np.dtype('f4'))
+
+    def test_big_endian(self):
+        result = self.getitem('>f4')
+        self.assertArrayEqual(result, self.values[:, 1])
+        self.assertTrue(result.dtype.isnative)
+
+    def test_writeable(self):
+        result = self.getitem('=f4', keys=(slice(None), slice(None)))
+        result[0, 0] = 100
+        self.assertEqual(result[0, 0], 100)
+
+    def test_masked(self):
+        result = self.getitem('=i4', keys=(2,))
+        self.assertMaskedArrayEqual(
+            result, np.ma.masked_equal(self.values[2], -99))
+
+    def test_packed_not_mapped(self):
+        lbpack = 1
+        proxy = PPDataProxy((3, 4), np.dtype('>f4'), 'mocked', 0,
+                            48, lbpack, None, -99, None)
+        with iris.config.pp.context(mmap=True):
+            self.assertIsNone(proxy._mapped_data())
+
+
 if __name__ == '__main__':
     tests.main()
@@ -0,0 +1,77 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for the `iris.fileformats.pp._DecodePool` class."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import iris.config
+from iris.fileformats.pp import _DecodePool, SplittableInt
+from iris.tests import mock
+
+
+def _job(value, n1):
+    lbpack = SplittableInt(n1, dict(n1=0))
+    return (value, lbpack, None, (1, 1), None, None, None)
+
+
+class Test_decode(tests.IrisTest):
+    def setUp(self):
+        self.pool = _DecodePool()
+        patch = mock.patch('iris.fileformats.pp._data_bytes_to_shaped_array',
+                           side_effect=lambda data_bytes, *args: data_bytes)
+        self.decoder = patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_order(self):
+        jobs = [_job(1, 1), _job(2, 0), _job(3, 4), _job(4, 1)]
+        with iris.config.pp.context(decode_workers=3):
+            result = self.pool.decode(jobs)
+        self.assertEqual(result, [1, 2, 3, 4])
+        self.assertEqual(self.pool._size, 3)
+
+    def test_serial(self):
+        jobs = [_job(1, 1), _job(2, 1)]
+        with iris.config.pp.context(decode_workers=1):
+            result = self.pool.decode(jobs)
+        self.assertEqual(result, [1, 2])
+        self.assertIsNone(self.pool._pool)
+
+    def test_unpacked_not_pooled(self):
+        jobs = [_job(1, 0), _job(2, 2)]
+        with iris.config.pp.context(decode_workers=2):
+            result = self.pool.decode(jobs)
+        self.assertEqual(result, [1, 2])
+        self.assertIsNone(self.pool._pool)
+
+    def test_resize(self):
+        jobs = [_job(1, 1), _job(2, 1)]
+        with iris.config.pp.context(decode_workers=2):
+            self.pool.decode(jobs)
+        first = self.pool._pool
+        with iris.config.pp.context(decode_workers=3):
+            self.pool.decode(jobs)
+        self.assertIsNot(self.pool._pool, first)
+        self.assertEqual(self.pool._size, 3)
+
+
+if __name__ == '__main__':
+    tests.main()
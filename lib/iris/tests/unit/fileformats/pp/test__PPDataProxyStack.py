@@ -0,0 +1,104 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for the `iris.fileformats.pp._PPDataProxyStack` class."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import numpy as np
+
+from iris.fileformats.pp import (PPDataProxy, _PPDataProxyStack,
+                                 _read_byte_ranges)
+from iris.tests import mock
+
+
+class Test__read_byte_ranges(tests.IrisTest):
+    def setUp(self):
+        self.content = bytes(bytearray(range(256)))
+
+    def read(self, ranges):
+        with self.temp_filename() as path:
+            with open(path, 'wb') as fh:
+                fh.write(self.content)
+            return _read_byte_ranges(path, ranges)
+
+    def test_unordered(self):
+        ranges = [(100, 4), (0, 8), (50, 2)]
+        result = self.read(ranges)
+        expected = [self.content[offset:offset + length]
+                    for offset, length in ranges]
+        self.assertEqual(result, expected)
+
+    def test_coalesced(self):
+        ranges = [(0, 8), (12, 4), (200, 8)]
+        with mock.patch('iris.fileformats.pp._READ_GAP', 16):
+            with mock.patch('iris.fileformats.pp.open',
+                            mock.mock_open(read_data=self.content),
+                            create=True) as mock_open:
+                _read_byte_ranges('mocked', ranges)
+        self.assertEqual(mock_open.call_count, 1)
+        handle = mock_open()
+        self.assertEqual(handle.read.call_args_list,
+                         [mock.call(16), mock.call(8)])
+
+
+class Test(tests.IrisTest):
+    def setUp(self):
+        self.fields = np.arange(24, dtype='>f4').reshape(4, 2, 3)
+        self.field_bytes = self.fields[0].nbytes
+
+    def stack(self, path, stack_shape):
+        proxies = np.empty(stack_shape, dtype=object)
+        for i, nd_index in enumerate(np.ndindex(stack_shape)):
+            proxies[nd_index] = PPDataProxy(
+                (2, 3), np.dtype('>f4'), path, i * self.field_bytes,
+                self.field_bytes, 0, None, -1e30, None)
+        return proxies
+
+    def test_stackable(self):
+        proxies = self.stack('mocked', (4,))
+        self.assertTrue(_PPDataProxyStack.stackable(proxies))
+
+    def test_not_stackable(self):
+        proxies = self.stack('mocked', (4,))
+        proxies[2] = None
+        self.assertFalse(_PPDataProxyStack.stackable(proxies))
+
+    def test_not_stackable_shape(self):
+        proxies = self.stack('mocked', (4,))
+        proxies[2].shape = (3, 2)
+        self.assertFalse(_PPDataProxyStack.stackable(proxies))
+
+    def test_getitem(self):
+        with self.temp_filename() as path:
+            self.fields.tofile(path)
+            stack = _PPDataProxyStack(self.stack(path, (2, 2)))
+            self.assertEqual(stack.shape, (2, 2, 2, 3))
+            self.assertEqual(stack.dtype, np.dtype('f4'))
+            result = stack[:, 1:, :, 1:]
+            single = stack[1, 0]
+        expected = self.fields.reshape(2, 2, 2, 3)
+        self.assertArrayEqual(result, expected[:, 1:, :, 1:])
+        self.assertArrayEqual(single, expected[1, 0])
+
+
+if __name__ == '__main__':
+    tests.main()
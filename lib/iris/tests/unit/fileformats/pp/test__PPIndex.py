@@ -0,0 +1,132 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for the `iris.fileformats.pp._PPIndex` class."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+import iris.config
+import iris.fileformats.pp as pp
+from iris.tests import mock
+import iris.tests.stock as stock
+
+
+class Test(tests.IrisTest):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'test.pp')
+        cube = stock.realistic_3d()
+        cube.data = cube.data.astype(np.float32)
+        cube.attributes['STASH'] = pp.STASH(1, 0, 4)
+        fields = list(pp.as_fields(cube))
+        # Include some extra data in one of the fields.
+        fields[1].field_title = 'title'
+        fields[1].x = np.arange(fields[1].lbnpt, dtype=np.float32)
+        pp.save_fields(fields, self.filename)
+        self.index_path = os.path.join(self.temp_dir, '.test.pp.idx')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _load(self, **kwargs):
+        with iris.config.pp.context(index_files=True):
+            return list(pp._field_gen(self.filename, False, **kwargs))
+
+    def _check_fields(self, fields):
+        expected = list(pp._field_gen(self.filename, False))
+        self.assertEqual(len(fields), len(expected))
+        for field, expected_field in zip(fields, expected):
+            self.assertEqual(field._raw_header, expected_field._raw_header)
+            self.assertEqual(field.core_data(), expected_field.core_data())
+        self.assertEqual(fields[1].field_title, 'title')
+        self.assertArrayEqual(fields[1].x, np.arange(fields[1].lbnpt))
+
+    def test_write(self):
+        self.assertFalse(os.path.exists(self.index_path))
+        fields = self._load()
+        self.assertTrue(os.path.exists(self.index_path))
+        self._check_fields(fields)
+
+    def test_read(self):
+        self._load()
+        # The fields must be made without scanning the file.
+        with mock.patch('iris.fileformats.pp._FieldScanner',
+                        side_effect=AssertionError):
+            fields = self._load()
+        self._check_fields(fields)
+
+    def test_not_enabled(self):
+        list(pp._field_gen(self.filename, False))
+        self.assertFalse(os.path.exists(self.index_path))
+
+    def test_read_data(self):
+        with iris.config.pp.context(index_files=True):
+            list(pp._field_gen(self.filename, True))
+        self.assertFalse(os.path.exists(self.index_path))
+
+    def test_modified_file(self):
+        self._load()
+        stat = os.stat(self.filename)
+        os.utime(self.filename, (stat.st_atime, stat.st_mtime + 10))
+        self.assertIsNone(pp._PPIndex.read(self.filename))
+        with mock.patch('iris.fileformats.pp._FieldScanner',
+                        wraps=pp._FieldScanner) as scanner:
+            fields = self._load()
+        self.assertTrue(scanner.called)
+        self._check_fields(fields)
+        # The index has been updated for the modified file.
+        self.assertIsNotNone(pp._PPIndex.read(self.filename))
+
+    def test_different_endianness(self):
+        self._load()
+        self.assertIsNone(pp._PPIndex.read(self.filename, little_ended=True))
+
+    def test_corrupt_index(self):
+        with open(self.index_path, 'wb') as index_file:
+            index_file.write(b'junk')
+        fields = self._load()
+        self._check_fields(fields)
+        self.assertIsNotNone(pp._PPIndex.read(self.filename))
+
+    def test_index_dir(self):
+        index_dir = os.path.join(self.temp_dir, 'indices')
+        os.mkdir(index_dir)
+        with iris.config.pp.context(index_dir=index_dir):
+            self._load()
+            self.assertEqual(len(os.listdir(index_dir)), 1)
+            self.assertIsNotNone(pp._PPIndex.read(self.filename))
+        self.assertFalse(os.path.exists(self.index_path))
+
+    def test_unwritable_index(self):
+        missing_dir = os.path.join(self.temp_dir, 'missing')
+        with iris.config.pp.context(index_dir=missing_dir):
+            fields = self._load()
+        self._check_fields(fields)
+
+
+if __name__ == '__main__':
+    tests.main()
@@ -23,9 +23,11 @@ from six.moves import (filter, input, map, range, zip)  # noqa
 # importing anything else.
 import iris.tests as tests
 
+import numpy as np
+
 import iris
 from iris.fileformats.pp import _convert_constraints
-from iris.fileformats.pp import STASH
+from iris.fileformats.pp import NUM_LONG_HEADERS, STASH
 from iris.tests import mock
 
 
@@ -99,5 +101,30 @@ class Test_convert_constraints(tests.IrisTest):
         self.assertIsNone(pp_filter)
 
 
+class Test_convert_constraints__rows(tests.IrisTest):
+    def test_rows(self):
+        codes = ['m01s03i236', 'm01s00i004', 'm02s03i236', 'm01s00i033',
+                 'm01s00i030', 'm01s03i236']
+        longs = np.zeros((len(codes), NUM_LONG_HEADERS), dtype=np.int32)
+        for row, code in zip(longs, codes):
+            stash = STASH.from_msi(code)
+            row[41] = stash.lbuser3()
+            row[44] = stash.lbuser6()
+        call_func = mock.Mock(side_effect=lambda stash: stash.endswith('236'))
+        constraint = iris.AttributeConstraint(STASH=call_func)
+        pp_filter = _convert_constraints(constraint)
+        result = pp_filter.rows(longs)
+        # Land masks are kept, as well as the selected and allowed codes.
+        self.assertArrayEqual(result, [True, False, True, True, True, True])
+        # Each distinct code is only checked once.
+        self.assertEqual(call_func.call_count, 3)
+
+    def test_no_rows(self):
+        pp_filter = _convert_constraints(
+            iris.AttributeConstraint(STASH='m01s03i236'))
+        longs = np.zeros((0, NUM_LONG_HEADERS), dtype=np.int32)
+        self.assertArrayEqual(pp_filter.rows(longs), np.zeros(0, bool))
+
+
 if __name__ == "__main__":
     tests.main()
@@ -1,4 +1,4 @@
-# (C) British Crown Copyright 2013 - 2017, Met Office
+# (C) British Crown Copyright 2013 - 2019, Met Office
 #
 # This file is part of Iris.
 #
@@ -24,89 +24,112 @@ import six
 # importing anything else.
 import iris.tests as tests
 
-import contextlib
-import io
 import warnings
 
 import numpy as np
 
+import iris
 import iris.fileformats.pp as pp
 from iris.tests import mock
 
 
+def _field_record(lbrel=3, data=(), lblrec=None, lbuser1=1, stash=None):
+    # Return the bytes of a single big-endian PP field record.
+    data = np.asarray(data, dtype='>f4')
+    if lblrec is None:
+        lblrec = data.size
+    longs = np.zeros(pp.NUM_LONG_HEADERS, dtype='>i4')
+    longs[14] = lblrec
+    longs[21] = lbrel
+    longs[38] = lbuser1
+    if stash is not None:
+        longs[41] = stash.lbuser3()
+        longs[44] = stash.lbuser6()
+    floats = np.zeros(pp.NUM_FLOAT_HEADERS, dtype='>f4')
+    header_len = np.array([pp.NUM_LONG_HEADERS + pp.NUM_FLOAT_HEADERS],
+                          dtype='>i4') * pp.PP_WORD_DEPTH
+    data_len = np.array([data.size * pp.PP_WORD_DEPTH], dtype='>i4')
+    return b''.join(array.tobytes() for array in
+                    [header_len, longs, floats, header_len,
+                     data_len, data, data_len])
+
+
 class Test(tests.IrisTest):
-    @contextlib.contextmanager
-    def mock_for_field_gen(self, fields):
-        side_effect_fields = list(fields)[:]
-
-        def make_pp_field_override(*args):
-            # Iterates over the fields passed to this context manager,
-            # until there are no more, upon which the np.fromfile
-            # returns an empty list and the while loop in load() is
-            # broken.
-            result = side_effect_fields.pop(0)
-            if not side_effect_fields:
-                np.fromfile.return_value = []
-            return result
-
-        if six.PY3:
-            open_func = 'builtins.open'
-        else:
-            open_func = '__builtin__.open'
-        with mock.patch('numpy.fromfile', return_value=[0]), \
-                mock.patch(open_func), \
-                mock.patch('struct.unpack_from', return_value=[4]), \
-                mock.patch('iris.fileformats.pp.make_pp_field',
-                           side_effect=make_pp_field_override):
-            yield
-
-    def gen_fields(self, fields):
-        with self.mock_for_field_gen(fields):
-            return list(pp._field_gen('mocked', 'mocked'))
+    def gen_fields(self, records, read_data_bytes=False, **kwargs):
+        with self.temp_filename('.pp') as temp_path:
+            with open(temp_path, 'wb') as fh:
+                fh.write(b''.join(records))
+            fields = list(pp._field_gen(temp_path, read_data_bytes,
+                                        **kwargs))
+        return fields, temp_path
 
     def test_lblrec_invalid(self):
-        pp_field = mock.Mock(lblrec=2,
-                             lbext=0)
+        record = _field_record(data=[1], lblrec=2)
         with warnings.catch_warnings(record=True) as warn:
             warnings.simplefilter('always')
-            self.gen_fields([pp_field])
+            fields, _ = self.gen_fields([record])
+        self.assertEqual(fields, [])
         self.assertEqual(len(warn), 1)
         wmsg = ('LBLREC has a different value to the .* the header in the '
                 'file \(8 and 4\)\. Skipping .*')
         six.assertRegex(self, str(warn[0].message), wmsg)
 
-    def test_read_headers_call(self):
-        # Checks that the two calls to np.fromfile are called in the
-        # expected way.
-        pp_field = mock.Mock(lblrec=1,
-                             lbext=0,
-                             lbuser=[0])
-        with self.mock_for_field_gen([pp_field]):
-            open_fh = mock.MagicMock(spec=io.RawIOBase)
-            open.return_value = open_fh
-            next(pp._field_gen('mocked', read_data_bytes=False))
-            with open_fh as open_fh_ctx:
-                calls = [mock.call(open_fh_ctx, count=45, dtype='>i4'),
-                         mock.call(open_fh_ctx, count=19, dtype='>f4')]
-            np.fromfile.assert_has_calls(calls)
-        with open_fh as open_fh_ctx:
-            expected_deferred_bytes = ('mocked', open_fh_ctx.tell(),
-                                       4, np.dtype('>f4'))
-        self.assertEqual(pp_field.data, expected_deferred_bytes)
+    def test_deferred_bytes(self):
+        # Checks that the fields refer to their data payloads in the file.
+        records = [_field_record(data=[1]), _field_record(data=[2, 3])]
+        fields, temp_path = self.gen_fields(records)
+        self.assertEqual(len(fields), 2)
+        self.assertEqual(fields[0].data, (temp_path, 268, 4, np.dtype('>f4')))
+        self.assertEqual(fields[1].data, (temp_path, 544, 8, np.dtype('>f4')))
+        self.assertEqual(fields[1].lblrec, 2)
 
     def test_read_data_call(self):
         # Checks that data is read if read_data is True.
-        pp_field = mock.Mock(lblrec=1,
-                             lbext=0,
-                             lbuser=[0])
-        with self.mock_for_field_gen([pp_field]):
-            open_fh = mock.MagicMock(spec=io.RawIOBase)
-            open.return_value = open_fh
-            next(pp._field_gen('mocked', read_data_bytes=True))
-        with open_fh as open_fh_ctx:
-            expected_loaded_bytes = pp.LoadedArrayBytes(open_fh_ctx.read(),
-                                                        np.dtype('>f4'))
-        self.assertEqual(pp_field.data, expected_loaded_bytes)
+        records = [_field_record(data=[1]), _field_record(data=[2, 3])]
+        fields, _ = self.gen_fields(records, read_data_bytes=True)
+        expected = pp.LoadedArrayBytes(np.array([2, 3], '>f4').tobytes(),
+                                       np.dtype('>f4'))
+        self.assertEqual(fields[1].data, expected)
+
+    def test_field_classes(self):
+        records = [_field_record(lbrel=2), _field_record(lbrel=3)]
+        fields, _ = self.gen_fields(records)
+        self.assertIsInstance(fields[0], pp.PPField2)
+        self.assertIsInstance(fields[1], pp.PPField3)
+
+    def test_small_blocks(self):
+        # Checks that fields spanning the blocks read from the file are
+        # found, whether or not their data is read.
+        records = [_field_record(data=np.arange(n)) for n in range(1, 8)]
+        with mock.patch('iris.fileformats.pp._SCAN_BLOCK_SIZE', 600):
+            fields, _ = self.gen_fields(records, read_data_bytes=True)
+        self.assertEqual([field.lblrec for field in fields],
+                         list(range(1, 8)))
+        for n, field in enumerate(fields, start=1):
+            self.assertArrayEqual(np.frombuffer(field.data.bytes, '>f4'),
+                                  np.arange(n))
+
+    def test_pp_filter(self):
+        # Checks that fields are only made for the STASH codes that pass
+        # the filter, and any land mask.
+        codes = ['m01s00i004', 'm01s03i236', 'm01s00i030', 'm01s03i236']
+        records = [_field_record(stash=pp.STASH.from_msi(code))
+                   for code in codes]
+        constraint = iris.AttributeConstraint(STASH='m01s03i236')
+        pp_filter = pp._convert_constraints(constraint)
+        with mock.patch('iris.fileformats.pp.make_pp_field',
+                        wraps=pp.make_pp_field) as make_pp_field:
+            fields, _ = self.gen_fields(records, pp_filter=pp_filter)
+        self.assertEqual([str(field.stash) for field in fields], codes[1:])
+        self.assertEqual(make_pp_field.call_count, 3)
+
+    def test_incomplete_header(self):
+        record = _field_record(data=[1])
+        with mock.patch('warnings.warn') as warn:
+            fields, _ = self.gen_fields([record, record[:100]])
+        self.assertEqual(len(fields), 1)
+        self.assertEqual(warn.call_count, 1)
+        self.assertIn('Incomplete header', warn.call_args[0][0])
 
     def test_invalid_header_release(self):
         # Check that an unknown LBREL value just results in a warning
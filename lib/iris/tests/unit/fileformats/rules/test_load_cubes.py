@@ -0,0 +1,45 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for :func:`iris.fileformats.rules.load_cubes`."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import iris.config
+from iris.fileformats.rules import Loader, load_cubes
+from iris.tests import mock
+
+
+class Test(tests.IrisTest):
+    def test_filename_generator(self):
+        field_generator = mock.Mock(return_value=[])
+        loader = Loader(field_generator, {}, mock.sentinel.CONVERTER)
+        filenames = (filename for filename in ['a', 'b', 'c'])
+        with iris.config.load.context(workers=2):
+            result = list(load_cubes(filenames, None, loader))
+        self.assertEqual(result, [])
+        self.assertEqual(sorted(call[0][0] for call in
+                                field_generator.call_args_list),
+                         ['a', 'b', 'c'])
+
+
+if __name__ == '__main__':
+    tests.main()
@@ -0,0 +1,72 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for the `iris.io._imap_files` function."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import threading
+import time
+
+import iris.config
+from iris.io import _imap_files
+
+
+def _slow_upper(filename):
+    # Finish the files out of order.
+    time.sleep(0.01 * (3 - len(filename)))
+    return filename.upper(), threading.current_thread().name
+
+
+class Test(tests.IrisTest):
+    def setUp(self):
+        self.filenames = ['a', 'bb', 'ccc']
+
+    def test_serial(self):
+        result = list(_imap_files(_slow_upper, self.filenames))
+        self.assertEqual([name for name, _ in result], ['A', 'BB', 'CCC'])
+        self.assertEqual(set(thread for _, thread in result),
+                         {threading.current_thread().name})
+
+    def test_parallel(self):
+        with iris.config.load.context(workers=3):
+            result = list(_imap_files(_slow_upper, self.filenames))
+        self.assertEqual([name for name, _ in result], ['A', 'BB', 'CCC'])
+        self.assertNotIn(threading.current_thread().name,
+                         [thread for _, thread in result])
+
+    def test_bounded_read_ahead(self):
+        started = []
+
+        def function(filename):
+            started.append(filename)
+            return filename
+
+        with iris.config.load.context(workers=2):
+            results = _imap_files(function, list('abcdef'))
+            self.assertEqual(next(results), 'a')
+            # Only as many files as there are workers have been read.
+            self.assertLessEqual(set(started), {'a', 'b'})
+            self.assertEqual(list(results), list('bcdef'))
+
+
+if __name__ == '__main__':
+    tests.main()
@@ -0,0 +1,65 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Test function :func:`iris._lazy data.map_complete_blocks`."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import numpy as np
+
+from iris._lazy_data import as_lazy_data, is_lazy_data, map_complete_blocks
+from iris.cube import Cube
+
+
+def _sum_last(array):
+    # Reduces the last dimension to a length two dimension, which must
+    # be whole to give the right result.
+    total = array.sum(axis=-1, keepdims=True)
+    return np.concatenate([total, total * 2], axis=-1)
+
+
+class Test_map_complete_blocks(tests.IrisTest):
+    def setUp(self):
+        self.array = np.arange(24.).reshape(4, 6)
+        self.expected = _sum_last(self.array)
+
+    def test_real(self):
+        cube = Cube(self.array)
+        result = map_complete_blocks(cube, _sum_last, (1,), (2,))
+        self.assertFalse(is_lazy_data(result))
+        self.assertArrayEqual(result, self.expected)
+
+    def test_lazy(self):
+        cube = Cube(as_lazy_data(self.array, chunks=(2, 2)))
+        result = map_complete_blocks(cube, _sum_last, (1,), (2,))
+        self.assertTrue(is_lazy_data(result))
+        self.assertEqual(result.chunks, ((2, 2), (2,)))
+        self.assertArrayEqual(result.compute(), self.expected)
+
+    def test_dtype(self):
+        cube = Cube(as_lazy_data(self.array.astype(np.int32)))
+        result = map_complete_blocks(cube, _sum_last, (1,), (2,),
+                                     dtype=np.float32)
+        self.assertEqual(result.dtype, np.float32)
+
+
+if __name__ == '__main__':
+    tests.main()
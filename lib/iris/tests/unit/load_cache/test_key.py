@@ -0,0 +1,175 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for the `iris._load_cache.key` function."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+import iris
+import iris.config
+from iris._load_cache import key
+
+
+def _callback(cube, field, filename):
+    pass
+
+
+def _callback_factory(value):
+    def callback(cube, field, filename):
+        cube.attributes['value'] = value
+    return callback
+
+
+def _default_callback(cube, field, filename, value=1):
+    cube.attributes['value'] = value
+
+
+_VALUE = 1
+
+
+def _global_callback(cube, field, filename):
+    cube.attributes['value'] = _VALUE
+
+
+class Test(tests.IrisTest):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'data.pp')
+        with open(self.filename, 'wb') as fh:
+            fh.write(b'\0' * 8)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_same(self):
+        self.assertEqual(key(self.filename, None, None),
+                         key([self.filename], None, None))
+
+    def test_file_order(self):
+        other = os.path.join(self.temp_dir, 'other.pp')
+        with open(other, 'wb') as fh:
+            fh.write(b'\0' * 8)
+        self.assertNotEqual(key([self.filename, other], None, None),
+                            key([other, self.filename], None, None))
+
+    def test_changed_file(self):
+        before = key(self.filename, None, None)
+        with open(self.filename, 'ab') as fh:
+            fh.write(b'\0')
+        self.assertNotEqual(key(self.filename, None, None), before)
+
+    def test_constraints(self):
+        self.assertNotEqual(key(self.filename, 'air_temperature', None),
+                            key(self.filename, None, None))
+
+    def test_callback(self):
+        self.assertNotEqual(key(self.filename, None, _callback),
+                            key(self.filename, None, None))
+
+    def test_callback_closure(self):
+        self.assertEqual(key(self.filename, None, _callback_factory(1)),
+                         key(self.filename, None, _callback_factory(1)))
+        self.assertNotEqual(key(self.filename, None, _callback_factory(1)),
+                            key(self.filename, None, _callback_factory(2)))
+
+    def test_callback_defaults(self):
+        before = key(self.filename, None, _default_callback)
+        defaults = _default_callback.__defaults__
+        try:
+            _default_callback.__defaults__ = (2,)
+            after = key(self.filename, None, _default_callback)
+        finally:
+            _default_callback.__defaults__ = defaults
+        self.assertNotEqual(after, before)
+
+    def test_callback_globals(self):
+        global _VALUE
+        before = key(self.filename, None, _global_callback)
+        _VALUE = 2
+        try:
+            after = key(self.filename, None, _global_callback)
+        finally:
+            _VALUE = 1
+        self.assertNotEqual(after, before)
+
+    def test_callback_array(self):
+        points = np.arange(2000)
+        before = key(self.filename, None, _callback_factory(points))
+        points[1000] = -1
+        after = key(self.filename, None, _callback_factory(points))
+        self.assertIsNotNone(before)
+        self.assertNotEqual(after, before)
+
+    def test_unidentifiable_callback(self):
+        callback = _callback_factory(object())
+        self.assertIsNone(key(self.filename, None, callback))
+
+    def test_options(self):
+        before = key(self.filename, None, None)
+        with iris.config.netcdf.context(chunk_bytes=1024):
+            self.assertNotEqual(key(self.filename, None, None), before)
+        with iris.config.netcdf.context(load_rules='pyke'):
+            self.assertNotEqual(key(self.filename, None, None), before)
+        with iris.config.pp.context(mmap=True):
+            self.assertNotEqual(key(self.filename, None, None), before)
+        self.assertEqual(key(self.filename, None, None), before)
+
+    def test_function_constraint(self):
+        def constraint(value):
+            return iris.Constraint(cube_func=lambda cube: value)
+
+        self.assertEqual(key(self.filename, constraint(1), None),
+                         key(self.filename, constraint(1), None))
+        self.assertNotEqual(key(self.filename, constraint(1), None),
+                            key(self.filename, constraint(2), None))
+
+    def test_array_constraint(self):
+        # The arrays differ only in the part their repr leaves out.
+        points = np.arange(2000)
+        before = key(self.filename, iris.Constraint(x=points), None)
+        points[1000] = -1
+        after = key(self.filename, iris.Constraint(x=points), None)
+        self.assertIsNotNone(before)
+        self.assertNotEqual(after, before)
+
+    def test_unidentifiable_constraint(self):
+        constraint = iris.AttributeConstraint(source=object())
+        self.assertIsNone(key(self.filename, constraint, None))
+
+    def test_method_callback(self):
+        self.assertIsNone(key(self.filename, None, self.setUp))
+
+    def test_missing_file(self):
+        filename = os.path.join(self.temp_dir, 'missing.pp')
+        self.assertIsNone(key(filename, None, None))
+
+    def test_http(self):
+        self.assertIsNone(key('http://example.com/data.pp', None, None))
+
+
+if __name__ == '__main__':
+    tests.main()
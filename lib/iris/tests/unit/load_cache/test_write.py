@@ -0,0 +1,92 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for the `iris._load_cache.write` function."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import os
+import shutil
+import stat
+import tempfile
+
+import iris.config
+from iris._load_cache import read, write
+from iris.tests import mock
+
+
+class Test(tests.IrisTest):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_round_trip(self):
+        with iris.config.load.context(cache_dir=self.temp_dir):
+            write('abc', [1, 2])
+            self.assertEqual(read('abc'), [1, 2])
+
+    def test_miss(self):
+        with iris.config.load.context(cache_dir=self.temp_dir):
+            self.assertIsNone(read('abc'))
+
+    def test_unpicklable(self):
+        with iris.config.load.context(cache_dir=self.temp_dir):
+            write('abc', [lambda: None])
+            self.assertIsNone(read('abc'))
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_eviction(self):
+        with iris.config.load.context(cache_dir=self.temp_dir, cache_size=0):
+            write('abc', [1, 2])
+            self.assertIsNone(read('abc'))
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_private_directory(self):
+        cache_dir = os.path.join(self.temp_dir, 'cache')
+        with iris.config.load.context(cache_dir=cache_dir):
+            write('abc', [1, 2])
+        self.assertEqual(stat.S_IMODE(os.stat(cache_dir).st_mode) & 0o077, 0)
+
+    def test_foreign_directory(self):
+        with iris.config.load.context(cache_dir=self.temp_dir):
+            write('abc', [1, 2])
+            with mock.patch('os.getuid', return_value=os.getuid() + 1), \
+                    mock.patch('warnings.warn') as warn:
+                self.assertIsNone(read('abc'))
+                write('def', [1, 2])
+        self.assertEqual(os.listdir(self.temp_dir), ['abc.iris-load'])
+        self.assertEqual(warn.call_count, 2)
+
+    def test_foreign_file(self):
+        foreign = mock.Mock(st_uid=os.getuid() + 1)
+        with iris.config.load.context(cache_dir=self.temp_dir):
+            write('abc', [1, 2])
+            with mock.patch('os.fstat', return_value=foreign), \
+                    mock.patch('iris._load_cache.pickle.load') as load, \
+                    mock.patch('warnings.warn'):
+                self.assertIsNone(read('abc'))
+        self.assertEqual(load.call_count, 0)
+
+
+if __name__ == '__main__':
+    tests.main()
@@ -0,0 +1,79 @@
+# (C) British Crown Copyright 2019, Met Office
+#
+# This file is part of Iris.
+#
+# Iris is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Iris is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Iris.  If not, see <http://www.gnu.org/licenses/>.
+"""Unit tests for the `iris._merge._signature_digest` function."""
+
+from __future__ import (absolute_import, division, print_function)
+from six.moves import (filter, input, map, range, zip)  # noqa
+
+# Import iris.tests first so that some things can be initialised before
+# importing anything else.
+import iris.tests as tests
+
+import numpy as np
+
+from iris._merge import _signature_digest, _unhashable_attribute_keys
+from iris.coords import AuxCoord, DimCoord
+from iris.cube import Cube
+
+
+def _cube(height=1.5, **attributes):
+    cube = Cube(np.zeros(3, dtype='f4'), standard_name='air_temperature',
+                attributes=attributes)
+    cube.add_dim_coord(DimCoord([1, 2, 3], long_name='x'), 0)
+    cube.add_aux_coord(AuxCoord([height], long_name='height'))
+    return cube
+
+
+class Test(tests.IrisTest):
+    def test_mergeable(self):
+        self.assertEqual(_signature_digest(_cube(1.5, source='a')),
+                         _signature_digest(_cube(2.5, source='a')))
+
+    def test_hashable(self):
+        cube = _cube(weights=np.arange(3))
+        hash(_signature_digest(cube, _unhashable_attribute_keys([cube])))
+
+    def test_unhashable_values(self):
+        # An array can equal a value of another type, so only the presence
+        # of the attribute is digested.
+        cubes = [_cube(weights=np.array([1])), _cube(weights=1)]
+        keys = _unhashable_attribute_keys(cubes)
+        self.assertEqual(keys, {'weights'})
+        self.assertEqual(_signature_digest(cubes[0], keys),
+                         _signature_digest(cubes[1], keys))
+        self.assertNotEqual(_signature_digest(cubes[0], keys),
+                            _signature_digest(_cube(), keys))
+
+    def test_attribute_values(self):
+        self.assertNotEqual(_signature_digest(_cube(source='a')),
+                            _signature_digest(_cube(source='b')))
+
+    def test_coords(self):
+        cube = _cube()
+        cube.add_aux_coord(AuxCoord([0], long_name='level'))
+        self.assertNotEqual(_signature_digest(cube),
+                            _signature_digest(_cube()))
+
+    def test_dtype(self):
+        cube = _cube()
+        cube.data = cube.data.astype('f8')
+        self.assertNotEqual(_signature_digest(cube),
+                            _signature_digest(_cube()))
+
+
+if __name__ == '__main__':
+    tests.main()